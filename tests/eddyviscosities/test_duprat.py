@@ -7,6 +7,8 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 from wallriori.eddyviscosities import DupratEddyViscosity
+import numpy as np
+from numpy.testing import assert_allclose
 
 
 def test_duprat_init_default():
@@ -39,3 +41,14 @@ def test_duprat_values():
     eddy.value(y=linspace(0, 0.01, 20), magPGrad=0.1, nu=8e-6, uTau=0.04)
 
 
+
+
+def test_duprat_derivative():
+    eddy = DupratEddyViscosity()
+    y = np.linspace(0, 0.01, 20)
+    h = 1e-7
+    for magPGrad in [0, 0.1, 10]:
+        numerical = (eddy.value(y, 8e-6, 0.04 + h, magPGrad) -
+                     eddy.value(y, 8e-6, 0.04 - h, magPGrad))/(2*h)
+        assert_allclose(eddy.derivative(y, 8e-6, 0.04, magPGrad), numerical,
+                        rtol=1e-6, atol=1e-12)
@@ -7,6 +7,8 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 from wallriori.eddyviscosities import VanDriestEddyViscosity
+import numpy as np
+from numpy.testing import assert_allclose
 
 
 def test_vandriest_init_default():
@@ -35,3 +37,13 @@ def test_vandriest_values():
     eddy.value(y=linspace(0, 0.01, 20), nu=8e-6, uTau=0.04)
 
 
+
+
+def test_vandriest_derivative():
+    eddy = VanDriestEddyViscosity()
+    y = np.linspace(0, 0.01, 20)
+    h = 1e-7
+    numerical = (eddy.value(y, 8e-6, 0.04 + h) -
+                 eddy.value(y, 8e-6, 0.04 - h))/(2*h)
+    assert_allclose(eddy.derivative(y, 8e-6, 0.04), numerical, rtol=1e-6,
+                    atol=1e-12)
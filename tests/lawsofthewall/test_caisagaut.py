@@ -40,3 +40,16 @@ def test_caisagaut_derivative_call():
     law = CaiSagaut()
     a = law.derivative(0.8, 0.1, 8e-6, 5200*8e-6)
     assert a == 1.0
+
+
+def test_caisagaut_utau():
+    law = CaiSagaut()
+    u = np.array([0.01, 0.8])
+    uTau = law.utau(u, 0.1, 8e-6)
+    assert uTau.shape == u.shape
+    assert np.allclose(law.value(u, 0.1, 8e-6, uTau), 0)
+
+
+def test_caisagaut_e():
+    law = CaiSagaut()
+    assert np.isclose(law.E, np.exp(0.4*5.5))
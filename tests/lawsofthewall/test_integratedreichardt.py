@@ -7,6 +7,8 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 from wallriori.lawsofthewall import IntegratedReichardt
+import numpy as np
+from numpy.testing import assert_allclose
 
 
 def test_integratedreichardt_init_defaults():
@@ -58,3 +60,31 @@ def test_integratedreichardt_derivative_call():
 def test_integratedreichardt_explicit_value_call():
     law = IntegratedReichardt()
     law.explicit_value(0.1, 8e-6, 5200*8e-6)
+
+
+def test_integratedreichardt_value_and_derivative():
+    law = IntegratedReichardt()
+    uTau = np.array([0.01, 0.04, 0.1])
+    value, derivative = law.value_and_derivative(0.08, 0.1, 0.2, 8e-6, uTau)
+    assert_allclose(value, law.value(0.08, 0.1, 0.2, 8e-6, uTau))
+    assert_allclose(derivative, law.derivative(0.08, 0.1, 0.2, 8e-6, uTau))
+
+
+def test_integratedreichardt_derivative_finite_difference():
+    law = IntegratedReichardt()
+    uTau = 0.04
+    h = 1e-7
+    fd = (law.value(0.08, 0.1, 0.2, 8e-6, uTau + h) -
+          law.value(0.08, 0.1, 0.2, 8e-6, uTau - h))/(2*h)
+    assert_allclose(law.derivative(0.08, 0.1, 0.2, 8e-6, uTau), fd,
+                    rtol=1e-5)
+
+
+def test_integratedreichardt_second_derivative():
+    law = IntegratedReichardt()
+    uTau = np.array([0.01, 0.04])
+    h = 1e-7
+    fd = (law.derivative(0.05, 0.01, 0.1, 8e-6, uTau + h) -
+          law.derivative(0.05, 0.01, 0.1, 8e-6, uTau - h))/(2*h)
+    assert_allclose(law.second_derivative(0.05, 0.01, 0.1, 8e-6, uTau), fd,
+                    rtol=1e-5)
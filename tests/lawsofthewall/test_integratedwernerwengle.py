@@ -38,3 +38,9 @@ def test_iww_value_call():
 def test_iww_derivative_call():
     law = IntegratedWernerWengle()
     law.derivative(u=0.8, h1=0, h2=0.1, nu=8e-6, uTau=5200*8e-6)
+
+
+def test_iww_utau():
+    law = IntegratedWernerWengle()
+    uTau = law.utau(u=0.8, h1=0, h2=0.1, nu=8e-6)
+    assert_allclose(law.value(0.8, 0, 0.1, 8e-6, uTau), 0, atol=1e-14)
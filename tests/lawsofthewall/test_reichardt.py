@@ -8,6 +8,7 @@ from __future__ import division
 from __future__ import print_function
 from wallriori.lawsofthewall import Reichardt
 from numpy.testing import assert_allclose
+import numpy as np
 
 
 def test_reichardt_init_defaults():
@@ -52,3 +53,34 @@ def test_reichardt_derivative_call():
 def test_reichardt_explicit_value_call():
     law = Reichardt()
     law.explicit_value(0.1, 8e-6, 5200*8e-6)
+
+
+def test_reichardt_value_and_derivative():
+    law = Reichardt()
+    uTau = np.array([0.01, 0.04, 0.1])
+    value, derivative = law.value_and_derivative(0.8, 0.1, 8e-6, uTau)
+    assert_allclose(value, law.value(0.8, 0.1, 8e-6, uTau))
+    assert_allclose(derivative, law.derivative(0.8, 0.1, 8e-6, uTau))
+
+
+def test_reichardt_explicit_value_profile():
+    law = Reichardt()
+    y = np.linspace(1e-4, 0.1, 50)
+    uTau = np.array([[0.01], [0.05]])
+    u = law.explicit_value(y, 8e-6, uTau)
+    assert u.shape == (2, 50)
+    assert_allclose(law.value(u, y, 8e-6, uTau), 0, atol=1e-12)
+
+
+def test_reichardt_second_derivative():
+    law = Reichardt()
+    uTau = np.array([0.01, 0.04])
+    h = 1e-7
+    fd = (law.derivative(0.5, 0.01, 8e-6, uTau + h) -
+          law.derivative(0.5, 0.01, 8e-6, uTau - h))/(2*h)
+    assert_allclose(law.second_derivative(0.5, 0.01, 8e-6, uTau), fd,
+                    rtol=1e-5)
+    value, derivative, second = law.value_and_derivatives(0.5, 0.01, 8e-6,
+                                                          uTau)
+    assert_allclose(value, law.value(0.5, 0.01, 8e-6, uTau))
+    assert_allclose(derivative, law.derivative(0.5, 0.01, 8e-6, uTau))
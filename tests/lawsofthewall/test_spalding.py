@@ -7,6 +7,8 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 from wallriori.lawsofthewall import Spalding
+import numpy as np
+import pytest
 from numpy.testing import assert_allclose
 
 
@@ -68,3 +70,68 @@ def test_spalding_explicit_value():
         vals[i] = law.explicit_value(yi, 5e-5, 1000*5e-5)
 
     pass
+
+
+def test_spalding_value_and_derivative():
+    law = Spalding()
+    uTau = np.array([0.01, 0.04, 0.1])
+    value, derivative = law.value_and_derivative(0.8, 0.1, 8e-6, uTau)
+    assert_allclose(value, law.value(0.8, 0.1, 8e-6, uTau))
+    assert_allclose(derivative, law.derivative(0.8, 0.1, 8e-6, uTau))
+
+
+def test_spalding_constants_invalidated():
+    law = Spalding()
+    assert_allclose(law.constants()[1], np.exp(-0.4*5.5))
+    law.B = 5
+    assert_allclose(law.constants()[1], np.exp(-0.4*5))
+
+
+def test_spalding_explicit_value_profile():
+    nu = 5e-5
+    y = np.linspace(1e-4, 1, 5000)
+    for law in [Spalding(), Spalding(0.41, 5.0)]:
+        u = law.explicit_value(y, nu, 0.05)
+        assert u.shape == y.shape
+        assert_allclose(law.value(u, y, nu, 0.05)/(y*0.05/nu), 0,
+                        atol=1e-10)
+
+
+def test_spalding_explicit_value_per_point_utau():
+    law = Spalding()
+    uTau = np.array([[0.01], [0.05]])
+    y = np.array([1e-3, 0.1])
+    u = law.explicit_value(y, 5e-5, uTau)
+    assert u.shape == (2, 2)
+    assert_allclose(u[1, 0], law.explicit_value(1e-3, 5e-5, 0.05))
+
+
+def test_spalding_second_derivative():
+    law = Spalding()
+    uTau = np.array([0.01, 0.04])
+    h = 1e-7
+    fd = (law.derivative(0.5, 0.01, 8e-6, uTau + h) -
+          law.derivative(0.5, 0.01, 8e-6, uTau - h))/(2*h)
+    assert_allclose(law.second_derivative(0.5, 0.01, 8e-6, uTau), fd,
+                    rtol=1e-5)
+    value, derivative, second = law.value_and_derivatives(0.5, 0.01, 8e-6,
+                                                          uTau)
+    assert_allclose(value, law.value(0.5, 0.01, 8e-6, uTau))
+    assert_allclose(derivative, law.derivative(0.5, 0.01, 8e-6, uTau))
+
+
+def test_spalding_explicit_value_wall():
+    law = Spalding()
+    y = np.array([0, 1e-4, 1e-2])
+    u = law.explicit_value(y, 5e-5, 0.05)
+    assert u[0] == 0
+    assert_allclose(u[1:], law.explicit_value(y[1:], 5e-5, 0.05))
+    assert law.explicit_value(0., 5e-5, 0.05) == 0
+    assert_allclose(law.explicit_value(y, 5e-5, 0.), 0)
+
+
+def test_spalding_explicit_value_deprecated_coefficients():
+    law = Spalding()
+    with pytest.warns(DeprecationWarning):
+        u = law.explicit_value(0.01, 5e-5, 0.05, 0.41)
+    assert_allclose(u, law.explicit_value(0.01, 5e-5, 0.05))
@@ -0,0 +1,69 @@
+# This file is part of wallriori
+# (c) Timofey Mukha
+# The code is released under the MIT Licence.
+# See LICENCE.txt and the Legal section in the README for more information
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from wallriori.lawsofthewall import TabulatedInverse, Spalding, Reichardt
+from wallriori.lawsofthewall import WernerWengle
+from wallriori.rootfinders import Newton
+from numpy.testing import assert_allclose
+import numpy as np
+import pytest
+
+
+def test_tabulatedinverse_unsupported_law():
+    with pytest.raises(ValueError):
+        TabulatedInverse(WernerWengle())
+
+
+def test_tabulatedinverse_shared_table():
+    a = TabulatedInverse(Spalding())
+    b = TabulatedInverse(Spalding())
+    c = TabulatedInverse(Spalding(0.41, 5.2))
+    assert a.table is b.table
+    assert a.table is not c.table
+
+
+def test_tabulatedinverse_law_changed():
+    law = Spalding()
+    table = TabulatedInverse(law, polish=True)
+    law.kappa = 0.3
+    assert table.table is TabulatedInverse(Spalding(0.3)).table
+
+    u = np.array([0.1, 1.0])
+    y = np.array([0.01, 0.1])
+    uTau = table.utau(u, y, 8e-6)
+    assert_allclose(law.value(u, y, 8e-6, uTau), 0, atol=1e-7)
+
+
+def test_tabulatedinverse_cache_bounded():
+    law = Spalding()
+    table = TabulatedInverse(law, n=50)
+    for kappa in np.linspace(0.35, 0.45, 2*TabulatedInverse._maxTables):
+        law.kappa = kappa
+        table.table
+    assert len(TabulatedInverse._tables) == TabulatedInverse._maxTables
+
+    # Dropped tables are rebuilt on use
+    law.kappa = 0.35
+    assert_allclose(table.table, TabulatedInverse(Spalding(0.35), n=50).table)
+
+
+def test_tabulatedinverse_utau():
+    nu = 8e-6
+    u = np.array([1e-4, 0.1, 0.5, 1.0])
+    y = np.array([1e-3, 0.01, 0.05, 0.1])
+    for law in [Spalding(), Reichardt()]:
+        table = TabulatedInverse(law)
+        newton = Newton(law.value, law.derivative, 100, 1e-12)
+        exact = newton.solve(np.array([9e-4, 0.01, 0.03, 0.04]),
+                             args=(u, y, nu))
+
+        assert table.error < 1e-5
+        assert_allclose(table.utau(u, y, nu), exact, rtol=table.error)
+
+        table.polish = True
+        assert_allclose(table.utau(u, y, nu), exact, rtol=1e-10)
@@ -44,3 +44,29 @@ def test_ww_derivative_call():
 def test_ww_explicit_value_call():
     law = WernerWengle()
     law.explicit_value(0.5, 8e-6, 5200*8e-6)
+
+
+def test_ww_array_branches():
+    law = WernerWengle()
+    y = np.array([1e-5, 0.1])
+    vals = law.explicit_value(y, 8e-6, 0.04)
+    assert_allclose(vals[0], 0.04*1e-5*0.04/8e-6)
+    assert_allclose(vals[1], 0.04*8.3*(0.1*0.04/8e-6)**(1/7))
+    assert law.value(0.8, y, 8e-6, 0.04).shape == y.shape
+    assert law.derivative(0.8, y, 8e-6, 0.04).shape == y.shape
+
+
+def test_ww_utau():
+    law = WernerWengle()
+    u = np.array([1e-4, 0.8])
+    y = np.array([1e-4, 0.1])
+    uTau = law.utau(u, y, 8e-6)
+    assert_allclose(law.value(u, y, 8e-6, uTau), 0, atol=1e-10)
+
+
+def test_ww_value_and_derivative():
+    law = WernerWengle()
+    y = np.array([1e-5, 0.1])
+    value, derivative = law.value_and_derivative(0.8, y, 8e-6, 0.04)
+    assert_allclose(value, law.value(0.8, y, 8e-6, 0.04))
+    assert_allclose(derivative, law.derivative(0.8, y, 8e-6, 0.04))
@@ -0,0 +1,69 @@
+# This file is part of wallriori
+# (c) Timofey Mukha
+# The code is released under the MIT Licence.
+# See LICENCE.txt and the Legal section in the README for more information
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from wallriori.mesh import Mesh
+from wallriori.problems import SteadyDiffusion, BatchSteadyDiffusion
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+
+def test_batch_init_wrong_shape():
+    mesh = Mesh.from_faces(np.linspace(0, 1, 11))
+    with pytest.raises(ValueError):
+        BatchSteadyDiffusion(mesh, np.zeros((3, 10)), np.ones(10), [0, 1],
+                             [1, 1], 0)
+    with pytest.raises(ValueError):
+        BatchSteadyDiffusion(mesh, np.zeros((2, 10)), np.ones((3, 10)),
+                             [0, 1], [1, 1], 0)
+
+
+def test_batch_solve_linear():
+    mesh = Mesh.from_faces(np.linspace(0, 1, 11))
+    nu = np.ones((4, mesh.nCells))
+    ic = np.zeros((4, mesh.nCells))
+    top = np.arange(1., 5.)
+    problem = BatchSteadyDiffusion(mesh, ic, nu, [0, 1], [top, 1], 0)
+    problem.solve()
+
+    assert_allclose(problem.solution, top[:, np.newaxis]*mesh.centres,
+                     atol=1e-14)
+
+
+def test_batch_matches_single():
+    faces = np.concatenate([[0], np.cumsum(np.linspace(0.01, 0.2, 20))])
+    mesh = Mesh.from_faces(faces)
+    nFaces = 5
+    nu = 1 + np.outer(np.arange(nFaces), mesh.centres**2)
+    source = np.outer(np.linspace(-1, 1, nFaces), mesh.centres)
+    bcLeft = [np.linspace(0, 1, nFaces), np.linspace(1, 2, nFaces)]
+    bcRight = [np.full(nFaces, 3.), 1 + np.arange(nFaces)]
+
+    problem = BatchSteadyDiffusion(mesh, np.zeros(nu.shape), nu, bcLeft,
+                                   bcRight, source)
+    problem.solve()
+
+    for i in range(nFaces):
+        single = SteadyDiffusion(mesh, np.zeros(mesh.nCells), nu[i],
+                                 [bcLeft[0][i], bcLeft[1][i]],
+                                 [bcRight[0][i], bcRight[1][i]], source[i])
+        single.solve()
+        assert_allclose(problem.solution[i], single.solution, rtol=1e-12)
+
+
+def test_batch_solve_rows():
+    mesh = Mesh.from_faces(np.linspace(0, 1, 11))
+    nu = np.ones((4, mesh.nCells))
+    ic = np.full((4, mesh.nCells), -1.)
+    top = np.arange(1., 5.)
+    problem = BatchSteadyDiffusion(mesh, ic, nu, [0, 1], [top, 1], 0)
+    problem.solve(np.array([1, 3]))
+
+    assert_allclose(problem.solution[[1, 3]],
+                    top[[1, 3], np.newaxis]*mesh.centres, atol=1e-14)
+    assert_allclose(problem.solution[[0, 2]], -1)
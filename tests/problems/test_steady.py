@@ -30,3 +30,32 @@ def test_solve_linear():
     problem.solve()
 
     assert_allclose(problem.solution, mesh.centres, atol=1e-15)
+
+
+def test_solve_tridiagonal_matches_dense():
+    faces = np.concatenate([[0], np.cumsum(np.linspace(0.01, 0.2, 20))])
+    mesh = Mesh.from_faces(faces)
+    nu = 1 + mesh.centres**2
+    ic = np.zeros(mesh.centres.size)
+    problem = SteadyDiffusion(mesh, ic, nu, [0.5, 1], [3, 2], 4*mesh.centres)
+
+    problem.solve(dense=True)
+    dense = problem.solution
+    problem.solve()
+
+    assert_allclose(problem.solution, dense, rtol=1e-12)
+
+
+def test_assemble_tridiagonal():
+    mesh = Mesh.from_faces(np.linspace(0, 1, 6)**2)
+    nu = np.linspace(1, 2, mesh.nCells)
+    ic = np.zeros(mesh.centres.size)
+    problem = SteadyDiffusion(mesh, ic, nu, [1, 1], [2, 3], 5)
+
+    system, rhs = problem.assemble()
+    lower, diag, upper, rhsTri = problem.assemble_tridiagonal()
+
+    assert_allclose(np.diag(system), diag)
+    assert_allclose(np.diag(system, -1), lower[1:])
+    assert_allclose(np.diag(system, 1), upper[:-1])
+    assert_allclose(rhsTri, rhs)
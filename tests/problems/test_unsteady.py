@@ -0,0 +1,73 @@
+# This file is part of wallriori
+# (c) Timofey Mukha
+# The code is released under the MIT Licence.
+# See LICENCE.txt and the Legal section in the README for more information
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from wallriori.mesh import Mesh
+from wallriori.problems import SteadyDiffusion, UnsteadyDiffusion
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+
+def make_mesh():
+    faces = np.concatenate([[0], np.cumsum(np.linspace(0.01, 0.2, 20))])
+    return Mesh.from_faces(faces)
+
+
+def test_unsteady_steady_state():
+    mesh = make_mesh()
+    nu = 1 + mesh.centres**2
+    ic = np.zeros(mesh.nCells)
+
+    steady = SteadyDiffusion(mesh, ic, nu, [1, 1], [2, 2], 3.)
+    steady.solve()
+
+    problem = UnsteadyDiffusion(mesh, ic, nu, 0.05, 20, [1, 1], [2, 2], 3.)
+    problem.solve()
+    assert_allclose(problem.solution, steady.solution, rtol=1e-8)
+
+
+def test_unsteady_crank_nicolson_accuracy():
+    mesh = Mesh.from_faces(np.linspace(0, np.pi, 101))
+    nu = np.ones(mesh.nCells)
+    ic = np.sin(mesh.centres)
+    exact = np.exp(-0.5)*np.sin(mesh.centres)
+
+    errors = {}
+    for theta in [1, 0.5]:
+        problem = UnsteadyDiffusion(mesh, ic, nu, 0.05, 0.5 - 1e-8, [0, 1],
+                                    [0, 1], 0., theta=theta)
+        problem.solve()
+        errors[theta] = np.max(np.abs(problem.solution - exact))
+
+    assert errors[0.5] < 0.1*errors[1]
+
+
+def test_unsteady_operator_cache():
+    mesh = make_mesh()
+    nu = np.ones(mesh.nCells)
+    ic = np.zeros(mesh.nCells)
+    problem = UnsteadyDiffusion(mesh, ic, nu, 0.1, 1, [1, 1], [2, 2], 0.)
+
+    operator = problem.operator()
+    problem.advance()
+    assert problem.operator() is operator
+
+    problem.dt = 0.2
+    assert problem.operator() is not operator
+    operator = problem.operator()
+
+    problem.nu = 2*nu
+    assert problem.operator() is not operator
+
+
+def test_unsteady_theta_bounds():
+    mesh = make_mesh()
+    nu = np.ones(mesh.nCells)
+    ic = np.zeros(mesh.nCells)
+    with pytest.raises(ValueError):
+        UnsteadyDiffusion(mesh, ic, nu, 0.1, 1, [1, 1], [2, 2], 0., theta=2)
@@ -0,0 +1,52 @@
+# This file is part of wallriori
+# (c) Timofey Mukha
+# The code is released under the MIT Licence.
+# See LICENCE.txt and the Legal section in the README for more information
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from wallriori.quadrature import Quadrature
+import numpy as np
+from numpy.testing import assert_allclose
+from scipy.integrate import simpson
+
+
+def test_simpson_matches_scipy():
+    rng = np.random.default_rng(0)
+    for n in [3, 4, 5, 10, 11]:
+        x = np.sort(rng.random(n))
+        y = rng.random(n)
+        assert_allclose(Quadrature.simpson(x).integrate(y), simpson(y, x=x),
+                        rtol=1e-12)
+
+
+def test_trapezoid():
+    x = np.array([0, 0.5, 2])
+    assert_allclose(Quadrature.trapezoid(x).integrate(x), 2, rtol=1e-14)
+
+
+def test_gauss_legendre_exact():
+    quadrature = Quadrature.gauss_legendre(1, 3, 4)
+    assert np.all((quadrature.nodes > 1) & (quadrature.nodes < 3))
+    assert_allclose(quadrature.integrate(quadrature.nodes**7),
+                    (3**8 - 1)/8, rtol=1e-13)
+
+
+def test_clenshaw_curtis_exact():
+    for n in [2, 5, 8]:
+        quadrature = Quadrature.clenshaw_curtis(1, 3, n)
+        assert_allclose(quadrature.nodes[[0, -1]], [1, 3])
+        assert_allclose(quadrature.integrate(quadrature.nodes**(n - 1)),
+                        (3**n - 1)/n, rtol=1e-13)
+
+
+def test_integrate_batched():
+    quadrature = Quadrature.gauss_legendre(0, 1, 5)
+    values = np.array([np.ones(5), quadrature.nodes, quadrature.nodes**2])
+    assert_allclose(quadrature.integrate(values), [1, 1/2, 1/3], rtol=1e-13)
+
+
+def test_reference_rule_cached():
+    first = Quadrature._reference_rule("gauss_legendre", 7)
+    assert Quadrature._reference_rule("gauss_legendre", 7) is first
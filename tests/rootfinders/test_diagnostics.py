@@ -0,0 +1,62 @@
+# This file is part of wallriori
+# (c) Timofey Mukha
+# The code is released under the MIT Licence.
+# See LICENCE.txt and the Legal section in the README for more information
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from wallriori.rootfinders import Diagnostics, Newton, NewtonBisection
+from numpy.testing import assert_array_equal
+import numpy as np
+
+
+def f(a, x):
+    return x**2 - a
+
+
+def d(a, x):
+    return 2*x
+
+
+def test_diagnostics_init():
+    diagnostics = Diagnostics()
+    assert diagnostics.iterations is None
+    assert diagnostics.histogram is None
+
+
+def test_diagnostics_histogram():
+    diagnostics = Diagnostics(histogram=True)
+    diagnostics.record(np.array([1, 3, 3]), np.zeros(3), np.ones(3, bool))
+    diagnostics.record(np.array([2]), np.zeros(1), np.ones(1, bool))
+    assert_array_equal(diagnostics.histogram, [0, 1, 1, 2])
+
+
+def test_diagnostics_off_by_default():
+    newton = Newton(f, d, 100, 1e-10)
+    assert newton.diagnostics is None
+    assert Newton(f, d, 100, 1e-10, debug=True).diagnostics is not None
+
+
+def test_diagnostics_newton():
+    newton = Newton(f, d, 4, 1e-10)
+    newton.diagnostics = Diagnostics(histogram=True)
+    root, converged, iterations = newton.solve_active(
+        1., args=(np.array([1., 1.21, 1e6]),))
+
+    diagnostics = newton.diagnostics
+    assert_array_equal(diagnostics.iterations, iterations)
+    assert_array_equal(diagnostics.notConverged, [False, False, True])
+    assert diagnostics.residual[2] > 1e-10
+    assert diagnostics.histogram.sum() == 3
+
+    newton.solve(1., args=(1.,))
+    assert diagnostics.converged
+
+
+def test_diagnostics_newtonbisection():
+    solver = NewtonBisection(f, d, 100, 1e-10)
+    solver.diagnostics = Diagnostics()
+    solver.solve_active(1., args=(np.array([1., 1e6]),))
+    assert np.all(solver.diagnostics.converged)
+    assert np.all(solver.diagnostics.residual <= 1e-10)
@@ -0,0 +1,53 @@
+# This file is part of wallriori
+# (c) Timofey Mukha
+# The code is released under the MIT Licence.
+# See LICENCE.txt and the Legal section in the README for more information
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from wallriori.rootfinders import FixedPoint, Diagnostics
+import numpy as np
+from numpy.testing import assert_allclose
+
+
+def linear(a, x):
+    return a*x + 1
+
+
+def test_fixedpoint_init():
+    solver = FixedPoint(linear, 10, 1e-5, relaxation=0.5, aitken=False)
+    assert solver.f == linear
+    assert solver.maxIter == 10
+    assert solver.eps == 1e-5
+    assert solver.relaxation == 0.5
+    assert not solver.aitken
+
+
+def test_fixedpoint_linear_aitken():
+    solver = FixedPoint(linear, 100, 1e-12)
+    solver.diagnostics = Diagnostics()
+    a = np.array([0.5, 0.99, -0.9, 2.])
+    root = solver.solve(1., args=(a,))
+
+    assert_allclose(root, 1/(1 - a), rtol=1e-10)
+    assert np.all(solver.diagnostics.iterations <= 4)
+
+
+def test_fixedpoint_relaxation():
+    solver = FixedPoint(linear, 1000, 1e-12, relaxation=0.5, aitken=False)
+    assert_allclose(solver.solve(1., args=(0.5,)), 2, rtol=1e-10)
+    assert np.ndim(solver.solve(1., args=(0.5,))) == 0
+
+
+def test_fixedpoint_nonlinear():
+    solver = FixedPoint(lambda x: np.cos(x), 100, 1e-12)
+    solver.diagnostics = Diagnostics()
+    root = solver.solve(1.)
+
+    plain = FixedPoint(lambda x: np.cos(x), 1000, 1e-12, aitken=False)
+    plain.diagnostics = Diagnostics()
+    plain.solve(1.)
+
+    assert_allclose(root, np.cos(root), rtol=1e-10)
+    assert solver.diagnostics.iterations < plain.diagnostics.iterations
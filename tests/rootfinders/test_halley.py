@@ -0,0 +1,60 @@
+# This file is part of wallriori
+# (c) Timofey Mukha
+# The code is released under the MIT Licence.
+# See LICENCE.txt and the Legal section in the README for more information
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from wallriori.rootfinders import Halley, Newton
+from wallriori.wallmodels import LOTWWallModel
+from wallriori.lawsofthewall import Spalding
+from numpy.testing import assert_allclose
+import numpy as np
+
+
+def f(a, x):
+    return x**3 - a
+
+
+def d(a, x):
+    return 3*x**2
+
+
+def d2(a, x):
+    return 6*x
+
+
+def test_halley_init_default():
+    halley = Halley()
+    assert halley.d2 is None
+    assert halley.fdd is None
+
+
+def test_halley_solve():
+    halley = Halley(f, d, d2, 100, 1e-12)
+    assert_allclose(halley.solve(1., args=(8.,)), 2)
+
+
+def test_halley_fewer_iterations():
+    a = np.array([2., 10., 100.])
+    halley = Halley(f, d, d2, 100, 1e-12)
+    newton = Newton(f, d, 100, 1e-12)
+    root, converged, iterations = halley.solve_active(1., args=(a,))
+    newtonIterations = newton.solve_active(1., args=(a,))[2]
+    assert_allclose(root, a**(1/3))
+    assert np.all(converged)
+    assert np.all(iterations < newtonIterations)
+
+
+def test_halley_without_second_derivative():
+    halley = Halley(f, d, None, 100, 1e-12)
+    assert_allclose(halley.solve(1., args=(8.,)), 2)
+
+
+def test_halley_lotw():
+    u = np.array([0.1, 0.5, 1.0])
+    guess = np.array([0.005, 0.03, 0.05])
+    newton = LOTWWallModel(0.1, 8e-6, Spalding(), Newton(eps=1e-12))
+    halley = LOTWWallModel(0.1, 8e-6, Spalding(), Halley(eps=1e-12))
+    assert_allclose(halley.utau(guess, u), newton.utau(guess, u))
@@ -6,7 +6,9 @@
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
-from wallriori.rootfinders import Newton
+from wallriori.rootfinders import Newton, Diagnostics
+from functools import partial
+import numpy as np
 from numpy.testing import assert_allclose
 
 
@@ -30,3 +32,76 @@ def test_newton_solve():
     newton = Newton(f, d, 100, 0.01)
     root = newton.solve(1)
     assert_allclose(root, 0, rtol=0.01, atol=1e-2)
+
+
+def test_newton_solve_args():
+    def g(a, x):
+        return x**2 - a
+
+    def dg(a, x):
+        return 2*x
+
+    newton = Newton(g, dg, 100, 1e-10)
+    assert_allclose(newton.solve(1., args=(4.,)), 2)
+
+
+def test_newton_solve_bound_arrays():
+    def g(a, x):
+        return x**2 - a
+
+    def dg(a, x):
+        return 2*x
+
+    # Functions bound to per-element arrays are iterated as a whole
+    a = np.array([1., 4., 9., 1e6])
+    newton = Newton(partial(g, a), partial(dg, a), 100, 1e-10)
+    newton.diagnostics = Diagnostics()
+    root = newton.solve(np.array([1., 2., 3., 5.]))
+
+    assert_allclose(root, np.sqrt(a))
+    assert np.all(newton.diagnostics.converged)
+    assert newton.diagnostics.iterations.shape == a.shape
+
+
+def test_newton_solve_active():
+
+    calls = []
+
+    def g(a, x):
+        calls.append(x.size)
+        return x**2 - a
+
+    def dg(a, x):
+        return 2*x
+
+    a = np.array([1., 1.1, 1e6])
+    newton = Newton(g, dg, 100, 1e-10)
+    root, converged, iterations = newton.solve_active(1., args=(a,))
+
+    assert_allclose(root, np.sqrt(a))
+    assert np.all(converged)
+    assert iterations[0] < iterations[2]
+    assert calls[-1] == 1
+    assert sum(calls) == np.sum(iterations)
+
+
+def test_newton_solve_active_not_converged():
+
+    newton = Newton(lambda x: x**2 + 1, lambda x: 2*x, 3, 1e-10)
+    root, converged, iterations = newton.solve_active(np.array([0.3, 2.7]))
+    assert not np.any(converged)
+    assert np.all(iterations == 3)
+
+
+def test_newton_value_and_derivative():
+    calls = []
+
+    def fd(x):
+        calls.append(x)
+        return x**2 - 4, 2*x
+
+    newton = Newton(maxIter=100, eps=1e-10, valueAndDerivative=fd)
+    assert_allclose(newton.solve(1.), 2)
+    assert len(calls) > 0
+    newton.f = f
+    assert newton.fd is None
@@ -0,0 +1,65 @@
+# This file is part of wallriori
+# (c) Timofey Mukha
+# The code is released under the MIT Licence.
+# See LICENCE.txt and the Legal section in the README for more information
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from wallriori.rootfinders import NewtonBisection, Newton
+from wallriori.lawsofthewall import Reichardt
+from numpy.testing import assert_allclose
+import numpy as np
+
+
+def f(x):
+    return np.arctan(x - 2)
+
+
+def d(x):
+    return 1/(1 + (x - 2)**2)
+
+
+def test_newtonbisection_init_default():
+    solver = NewtonBisection()
+    assert solver.lower is None
+    assert solver.upper is None
+    assert solver.expansion == 10
+
+
+def test_newtonbisection_solve_where_newton_diverges():
+    with np.errstate(all="ignore"):
+        assert not np.isclose(Newton(f, d, 100, 1e-10).solve(5.), 2)
+
+    solver = NewtonBisection(f, d, 100, 1e-10)
+    assert_allclose(solver.solve(5.), 2)
+
+
+def test_newtonbisection_solve_active():
+    solver = NewtonBisection(f, d, 100, 1e-10)
+    root, converged, iterations = solver.solve_active(
+        np.array([0.01, 1.9, 5, 1000]))
+    assert_allclose(root, 2)
+    assert np.all(converged)
+    assert np.all(root > 0)
+
+
+def test_newtonbisection_bracket():
+    solver = NewtonBisection(f, d, 100, 1e-10, lower=1.5, upper=3)
+    assert_allclose(solver.solve(1000.), 2)
+
+
+def test_newtonbisection_no_sign_change():
+    solver = NewtonBisection(lambda x: x**2 + 1, lambda x: 2*x, 5, 1e-10)
+    root, converged, iterations = solver.solve_active(np.array([1., 2.]))
+    assert not np.any(converged)
+    assert_allclose(root, [1, 2])
+
+
+def test_newtonbisection_law():
+    law = Reichardt()
+    u = np.array([1e-4, 0.1, 0.5, 1.0])
+    y = np.array([1e-3, 0.01, 0.05, 0.1])
+    solver = NewtonBisection(law.value, law.derivative, 100, 1e-12)
+    uTau = solver.solve(0.04, args=(u, y, 8e-6))
+    assert_allclose(law.value(u, y, 8e-6, uTau), 0, atol=1e-8)
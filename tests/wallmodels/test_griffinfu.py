@@ -5,7 +5,9 @@
 
 from wallriori import GriffinFuWallModel
 from wallriori import Mesh
+from wallriori.quadrature import Quadrature
 import numpy as np
+from scipy.integrate import simpson
 
 
 def test_griffinfu_init():
@@ -23,3 +25,46 @@ def test_griffinfu_utau():
     m.utau(5e-3, 1, 0.5, 1000)
 
 
+
+def test_griffinfu_utau_iteration():
+    mesh = Mesh.from_faces(np.linspace(0, 0.1, 10))
+    m = GriffinFuWallModel(h=0.1, nu=8e-6, mesh=mesh, maxiter=10, tol=0.01)
+
+    lPlus = m.l_plus(0.38, 5e-3, m.a_plus(0.5, 1000))
+    yPlus = mesh.centres*5e-3/8e-6
+    reference = 1/simpson(1/(1 + lPlus), x=yPlus)
+    assert np.isclose(m.utau_iteration(5e-3, 1, 0.5, 1000), reference,
+                      rtol=1e-12)
+
+def test_griffinfu_utau_faces():
+    mesh = Mesh.from_faces(np.linspace(0, 0.1, 30))
+    m = GriffinFuWallModel(h=0.1, nu=8e-6, mesh=mesh, maxiter=100, tol=1e-10)
+    sampledU = np.array([0.5, 1, 2])
+    H = np.array([1.3, 1.4, 1.6])
+    reTau = np.array([500, 1000, 2000])
+
+    uTau = m.utau_faces(5e-3, sampledU, H, reTau)
+    noReTau = m.utau_faces(5e-3, sampledU, H)
+    for i in range(3):
+        assert np.isclose(uTau[i], m.utau(5e-3, sampledU[i], H[i], reTau[i]),
+                          rtol=1e-8)
+        assert np.isclose(noReTau[i], m.utau(5e-3, sampledU[i], H[i]),
+                          rtol=1e-8)
+
+
+def test_griffinfu_quadrature():
+    mesh = Mesh.from_faces(np.linspace(0, 0.1, 4001))
+    m = GriffinFuWallModel(h=0.1, nu=8e-6, mesh=mesh, maxiter=200, tol=1e-12)
+    sampledU = np.array([0.5, 1, 2])
+    reference = m.utau_faces(5e-3, sampledU, 1.4, 1000)
+
+    # The Simpson rule integrates between the first and last centres
+    a, b = mesh.centres[0], mesh.centres[-1]
+    for quadrature in [Quadrature.gauss_legendre(a, b, 64),
+                       Quadrature.clenshaw_curtis(a, b, 65)]:
+        m = GriffinFuWallModel(h=0.1, nu=8e-6, mesh=mesh, maxiter=200,
+                               tol=1e-12, quadrature=quadrature)
+        assert np.allclose(m.utau_faces(5e-3, sampledU, 1.4, 1000),
+                           reference, rtol=1e-5)
+        assert np.isclose(m.utau(5e-3, 1., 1.4, 1000), reference[1],
+                          rtol=1e-5)
@@ -9,6 +9,9 @@ from __future__ import print_function
 from wallriori.wallmodels import IntegratedLOTWWallModel
 from wallriori.rootfinders import Newton
 from wallriori.lawsofthewall import IntegratedReichardt
+from wallriori.lawsofthewall import IntegratedWernerWengle
+import numpy as np
+from numpy.testing import assert_allclose
 
 
 def test_integratedlotw_init():
@@ -49,3 +52,18 @@ def test_integratedlotw_nut():
     nu = 8e-6
     w = IntegratedLOTWWallModel(0.1, 0.2, nu, law, rf)
     w.nut(5200.*nu, 0.8, 40)
+
+
+def test_integratedlotw_utau_batch_matches_loop():
+
+    nu = 8e-6
+    h1 = np.array([0.0, 0.01, 0.05])
+    h2 = np.array([0.01, 0.02, 0.1])
+    sampledU = np.array([0.5, 0.7, 0.8])
+    for law in [IntegratedReichardt(), IntegratedWernerWengle()]:
+        w = IntegratedLOTWWallModel(0.1, 0.2, nu, law, Newton(eps=1e-8))
+        batch = w.utau(0.04, sampledU*(h2 - h1), h1=h1, h2=h2)
+        loop = [w.utau(0.04, sampledU[i]*(h2[i] - h1[i]), h1=h1[i],
+                       h2=h2[i]) for i in range(h1.size)]
+        assert batch.shape == h1.shape
+        assert_allclose(batch, loop, rtol=1e-6)
@@ -0,0 +1,68 @@
+# This file is part of wallriori
+# (c) Timofey Mukha
+# The code is released under the MIT Licence.
+# See LICENCE.txt and the Legal section in the README for more information
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from wallriori.wallmodels import IntegratedODEWallModel
+from wallriori.eddyviscosities import VanDriestEddyViscosity
+from wallriori.eddyviscosities import DupratEddyViscosity
+from wallriori.quadrature import Quadrature
+from wallriori.rootfinders import Diagnostics
+import numpy as np
+from numpy.testing import assert_allclose
+
+
+def test_integratedode_quadrature():
+    sampledU = np.array([1., 0, 0])
+    source = np.array([0.1, 0, 0])
+    fine = IntegratedODEWallModel(0.1, 1e-5, VanDriestEddyViscosity(), 4001,
+                                  100, 1e-10)
+    quadrature = Quadrature.gauss_legendre(0, 0.1, 64)
+    coarse = IntegratedODEWallModel(0.1, 1e-5, VanDriestEddyViscosity(), 64,
+                                    100, 1e-10, quadrature=quadrature)
+
+    assert_allclose(coarse.mesh, quadrature.nodes)
+    assert_allclose(coarse.utau_iteration(0.04, sampledU, source),
+                    fine.utau_iteration(0.04, sampledU, source), rtol=1e-6)
+
+
+def test_integratedode_utau():
+    model = IntegratedODEWallModel(0.1, 1e-5, VanDriestEddyViscosity(), 201,
+                                   100, 1e-10)
+    sampledU = np.array([1., 0, 0])
+    uTau = model.utau(0.04, sampledU, np.zeros(3))
+    assert_allclose(model.utau_iteration(uTau, sampledU, np.zeros(3)), uTau,
+                    rtol=1e-8)
+
+
+def test_integratedode_utau_faces():
+    model = IntegratedODEWallModel(0.1, 1e-5, DupratEddyViscosity(), 201,
+                                   100, 1e-10)
+    sampledU = np.array([[1., 0, 0], [0.5, 0.5, 0], [2, 0, 1]])
+    source = np.array([[0, 0, 0], [1e-3, 0, 0], [0, 1e-3, 0]])
+    magPGrad = np.linalg.norm(source, axis=1)
+
+    uTau, wallShearStress = model.utau_faces(0.04, sampledU, source,
+                                             magPGrad=magPGrad)
+
+    assert wallShearStress.shape == (3, 3)
+    assert_allclose(np.linalg.norm(wallShearStress, axis=1), uTau**2,
+                    rtol=1e-8)
+    for i in range(3):
+        single = model.utau(0.04, sampledU[i], source[i],
+                            magPGrad=magPGrad[i])
+        assert_allclose(uTau[i], single, rtol=1e-8)
+    # Without a source, the stress is aligned with the velocity
+    assert_allclose(wallShearStress[0, 1:], 0, atol=1e-15)
+
+
+def test_integratedode_utau_no_iterations():
+    model = IntegratedODEWallModel(0.1, 1e-5, VanDriestEddyViscosity(), 101,
+                                   0, 1e-10)
+    model.diagnostics = Diagnostics()
+    assert model.utau(0.04, np.array([1., 0, 0]), 0.) == 0.04
+    assert model.diagnostics.iterations == 0
+    assert not model.diagnostics.converged
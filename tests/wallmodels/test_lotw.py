@@ -9,6 +9,9 @@ from __future__ import print_function
 from wallriori.wallmodels import LOTWWallModel
 from wallriori.rootfinders import Newton
 from wallriori.lawsofthewall import Spalding
+from wallriori.lawsofthewall import WernerWengle, Reichardt, CaiSagaut
+import numpy as np
+from numpy.testing import assert_allclose
 
 
 def test_lotw_init():
@@ -45,3 +48,35 @@ def test_lotw_nut():
     nu = 8e-6
     w = LOTWWallModel(0.1, nu, law, rf)
     w.nut(5200.*nu, 0.8, 40)
+
+
+def test_lotw_utau_batch_matches_loop():
+
+    nu = 8e-6
+    h = np.array([0.001, 0.01, 0.1, 0.1])
+    sampledU = np.array([0.1, 0.5, 0.8, 1.0])
+    for law in [Spalding(), WernerWengle(), Reichardt(), CaiSagaut()]:
+        w = LOTWWallModel(0.1, nu, law, Newton(eps=1e-8))
+        batch = w.utau(0.04, sampledU, h=h)
+        loop = [w.utau(0.04, sampledU[i], h=h[i]) for i in range(h.size)]
+        assert batch.shape == h.shape
+        assert_allclose(batch, loop, rtol=1e-6)
+
+
+def test_lotw_utau_and_nut_batch():
+
+    nu = np.array([8e-6, 1e-5])
+    w = LOTWWallModel(0.1, 8e-6, Spalding(), Newton(eps=1e-8))
+    uTau, nut = w.utau_and_nut(0.04, np.array([0.8, 0.8]),
+                               np.array([40, 1e6]), nu=nu)
+    assert_allclose(nut, np.maximum(0, uTau**2/np.array([40, 1e6]) - nu))
+    assert nut[1] == 0
+    assert_allclose(w.nut(0.04, np.array([0.8, 0.8]), np.array([40, 1e6]),
+                          nu=nu), nut)
+
+
+def test_lotw_utau_explicit_law():
+
+    law = WernerWengle()
+    w = LOTWWallModel(0.1, 8e-6, law, None)
+    assert_allclose(w.utau(None, 0.8), law.utau(0.8, 0.1, 8e-6))
@@ -0,0 +1,136 @@
+# This file is part of wallriori
+# (c) Timofey Mukha
+# The code is released under the MIT Licence.
+# See LICENCE.txt and the Legal section in the README for more information
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from wallriori.wallmodels import LSQRWallModel
+from wallriori.rootfinders import Newton, FixedPoint, Diagnostics
+from wallriori.lawsofthewall import Spalding
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+
+def sampled_spalding(h, nu, uTau):
+    law = Spalding(0.4, 5.5)
+    return np.array([law.explicit_value(y, nu, uTau) for y in h]).ravel()
+
+
+def test_lsqr_fixedpoint():
+    nu = 1e-5
+    h = np.linspace(0.01, 0.1, 10)
+    sampledU = sampled_spalding(h, nu, 0.05)
+
+    model = LSQRWallModel(h, nu, Newton(maxIter=100, eps=1e-10))
+    model.fixedPoint = FixedPoint(maxIter=50, eps=1e-10)
+    uTau = model.utau(0.03, sampledU, 5, 10)
+
+    assert_allclose(model.utau_iteration(uTau, sampledU, 5), uTau, rtol=1e-8)
+
+
+def test_lsqr_kappa_and_b():
+    nu = 1e-5
+    h = np.linspace(0.01, 0.1, 10)
+    sampledU = sampled_spalding(h, nu, 0.05)
+    model = LSQRWallModel(h, nu, Newton(maxIter=100, eps=1e-10))
+
+    assert_allclose(model.kappa_and_b(0.05, sampledU),
+                    model.kappa_and_b_builtin(0.05, sampledU), rtol=1e-8)
+
+
+def test_lsqr_utau_returns_iterate():
+    nu = 1e-5
+    h = np.linspace(0.01, 0.1, 10)
+    sampledU = sampled_spalding(h, nu, 0.05)
+    model = LSQRWallModel(h, nu, Newton(maxIter=100, eps=1e-10))
+
+    uTau = model.utau(0.05, sampledU, 5, 1)
+    assert_allclose(uTau, model.utau_iteration(0.05, sampledU, 5))
+
+
+def test_lsqr_utau_faces():
+    nu = 1e-5
+    h = np.linspace(0.01, 0.1, 10)
+    uTau = np.array([0.03, 0.05, 0.08])
+    sampledU = np.array([sampled_spalding(h, nu, i) for i in uTau])
+    model = LSQRWallModel(h, nu, Newton(maxIter=100, eps=1e-10))
+
+    kappa, b = model.kappa_and_b(uTau, sampledU)
+    for i in range(uTau.size):
+        assert_allclose([kappa[i], b[i]],
+                        model.kappa_and_b(uTau[i], sampledU[i]), rtol=1e-12)
+
+    batched = model.utau_faces(0.04, sampledU, 5, 20, eps=0.5)
+    for i in range(uTau.size):
+        assert_allclose(batched[i], model.utau(0.04, sampledU[i], 5, 20,
+                                               eps=0.5), rtol=1e-8)
+
+
+def test_lsqr_utau_faces_diagnostics():
+    nu = 1e-5
+    h = np.linspace(0.01, 0.1, 10)
+    sampledU = np.array([sampled_spalding(h, nu, i) for i in [0.03, 0.05]])
+    model = LSQRWallModel(h, nu, Newton(maxIter=100, eps=1e-4))
+    model.diagnostics = Diagnostics()
+
+    model.utau_faces(0.04, sampledU, 5, 1)
+    assert model.diagnostics.iterations.shape == (2,)
+    assert np.all(model.diagnostics.iterations == 1)
+    assert not np.any(model.diagnostics.converged)
+
+    model.utau_faces(0.04, sampledU, 5, 300)
+    assert model.diagnostics.converged.shape == (2,)
+    assert np.all(model.diagnostics.converged)
+
+
+def test_lsqr_precomputed_sums():
+    nu = 1e-5
+    h = np.linspace(0.01, 0.1, 10)
+    uTau = np.array([0.03, 0.05, 0.08])
+    sampledU = np.array([sampled_spalding(h, nu, i) for i in uTau])
+    model = LSQRWallModel(h, nu, Newton(maxIter=100, eps=1e-10))
+
+    assert_allclose(model.kappa_and_b(uTau, sampledU),
+                    model.kappa_and_b(uTau, sampledU, h=h), rtol=1e-10)
+
+    model.h = 2*h
+    assert_allclose(model.kappa_and_b(uTau, sampledU),
+                    model.kappa_and_b(uTau, sampledU, h=2*h), rtol=1e-10)
+
+
+def test_lsqr_running_sums():
+    nu = 1e-5
+    h = np.linspace(0.01, 0.1, 10)
+    first = np.array([sampled_spalding(h, nu, i) for i in [0.03, 0.05]])
+    second = 1.1*first
+    model = LSQRWallModel(h, nu, Newton(maxIter=100, eps=1e-10))
+
+    model.update_running_sums(first, 0.2)
+    model.update_running_sums(second, 0.2)
+    average = 0.8*first + 0.2*second
+    assert_allclose(model.runningSums, model.velocity_sums(average),
+                    rtol=1e-12)
+
+    model.update_running_sums(second, 1)
+    assert_allclose(model.utau_faces(0.04, second, 5, 5, running=True),
+                    model.utau_faces(0.04, second, 5, 5, h=h), rtol=1e-10)
+
+
+def test_lsqr_running_sums_in_place():
+    nu = 1e-5
+    h = np.linspace(0.01, 0.1, 10)
+    sampledU = np.array([sampled_spalding(h, nu, i) for i in [0.03, 0.05]])
+    model = LSQRWallModel(h, nu, Newton(maxIter=100, eps=1e-10))
+
+    with pytest.raises(ValueError):
+        model.utau_faces(0.04, sampledU, 5, 5, running=True)
+
+    sums = model.update_running_sums(sampledU, 0.5)
+    assert model.update_running_sums(1.2*sampledU, 0.5) is sums
+    assert_allclose(sums, model.velocity_sums(1.1*sampledU), rtol=1e-12)
+
+    with pytest.raises(ValueError):
+        model.utau_faces(0.04, sampledU, 5, 5, h=h, running=True)
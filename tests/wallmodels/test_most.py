@@ -0,0 +1,133 @@
+# This file is part of wallriori
+# (c) Timofey Mukha
+# The code is released under the MIT Licence.
+# See LICENCE.txt and the Legal section in the README for more information
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from wallriori.wallmodels import MOSTWallModel
+from wallriori.rootfinders import Diagnostics
+import numpy as np
+from numpy.testing import assert_allclose
+
+
+def make_model():
+    return MOSTWallModel(h=10., nu=1.5e-5, z0u=0.1, z0t=0.01, theta0=300.)
+
+
+def test_most_corrections_arrays():
+    model = make_model()
+    zeta = np.array([-2, -0.1, 0, 0.1, 3])
+    assert_allclose(model.correction_u(zeta),
+                    [model.correction_u(i) for i in zeta])
+    assert_allclose(model.correction_t(zeta),
+                    [model.correction_t(i) for i in zeta])
+    assert np.ndim(model.correction_u(0.5)) == 0
+
+
+def test_most_stability_parameter_heat():
+    model = make_model()
+    model.diagnostics = Diagnostics()
+    zeta = np.array([-5, -0.5, -1e-3, 0, 1e-3, 0.5, 2])
+    z0u = np.array([0.1, 0.1, 0.5, 0.1, 0.05, 0.1, 0.1])
+
+    logU = np.log(model.h/z0u)
+    logT = np.log(model.h/model.z0t)
+    rib = zeta*(logT - model.correction_t(zeta)) / \
+        (logU - model.correction_u(zeta))**2
+
+    # theta - theta_s that gives the Richardson number for u = 5
+    theta = 300.
+    u = 5.
+    thetaS = theta - rib*theta*u**2/(model.g*model.h)
+
+    assert_allclose(model.stability_parameter(u, theta, theta_s=thetaS,
+                                              z0u=z0u),
+                    zeta, rtol=1e-8, atol=1e-12)
+    assert np.all(model.diagnostics.converged)
+
+
+def test_most_stability_parameter_flux():
+    model = make_model()
+    # Stable fluxes have two roots, the one closer to neutral is found
+    zeta = np.array([-5, -0.5, 0.2, 0.5])
+    rib = zeta/(np.log(model.h/model.z0u) - model.correction_u(zeta))**3
+
+    theta = 300.
+    u = 5.
+    q = -rib*theta*u**3*model.kappa**2/(model.g*model.h)
+
+    assert_allclose(model.stability_parameter(u, theta, q=q), zeta,
+                    rtol=1e-8)
+
+
+def test_most_utau_and_q():
+    model = make_model()
+    u = np.array([2., 5., 8.])
+    thetaS = np.array([305., 300., 295.])
+    utau, q, lObukhov = model.utau_and_q(u, 300., theta_s=thetaS)
+
+    assert np.isinf(lObukhov[1])
+    assert_allclose(utau[1], model.kappa*u[1]/np.log(model.h/model.z0u))
+    assert q[0] > 0 and q[2] < 0
+
+    # The Obukhov length is consistent with the fluxes
+    assert_allclose(lObukhov[[0, 2]],
+                    -(utau**3*300.)[[0, 2]]/(model.kappa*model.g*q[[0, 2]]),
+                    rtol=1e-6)
+
+
+def test_most_stability_table():
+    model = make_model()
+    logU = np.log(model.h/model.z0u)
+    rib, zeta = model.stability_table(logU)
+
+    assert np.all(np.diff(rib) > 0)
+    assert model.stability_table(logU) is model.stability_table(logU)
+    assert_allclose(model._rib_of_zeta(zeta, logU), rib)
+
+
+def test_most_stability_parameter_table():
+    model = make_model()
+    u = np.linspace(1, 10, 50)
+    thetaS = np.linspace(295, 305, 50)
+    z0u = np.where(np.arange(50) % 2 == 0, model.z0u, 2*model.z0u)
+
+    for z in (None, z0u):
+        assert_allclose(model.stability_parameter(u, 300., theta_s=thetaS,
+                                                  z0u=z, table=True),
+                        model.stability_parameter(u, 300., theta_s=thetaS,
+                                                  z0u=z),
+                        atol=1e-4)
+
+    q = np.linspace(-0.01, 0.1, 20)
+    assert_allclose(model.stability_parameter(5., 300., q=q, table=True),
+                    model.stability_parameter(5., 300., q=q), atol=1e-4)
+
+
+def test_most_stability_table_out_of_range():
+    model = make_model()
+    model.diagnostics = Diagnostics()
+    # Supercritical Richardson number, outside the table
+    u = np.array([5., 0.5])
+    model.stability_parameter(u, 310., theta_s=300., table=True)
+    assert_allclose(model.diagnostics.converged, [True, False])
+
+
+def test_most_stability_table_many_roughnesses():
+    model = make_model()
+    model.diagnostics = Diagnostics()
+    tables = len(MOSTWallModel._tables)
+    z0u = np.linspace(0.05, 0.15, 50)
+
+    # Too many roughness combinations use the Newton iterations
+    zeta = model.stability_parameter(5., 300., theta_s=299., z0u=z0u,
+                                     table=True)
+    assert_allclose(zeta, model.stability_parameter(5., 300., theta_s=299.,
+                                                    z0u=z0u))
+    assert len(MOSTWallModel._tables) == tables
+
+    for z in np.linspace(0.05, 0.15, 2*MOSTWallModel._maxTables):
+        model.stability_table(np.log(model.h/z))
+    assert len(MOSTWallModel._tables) == MOSTWallModel._maxTables
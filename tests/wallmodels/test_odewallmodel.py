@@ -0,0 +1,128 @@
+# This file is part of wallriori
+# (c) Timofey Mukha
+# The code is released under the MIT Licence.
+# See LICENCE.txt and the Legal section in the README for more information
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from wallriori.wallmodels import ODEWallModel
+from wallriori.eddyviscosities import VanDriestEddyViscosity
+from wallriori.eddyviscosities import DupratEddyViscosity
+from wallriori.problems import SteadyDiffusion
+from wallriori.mesh import Mesh
+from wallriori.rootfinders import Diagnostics, FixedPoint
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+
+def make_model(eddyViscosity=None):
+    if eddyViscosity is None:
+        eddyViscosity = VanDriestEddyViscosity()
+    return ODEWallModel.from_cell_number(0.1, 1e-4, eddyViscosity, 30, 200,
+                                         1e-10)
+
+
+def test_odewallmodel_utau_faces_matches_single():
+    model = make_model()
+    sampledU = np.array([0.5, 1., 1.5])
+
+    uTau, profiles = model.utau_faces(0.04, sampledU, 0, profiles=True)
+    assert profiles.shape == (3, 30)
+
+    for i in range(sampledU.size):
+        single = model.utau(0.04, sampledU[i], 0)
+        assert_allclose(uTau[i], single, rtol=1e-8)
+        assert_allclose(profiles[i], model.u, rtol=1e-6)
+
+
+def test_odewallmodel_utau_faces_scaled_height():
+    model = make_model()
+    h = np.array([0.05, 0.1, 0.2])
+    uTau = model.utau_faces(0.04, 1., 0.5, h=h)
+
+    for i in range(h.size):
+        single = make_model()
+        single = single.from_cell_number(h[i], 1e-4, VanDriestEddyViscosity(),
+                                         30, 200, 1e-10)
+        assert_allclose(uTau[i], single.utau(0.04, 1., 0.5), rtol=1e-8)
+
+
+def test_odewallmodel_utau_faces_kwargs():
+    model = make_model(DupratEddyViscosity())
+    magPGrad = np.array([0., 0.1, 1.])
+    uTau = model.utau_faces(0.04, 1., 0, magPGrad=magPGrad)
+
+    for i in range(magPGrad.size):
+        single = model.utau(0.04, 1., 0, magPGrad=magPGrad[i])
+        assert_allclose(uTau[i], single, rtol=1e-8)
+
+
+def test_odewallmodel_utau_reference():
+    model = make_model()
+    nu = model.nu
+    eddyViscosity = model.eddyViscosity
+
+    uTau = 0.04
+    for i in range(200):
+        nut = eddyViscosity.value(np.append(model.y, model.h), nu, uTau)
+        ode = SteadyDiffusion(model.mesh, np.zeros(model.y.size),
+                              nu + nut[:-1], [0, nu], [1., nu + nut[-1]], 0.5)
+        ode.solve(dense=True)
+        uTauOld = uTau
+        uTau = np.sqrt(nu*ode.solution[0]/model.y[0])
+        if np.abs(uTau - uTauOld)/uTauOld < 1e-10:
+            break
+
+    assert_allclose(model.utau(0.04, 1., 0.5), uTau, rtol=1e-8)
+    assert_allclose(model.u, ode.solution, rtol=1e-8)
+
+
+def test_odewallmodel_workspace_reused():
+    model = make_model()
+    workspace = model.workspace()
+    model.utau(0.04, 1., 0)
+    u = model.u
+    model.utau(0.04, 2., 0)
+
+    assert model.workspace() is workspace
+    assert not np.shares_memory(u, model.u)
+
+    model.mesh = Mesh.from_faces(np.linspace(0, 0.1, 21))
+    assert model.workspace() is not workspace
+
+
+def test_odewallmodel_newton():
+    for eddyViscosity, kwargs in [(VanDriestEddyViscosity(), {}),
+                                  (DupratEddyViscosity(), {"magPGrad": 0.5})]:
+        picard = make_model(eddyViscosity)
+        newton = ODEWallModel.from_cell_number(0.1, 1e-4, eddyViscosity, 30,
+                                               200, 1e-10, method="newton")
+        newton.diagnostics = Diagnostics()
+        picard.diagnostics = Diagnostics()
+
+        for sampledU in [0.2, 1, 5]:
+            assert_allclose(newton.utau(0.04, sampledU, 0.3, **kwargs),
+                            picard.utau(0.04, sampledU, 0.3, **kwargs),
+                            rtol=1e-8)
+            assert_allclose(newton.u, picard.u, rtol=1e-7)
+            assert newton.diagnostics.iterations < \
+                picard.diagnostics.iterations
+
+
+def test_odewallmodel_method():
+    with pytest.raises(ValueError):
+        make_model().method = "secant"
+
+
+def test_odewallmodel_fixedpoint():
+    model = make_model()
+    reference = model.utau(0.04, 5., 0.3)
+
+    model.fixedPoint = FixedPoint(maxIter=100, eps=1e-10)
+    model.fixedPoint.diagnostics = Diagnostics()
+    uTau = model.utau(0.04, 5., 0.3)
+
+    assert_allclose(uTau, reference, rtol=1e-8)
+    assert model.fixedPoint.diagnostics.iterations < 15
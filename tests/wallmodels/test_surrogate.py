@@ -0,0 +1,98 @@
+# This file is part of wallriori
+# (c) Timofey Mukha
+# The code is released under the MIT Licence.
+# See LICENCE.txt and the Legal section in the README for more information
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from wallriori.wallmodels import ODEWallModel, GriffinFuWallModel
+from wallriori.wallmodels import SurrogateWallModel
+from wallriori.eddyviscosities import VanDriestEddyViscosity
+from wallriori.mesh import Mesh
+from wallriori.rootfinders import Diagnostics
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+
+def make_model():
+    return ODEWallModel.from_cell_number(0.1, 1e-4, VanDriestEddyViscosity(),
+                                         30, 500, 1e-10)
+
+
+def test_surrogate_ode():
+    model = make_model()
+    model.diagnostics = Diagnostics()
+    surrogate = SurrogateWallModel(model, n=100, reMin=10, reMax=1e6,
+                                   sourceField=0)
+
+    assert np.all(surrogate.converged)
+    assert surrogate.error < 1e-3
+    # The diagnostics of the model are not overwritten by the build
+    assert model.diagnostics.converged is None
+
+    sampledU = np.array([0.1, 0.5, 1., 5.])
+    reference = model.utau_faces(0.01, sampledU, 0)
+    assert_allclose(surrogate.utau(sampledU), reference,
+                    rtol=surrogate.error)
+    assert np.ndim(surrogate.utau(1.)) == 0
+
+    # One more iteration of the model reduces the error
+    surrogate.polish = True
+    polished = surrogate.utau(sampledU)
+    surrogate.polish = False
+    assert np.all(np.abs(polished - reference) <
+                  np.abs(surrogate.utau(sampledU) - reference))
+    assert model.maxiter == 500
+
+
+def test_surrogate_ode_source():
+    model = make_model()
+    # Values of beta = sourceField*h/u^2, over a wide range of sources
+    beta = np.concatenate([[0], np.logspace(-4, 1, 21)])
+    surrogate = SurrogateWallModel(model, n=60, reMin=10, reMax=1e6,
+                                   parameter="sourceField", values=beta,
+                                   tolerance=0.03)
+    assert surrogate.table.shape == (60, 22)
+    assert np.all(surrogate.converged)
+    assert surrogate.error < 0.03
+
+    sampledU = np.array([0.01, 0.05, 0.5, 1., 5., 50.])
+    source = np.array([0., 1e-3, 0.1, 1., 1., 10.])
+    reference = model.utau_faces(0.01, sampledU, source)
+    interpolated = surrogate.utau(sampledU, source)
+    assert_allclose(interpolated, reference, rtol=surrogate.error)
+
+    surrogate.polish = True
+    assert np.all(np.abs(surrogate.utau(sampledU, source) - reference) <=
+                  np.abs(interpolated - reference))
+
+    with pytest.raises(ValueError):
+        surrogate.utau(sampledU)
+
+
+def test_surrogate_tolerance():
+    with pytest.warns(RuntimeWarning):
+        surrogate = SurrogateWallModel(make_model(), n=20, reMin=10,
+                                       reMax=1e6, parameter="sourceField",
+                                       values=[0, 10])
+    assert surrogate.error > 1e-2
+
+
+def test_surrogate_griffinfu():
+    mesh = Mesh.from_faces(np.linspace(0, 0.1, 60))
+    model = GriffinFuWallModel(0.1, 1e-4, mesh, 200, 1e-10)
+    surrogate = SurrogateWallModel(model, n=100, reMin=100, reMax=1e6,
+                                   H=1.4, reTau=1000)
+    assert np.all(surrogate.converged)
+
+    sampledU = np.array([0.5, 1., 5.])
+    assert_allclose(surrogate.utau(sampledU),
+                    model.utau_faces(0.01, sampledU, 1.4, 1000),
+                    rtol=surrogate.error)
+
+
+def test_surrogate_parameter_values():
+    with pytest.raises(ValueError):
+        SurrogateWallModel(make_model(), parameter="sourceField")
@@ -0,0 +1,65 @@
+# This file is part of wallriori
+# (c) Timofey Mukha
+# The code is released under the MIT Licence.
+# See LICENCE.txt and the Legal section in the README for more information
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from wallriori.wallmodels import WarmStart, LOTWWallModel
+from wallriori.rootfinders import Newton
+from wallriori.lawsofthewall import Spalding
+from numpy.testing import assert_allclose, assert_array_equal
+import numpy as np
+
+
+def test_warmstart_init():
+    store = WarmStart()
+    assert store.faces.size == 0
+    assert store.profiles is None
+    assert store.guess(3, 0.1) == 0.1
+
+
+def test_warmstart_update_and_guess():
+    store = WarmStart()
+    store.update(np.array([5, 1, 3]), np.array([0.5, 0.1, 0.3]))
+    assert_array_equal(store.faces, [1, 3, 5])
+    assert_allclose(store.guess(np.array([3, 7, 5]), 0), [0.3, 0, 0.5])
+
+    store.update(np.array([7, 3]), np.array([0.7, 0.33]))
+    assert_allclose(store.guess(np.array([1, 3, 5, 7]), 0),
+                    [0.1, 0.33, 0.5, 0.7])
+    assert store.guess(7, 0) == 0.7
+
+
+def test_warmstart_profiles():
+    store = WarmStart()
+    store.update(np.array([2, 1]), 0.1, np.array([[2., 2.], [1., 1.]]))
+    store.update(np.array([3]), 0.1)
+    profiles = store.profile(np.array([1, 3]))
+    assert_allclose(profiles[0], [1, 1])
+    assert np.all(np.isnan(profiles[1]))
+
+
+def test_warmstart_retain_and_renumber():
+    store = WarmStart()
+    store.update(np.array([1, 2, 3]), np.array([0.1, 0.2, 0.3]))
+    store.retain(np.array([1, 3]))
+    assert_array_equal(store.faces, [1, 3])
+
+    store.renumber(np.array([1, 3]), np.array([30, 10]))
+    assert_array_equal(store.faces, [10, 30])
+    assert_allclose(store.guess(np.array([10, 30]), 0), [0.3, 0.1])
+
+
+def test_warmstart_lotw():
+    faces = np.array([4, 2, 9])
+    sampledU = np.array([0.1, 0.5, 1.0])
+    w = LOTWWallModel(0.1, 8e-6, Spalding(), Newton(eps=1e-10))
+    w.warmStart = WarmStart()
+    uTau = w.utau(np.array([0.005, 0.03, 0.05]), sampledU, faces=faces)
+
+    # A single iteration from the stored values is enough
+    w.rootFinder.maxIter = 1
+    assert_allclose(w.utau(1., sampledU[::-1], faces=faces[::-1]),
+                    uTau[::-1], rtol=1e-10)
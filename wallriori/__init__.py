@@ -9,11 +9,14 @@ from .mesh import *
 from .wallmodels import *
 from .problems import *
 from .eddyviscosities import *
+from .quadrature import *
 
-__all__ = ["rootfinders", "lawsofthewall", "mesh", "wallmodels", "problems", "eddyviscosities"]
+__all__ = ["rootfinders", "lawsofthewall", "mesh", "wallmodels", "problems", "eddyviscosities",
+           "quadrature"]
 __all__.extend(rootfinders.__all__)
 __all__.extend(lawsofthewall.__all__)
 __all__.extend(mesh.__all__)
 __all__.extend(wallmodels.__all__)
 __all__.extend(problems.__all__)
 __all__.extend(eddyviscosities.__all__)
+__all__.extend(quadrature.__all__)
@@ -44,6 +44,12 @@ class VanDriestEddyViscosity(EddyViscosity):
         yPlus = y*uTau/nu
         return self.kappa*uTau*y*(1 - np.exp(-yPlus/self.Aplus))**2
 
+    def derivative(self, y, nu, uTau, **kwargs):
+        """The derivative of the eddy viscosity with respect to uTau."""
+        damping = np.exp(-y*uTau/(nu*self.Aplus))
+        return self.kappa*y*(1 - damping)*(
+            1 - damping + 2*uTau*y*damping/(nu*self.Aplus))
+
 
 class DupratEddyViscosity(EddyViscosity):
 
@@ -87,3 +93,27 @@ class DupratEddyViscosity(EddyViscosity):
         return nu*self.kappa*yStar*(alpha + yStar*(1 - alpha)**1.5)**self.beta * \
                (1 - np.exp(-yStar/(1 + self.Aplus*alpha**3)))**2
 
+    def derivative(self, y, nu, uTau, magPGrad):
+        """The derivative of the eddy viscosity with respect to uTau."""
+        uP = (nu*magPGrad)**(1./3)
+        uTauP = np.sqrt(uTau**2 + uP**2)
+        alpha = uTau**2/uTauP**2
+        yStar = y*uTauP/nu
+
+        dAlpha = 2*uTau/uTauP**2*(1 - alpha)
+        dYStar = y/nu*uTau/uTauP
+
+        p = alpha + yStar*(1 - alpha)**1.5
+        dP = (dAlpha + dYStar*(1 - alpha)**1.5 -
+              1.5*yStar*np.sqrt(1 - alpha)*dAlpha)
+
+        denominator = 1 + self.Aplus*alpha**3
+        q = yStar/denominator
+        dQ = (dYStar - q*3*self.Aplus*alpha**2*dAlpha)/denominator
+
+        damping = 1 - np.exp(-q)
+        dDamping = 2*damping*np.exp(-q)*dQ
+
+        return nu*self.kappa*p**(self.beta - 1)*(
+            (dYStar*p + yStar*self.beta*dP)*damping**2 + yStar*p*dDamping)
+
@@ -7,17 +7,52 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 import numpy as np
-from functools import partial
+import warnings
 from ..rootfinders.rootfinders import Newton
 
 __all__ = ["LawOfTheWall", "Spalding", "WernerWengle", "Reichardt",
-           "IntegratedWernerWengle", "IntegratedReichardt", "CaiSagaut"]
+           "IntegratedWernerWengle", "IntegratedReichardt", "CaiSagaut",
+           "TabulatedInverse"]
 
 
 class LawOfTheWall:
 
     def __init__(self):
-        pass
+        self._constants = None
+
+    def constants(self):
+        """
+        Return the constants derived from the coefficients of the law.
+
+        The constants are computed on first use and cached, the property
+        setters of the coefficients invalidate the cache.
+        """
+        if self._constants is None:
+            self._constants = self._compute_constants()
+        return self._constants
+
+    def _compute_constants(self):
+        return ()
+
+    def value_and_derivative(self, *args):
+        """
+        Return the value of the implicit function defined by the law
+        and of its derivative at once.
+
+        Laws override this to share the common subexpressions of the
+        two evaluations.
+        """
+        return self.value(*args), self.derivative(*args)
+
+    def value_and_derivatives(self, *args):
+        """
+        Return the value of the implicit function defined by the law
+        and of its first and second derivatives at once.
+
+        Only available for the laws that define second_derivative.
+        """
+        return (self.value(*args), self.derivative(*args),
+                self.second_derivative(*args))
 
 
 class Spalding(LawOfTheWall):
@@ -26,6 +61,9 @@ class Spalding(LawOfTheWall):
         LawOfTheWall.__init__(self)
         self.kappa = kappa
         self.B = B
+        self.__newton = Newton(
+            maxIter=100, eps=1e-10,
+            valueAndDerivative=self._profile_value_and_derivative)
 
     @property
     def kappa(self):
@@ -38,47 +76,93 @@ class Spalding(LawOfTheWall):
     @kappa.setter
     def kappa(self, value):
         self.__kappa = value
+        self._constants = None
 
     @B.setter
     def B(self, value):
         self.__B = value
+        self._constants = None
+
+    def explicit_value(self, y, nu, uTau, kappa=None, B=None, guess=None):
+        """
+        Return the value of velocity.
+
+        The arguments can be arrays, for instance many wall distances
+        with a shared friction velocity, and the law is then solved for
+        all the points at once. The velocity is zero at points where y+
+        is zero, these are not passed to the solver.
+
+        Parameters
+        ----------
+        y : float or ndarray
+            Wall-normal distance.
+        nu : float or ndarray
+            Kinematic viscosity.
+        uTau : float or ndarray
+            Friction velocity.
+        kappa, B : optional
+            Deprecated and ignored, the coefficients of the law are used.
+        guess : float or ndarray, optional
+            Initial guess for the velocity. By default, the smallest of
+            the viscous sublayer and log-law values is used, which lies
+            above the solution.
+
+        Returns
+        -------
+        float or ndarray
+            The velocity.
+
+        """
+        if kappa is not None or B is not None:
+            warnings.warn("The kappa and B arguments of explicit_value are "
+                          "ignored, set the coefficients of the law instead",
+                          DeprecationWarning, stacklevel=2)
+
+        kappa, expKappaB = self.constants()
 
-    def explicit_value(self, y, nu, uTau, kappa=0.4, B=5.5, guess=1):
-        """Return the value velocity."""
+        yPlus = y*uTau/nu
+        wall = yPlus == 0
+        if guess is None:
+            uPlus = np.minimum(yPlus, np.log1p(yPlus)/kappa + self.B)
+        else:
+            uPlus = guess/np.where(wall, 1, uTau)
 
-        newton = Newton(maxIter=500, eps=1e-3)
+        if not np.any(wall):
+            return uTau*self.__newton.solve(uPlus, args=(yPlus,))
 
-        def val(y, nu, uTau, u):
-            return self.value(u, y, nu, uTau)
+        shape = np.broadcast(yPlus, uPlus).shape
+        wall = np.broadcast_to(wall, shape)
+        solution = np.zeros(shape)
+        if not np.all(wall):
+            solution[~wall] = self.__newton.solve(
+                np.broadcast_to(uPlus, shape)[~wall],
+                args=(np.broadcast_to(yPlus, shape)[~wall],))
+        return (uTau*solution)[()]
 
-        def deriv(y, nu, uTau, u):
-            B = 5.5
-            kappa = 0.4
+    def _profile_value_and_derivative(self, yPlus, uPlus):
+        """Return the value of the law as an equation for u+ and of its
+        derivative with respect to u+."""
 
-            uPlus = u/uTau
-            x = kappa*uPlus
-            y = kappa/uTau
-            return (1/uTau +
-                   np.exp(-kappa*B)*(y*np.exp(x) - y - y*x -0.5*y*x**2))
+        kappa, expKappaB = self.constants()
 
-        f = partial(val, y, nu, uTau)
-        d = partial(deriv, y, nu, uTau)
+        x = kappa*uPlus
+        series = np.exp(x) - 1 - x - 0.5*x**2
 
-        newton.f = f
-        newton.d = d
+        return (uPlus + expKappaB*(series - 1./6*x**3) - yPlus,
+                1 + kappa*expKappaB*series)
 
-        return newton.solve(guess=guess)
+    def _compute_constants(self):
+        return self.kappa, np.exp(-self.kappa*self.B)
 
     def value(self, u, y, nu, uTau):
         """Return the value of the implicit function defined by the
          law."""
 
-        kappa = self.kappa
-        B = self.B
+        kappa, expKappaB = self.constants()
 
         uPlus = u/uTau
         yPlus = y*uTau/nu
-        return (uPlus + np.exp(-kappa*B)*(np.exp(kappa*uPlus) - 1 -
+        return (uPlus + expKappaB*(np.exp(kappa*uPlus) - 1 -
                 kappa*uPlus - 0.5*(kappa*uPlus)**2 - 1./6*(kappa*uPlus)**3) -
                 yPlus)
 
@@ -86,13 +170,49 @@ class Spalding(LawOfTheWall):
         """Return the value of the derivative of the implicit function
          defined by the law."""
 
+        kappa, expKappaB = self.constants()
         uPlus = u/uTau
-        kappa = self.kappa
-        B = self.B
 
-        return (-y/nu - u/uTau**2 - kappa*uPlus/uTau*np.exp(-kappa*B) *
+        return (-y/nu - u/uTau**2 - kappa*uPlus/uTau*expKappaB *
                 (np.exp(kappa*uPlus) - 1 - kappa*uPlus - 0.5*(kappa*uPlus)**2))
 
+    def value_and_derivative(self, u, y, nu, uTau):
+        """Return the value of the implicit function defined by the law
+         and of its derivative."""
+
+        kappa, expKappaB = self.constants()
+
+        uPlus = u/uTau
+        x = kappa*uPlus
+        series = np.exp(x) - 1 - x - 0.5*x**2
+
+        value = uPlus + expKappaB*(series - 1./6*x**3) - y*uTau/nu
+        derivative = -y/nu - uPlus/uTau - x/uTau*expKappaB*series
+        return value, derivative
+
+    def second_derivative(self, u, y, nu, uTau):
+        """Return the value of the second derivative of the implicit
+         function defined by the law."""
+
+        return self.value_and_derivatives(u, y, nu, uTau)[2]
+
+    def value_and_derivatives(self, u, y, nu, uTau):
+        """Return the value of the implicit function defined by the law
+         and of its first and second derivatives."""
+
+        kappa, expKappaB = self.constants()
+
+        uPlus = u/uTau
+        x = kappa*uPlus
+        series1 = np.exp(x) - 1 - x
+        series2 = series1 - 0.5*x**2
+
+        value = uPlus + expKappaB*(series2 - 1./6*x**3) - y*uTau/nu
+        derivative = -y/nu - uPlus/uTau - x/uTau*expKappaB*series2
+        secondDerivative = (2*uPlus +
+                            expKappaB*x*(2*series2 + x*series1))/uTau**2
+        return value, derivative, secondDerivative
+
 
 class WernerWengle(LawOfTheWall):
 
@@ -112,50 +232,71 @@ class WernerWengle(LawOfTheWall):
     @A.setter
     def A(self, value):
         self.__A = value
+        self._constants = None
 
     @B.setter
     def B(self, value):
         self.__B = value
+        self._constants = None
+
+    def _compute_constants(self):
+        A = self.A
+        B = self.B
+        return A, B, A**(1/(1 - B))
 
     def explicit_value(self, y, nu, uTau):
         """Return the value of velocity."""
 
-        A = self.A
-        B = self.B
+        A, B, yPlusSwitch = self.constants()
 
         yPlus = y*uTau/nu
-        if yPlus <= A**(1/(1 - B)):
-            return uTau*yPlus
-        else:
-            return uTau*A*yPlus**B
+        return np.where(yPlus <= yPlusSwitch, uTau*yPlus, uTau*A*yPlus**B)
+
+    def utau(self, u, y, nu):
+        """Return the friction velocity, all arguments can be arrays."""
+
+        A, B, yPlusSwitch = self.constants()
+
+        re = u*y/nu
+        return np.where(re <= yPlusSwitch**2, np.sqrt(u*nu/y),
+                        (u/A*(nu/y)**B)**(1/(1 + B)))
 
     def value(self, u, y, nu, uTau):
         """Return the value of the implicit function defined by the
          law"""
 
-        A = self.A
-        B = self.B
+        A, B, yPlusSwitch = self.constants()
 
         uPlus = u/uTau
         yPlus = y*uTau/nu
-        if yPlus <= A**(1/(1 - B)):
-            return uPlus - yPlus
-        else:
-            return uPlus - A*yPlus**B
+        return np.where(yPlus <= yPlusSwitch, uPlus - yPlus,
+                        uPlus - A*yPlus**B)
 
     def derivative(self, u, y, nu, uTau):
         """Return the value of the derivative of the implicit function
          defined by the law"""
 
-        A = self.A
-        B = self.B
+        A, B, yPlusSwitch = self.constants()
 
         yPlus = y*uTau/nu
 
-        if yPlus <= A**(1/(1 - B)):
-            return -u/uTau**2 - y/nu
-        else:
-            return -u/uTau**2 - A*B*(y/nu)**B*uTau**(B - 1)
+        return np.where(yPlus <= yPlusSwitch, -u/uTau**2 - y/nu,
+                        -u/uTau**2 - A*B*(y/nu)**B*uTau**(B - 1))
+
+    def value_and_derivative(self, u, y, nu, uTau):
+        """Return the value of the implicit function defined by the law
+         and of its derivative."""
+
+        A, B, yPlusSwitch = self.constants()
+
+        uPlus = u/uTau
+        yPlus = y*uTau/nu
+        viscous = yPlus <= yPlusSwitch
+        logLaw = A*yPlus**B
+
+        value = uPlus - np.where(viscous, yPlus, logLaw)
+        derivative = -uPlus/uTau - np.where(viscous, y/nu, B*logLaw/uTau)
+        return value, derivative
 
 
 class Reichardt(LawOfTheWall):
@@ -186,62 +327,107 @@ class Reichardt(LawOfTheWall):
     @kappa.setter
     def kappa(self, value):
         self.__kappa = value
+        self._constants = None
 
     @B1.setter
     def B1(self, value):
         self.__B1 = value
+        self._constants = None
 
     @B2.setter
     def B2(self, value):
         self.__B2 = value
+        self._constants = None
 
     @C.setter
     def C(self, value):
         self.__C = value
+        self._constants = None
+
+    def _compute_constants(self):
+        return self.kappa, 1/self.B1, 1/self.B2, self.C
 
     def explicit_value(self, y, nu, uTau):
         """Return the value of velocity."""
 
-        kappa = self.kappa
-        B1 = self.B1
-        B2 = self.B2
-        C = self.C
+        kappa, invB1, invB2, C = self.constants()
 
         yPlus = y*uTau/nu
 
         return uTau*(1/kappa*np.log(1 + kappa*yPlus) +
-                     C*(1 - np.exp(-yPlus/B1) - yPlus/B1*np.exp(-yPlus/B2)))
+                     C*(1 - np.exp(-yPlus*invB1) -
+                        yPlus*invB1*np.exp(-yPlus*invB2)))
 
     def value(self, u, y, nu, uTau):
         """Return the value of the implicit function defined by the
          law"""
 
-        kappa = self.kappa
-        B1 = self.B1
-        B2 = self.B2
-        C = self.C
+        kappa, invB1, invB2, C = self.constants()
 
         uPlus = u/uTau
         yPlus = y*uTau/nu
 
         return (uPlus - 1/kappa*np.log(1 + kappa*yPlus) -
-                C*(1 - np.exp(-yPlus/B1) - yPlus/B1*np.exp(-yPlus/B2)))
+                C*(1 - np.exp(-yPlus*invB1) -
+                   yPlus*invB1*np.exp(-yPlus*invB2)))
 
     def derivative(self, u, y, nu, uTau):
         """Return the value of the derivative of the implicit function
          defined by the law"""
 
-        kappa = self.kappa
-        B1 = self.B1
-        B2 = self.B2
-        C = self.C
+        kappa, invB1, invB2, C = self.constants()
 
         uPlus = u/uTau
         yPlus = y*uTau/nu
 
         return (-uPlus/uTau - y/nu/(1 + kappa*yPlus) -
-                C*y/(nu*B1)*(np.exp(-yPlus/B1) - np.exp(-yPlus/B2) +
-                             yPlus/B2*np.exp(-yPlus/B2)))
+                C*y/nu*invB1*(np.exp(-yPlus*invB1) - np.exp(-yPlus*invB2) +
+                              yPlus*invB2*np.exp(-yPlus*invB2)))
+
+    def value_and_derivative(self, u, y, nu, uTau):
+        """Return the value of the implicit function defined by the law
+         and of its derivative."""
+
+        kappa, invB1, invB2, C = self.constants()
+
+        uPlus = u/uTau
+        yPlus = y*uTau/nu
+        exp1 = np.exp(-yPlus*invB1)
+        exp2 = np.exp(-yPlus*invB2)
+
+        value = (uPlus - 1/kappa*np.log(1 + kappa*yPlus) -
+                 C*(1 - exp1 - yPlus*invB1*exp2))
+        derivative = (-uPlus/uTau - y/nu/(1 + kappa*yPlus) -
+                      C*y/nu*invB1*(exp1 - exp2 + yPlus*invB2*exp2))
+        return value, derivative
+
+    def second_derivative(self, u, y, nu, uTau):
+        """Return the value of the second derivative of the implicit
+         function defined by the law"""
+
+        return self.value_and_derivatives(u, y, nu, uTau)[2]
+
+    def value_and_derivatives(self, u, y, nu, uTau):
+        """Return the value of the implicit function defined by the law
+         and of its first and second derivatives."""
+
+        kappa, invB1, invB2, C = self.constants()
+
+        uPlus = u/uTau
+        yPlus = y*uTau/nu
+        a = y/nu
+        exp1 = np.exp(-yPlus*invB1)
+        exp2 = np.exp(-yPlus*invB2)
+
+        value = (uPlus - 1/kappa*np.log(1 + kappa*yPlus) -
+                 C*(1 - exp1 - yPlus*invB1*exp2))
+        derivative = (-uPlus/uTau - a/(1 + kappa*yPlus) -
+                      C*a*invB1*(exp1 - exp2 + yPlus*invB2*exp2))
+        secondDerivative = (2*uPlus/uTau**2 +
+                            kappa*a**2/(1 + kappa*yPlus)**2 -
+                            C*a**2*invB1*(-exp1*invB1 + 2*exp2*invB2 -
+                                          yPlus*exp2*invB2**2))
+        return value, derivative, secondDerivative
 
 
 class IntegratedWernerWengle(LawOfTheWall):
@@ -262,20 +448,30 @@ class IntegratedWernerWengle(LawOfTheWall):
     @A.setter
     def A(self, value):
         self.__A = value
+        self._constants = None
 
     @B.setter
     def B(self, value):
         self.__B = value
+        self._constants = None
+
+    def _compute_constants(self):
+        A = self.A
+        B = self.B
+        return B, (1 + B)/A, (1 - B)/2*A**((1 + B)/(1 - B)), 1/(B + 1)
+
+    def utau(self, u, h1, h2, nu):
+        """Return the friction velocity, all arguments can be arrays."""
+
+        B, c1, c2, exponent = self.constants()
+
+        return (c1*(nu/h2)**B*u + c2*(nu/h2)**(B + 1))**exponent
 
     def value(self, u, h1, h2, nu, uTau):
         """Return the value of the implicit function defined by the
          law"""
 
-        A = self.A
-        B = self.B
-
-        return (uTau - ((1 + B)/A*(nu/h2)**B*u +
-                (1 - B)/2*A**((1 + B)/(1 - B))*(nu/h2)**(B + 1))**(1/(B + 1)))
+        return uTau - self.utau(u, h1, h2, nu)
 
     def derivative(self, u, h1, h2, nu, uTau):
         """Return the value of the derivative of the implicit function
@@ -283,6 +479,12 @@ class IntegratedWernerWengle(LawOfTheWall):
 
         return 1
 
+    def value_and_derivative(self, u, h1, h2, nu, uTau):
+        """Return the value of the implicit function defined by the law
+         and of its derivative."""
+
+        return uTau - self.utau(u, h1, h2, nu), 1
+
 
 class IntegratedReichardt(LawOfTheWall):
 
@@ -312,31 +514,36 @@ class IntegratedReichardt(LawOfTheWall):
     @kappa.setter
     def kappa(self, value):
         self.__kappa = value
+        self._constants = None
 
     @B1.setter
     def B1(self, value):
         self.__B1 = value
+        self._constants = None
 
     @B2.setter
     def B2(self, value):
         self.__B2 = value
+        self._constants = None
 
     @C.setter
     def C(self, value):
         self.__C = value
+        self._constants = None
+
+    def _compute_constants(self):
+        return self.kappa, 1/self.B1, 1/self.B2, self.C
 
     def explicit_value(self, y, nu, uTau):
         """Return the value of velocity."""
 
-        kappa = self.kappa
-        B1 = self.B1
-        B2 = self.B2
-        C = self.C
+        kappa, invB1, invB2, C = self.constants()
 
         yPlus = y*uTau/nu
 
         return uTau*(1/kappa*np.log(1 + kappa*yPlus) +
-                     C*(1 - np.exp(-yPlus/B1) - yPlus/B1*np.exp(-yPlus/B2)))
+                     C*(1 - np.exp(-yPlus*invB1) -
+                        yPlus*invB1*np.exp(-yPlus*invB2)))
 
     def value(self, u, h1, h2, nu, uTau):
         """Return the value of the implicit function defined by the
@@ -364,38 +571,73 @@ class IntegratedReichardt(LawOfTheWall):
                  self.expterm_derivative(h2, uTau, nu) -
                  self.expterm_derivative(h1, uTau, nu))
 
+    def value_and_derivative(self, u, h1, h2, nu, uTau):
+        """Return the value of the implicit function defined by the law
+         and of its derivative."""
+
+        term2, derivative2 = self.terms_and_derivatives(h2, uTau, nu)[:2]
+        term1, derivative1 = self.terms_and_derivatives(h1, uTau, nu)[:2]
+        return u - (term2 - term1), -(derivative2 - derivative1)
+
+    def second_derivative(self, u, h1, h2, nu, uTau):
+        """Return the value of the second derivative of the implicit
+         function defined by the law"""
+
+        return -(self.terms_and_derivatives(h2, uTau, nu)[2] -
+                 self.terms_and_derivatives(h1, uTau, nu)[2])
+
+    def value_and_derivatives(self, u, h1, h2, nu, uTau):
+        """Return the value of the implicit function defined by the law
+         and of its first and second derivatives."""
+
+        term2, derivative2, second2 = self.terms_and_derivatives(h2, uTau, nu)
+        term1, derivative1, second1 = self.terms_and_derivatives(h1, uTau, nu)
+        return (u - (term2 - term1), -(derivative2 - derivative1),
+                -(second2 - second1))
+
     def logterm(self, y, uTau, nu):
         kappa = self.kappa
         yPlus = y*uTau/nu
         return nu/kappa*(-yPlus + np.log(1 + kappa*yPlus)*(yPlus + 1/kappa))
 
     def expterm(self, y, uTau, nu):
-        B1 = self.B1
-        B2 = self.B2
-        C = self.C
+        kappa, invB1, invB2, C = self.constants()
         yPlus = y*uTau/nu
 
         term1 = yPlus
-        term2 = B1*np.exp(-yPlus/B1)
-        term3 = B2*(B2 + yPlus)/B1*np.exp(-yPlus/B2)
+        term2 = np.exp(-yPlus*invB1)/invB1
+        term3 = (1/invB2 + yPlus)*invB1/invB2*np.exp(-yPlus*invB2)
         return C*nu*(term1 + term2 + term3)
 
     def logterm_derivative(self, y, uTau, nu):
         kappa = self.kappa
         yPlus = y*uTau/nu
 
-        return y*(yPlus/(kappa*yPlus + 1) -
-                  1/kappa +
-                  1/kappa*np.log(kappa*yPlus + 1) +
-                  1/(kappa*(kappa*yPlus + 1)))
+        return y/kappa*np.log(kappa*yPlus + 1)
 
     def expterm_derivative(self, y, uTau, nu):
-        B1 = self.B1
-        B2 = self.B2
-        C = self.C
+        kappa, invB1, invB2, C = self.constants()
+        yPlus = y*uTau/nu
+
+        return C*y*(1 - np.exp(-yPlus*invB1) -
+                    yPlus*invB1*np.exp(-yPlus*invB2))
+
+    def terms_and_derivatives(self, y, uTau, nu):
+        """Return the sum of the log and exp terms and its first and
+         second derivatives, sharing the transcendental evaluations."""
+        kappa, invB1, invB2, C = self.constants()
         yPlus = y*uTau/nu
+        log = np.log(1 + kappa*yPlus)
+        exp1 = np.exp(-yPlus*invB1)
+        exp2 = np.exp(-yPlus*invB2)
 
-        return C*(y - y*np.exp(-yPlus/B1) - y*yPlus/B1*np.exp(-yPlus/B2))
+        terms = (nu/kappa*(-yPlus + log*(yPlus + 1/kappa)) +
+                 C*nu*(yPlus + exp1/invB1 +
+                       (1/invB2 + yPlus)*invB1/invB2*exp2))
+        derivative = y/kappa*log + C*y*(1 - exp1 - yPlus*invB1*exp2)
+        secondDerivative = y**2/nu*(1/(1 + kappa*yPlus) +
+                                    C*invB1*(exp1 - exp2 + yPlus*invB2*exp2))
+        return terms, derivative, secondDerivative
 
 
 class CaiSagaut(LawOfTheWall):
@@ -418,15 +660,17 @@ class CaiSagaut(LawOfTheWall):
 
     @property
     def E(self):
-        return self.E
+        return self.constants()[1]
 
     @kappa.setter
     def kappa(self, value):
         self._kappa = value
+        self._constants = None
 
     @B.setter
     def B(self, value):
         self._B = value
+        self._constants = None
 
 
     def lambert(self, x, n=4):
@@ -442,12 +686,12 @@ class CaiSagaut(LawOfTheWall):
         """Return the value of velocity."""
         pass
 
-    def value(self, u, y, nu, uTau):
-        """Return the value of the implicit function defined by the
-         law."""
-        from scipy.special import lambertw as W
-        kappa = self.kappa
-        E = np.exp(kappa*self.B)
+    def _compute_constants(self):
+        return self.kappa, np.exp(self.kappa*self.B)
+
+    def utau(self, u, y, nu):
+        """Return the friction velocity, all arguments can be arrays."""
+        kappa, E = self.constants()
         re = u*y/nu
 
         f = np.exp(-re/self.s)
@@ -455,10 +699,162 @@ class CaiSagaut(LawOfTheWall):
         uplus = f**self.p*np.sqrt(re)
         uplus += (1 - f)**self.p/kappa*np.real(self.lambert(np.maximum(kappa*E*re, np.e)))
 
-        return uTau - u/uplus
+        return u/uplus
+
+    def value(self, u, y, nu, uTau):
+        """Return the value of the implicit function defined by the
+         law."""
+
+        return uTau - self.utau(u, y, nu)
 
     def derivative(self, u, y, nu, uTau):
         """Return the value of the derivative of the implicit function
          defined by the law."""
 
         return 1
+
+
+class TabulatedInverse(LawOfTheWall):
+    """
+    Tabulated inverse of an implicit law of the wall.
+
+    For the laws that give u+ as a function of y+, u+ depends only on the
+    sampled Reynolds number Re = u*y/nu. The value of log(u+) is
+    tabulated on a grid uniform in log(Re), by solving the law with
+    Newton's method once, and the friction velocity is then obtained by
+    linear interpolation at O(1) cost per face.
+
+    The tables are shared between all instances with the same law
+    coefficients and grid parameters. The table is selected from the
+    current coefficients of the law on each use, so changing them
+    afterwards switches to, or builds, the matching table. At most
+    _maxTables tables are kept in memory, the oldest is dropped first.
+
+    The interpolation error is measured at construction by comparing
+    the table against exact solutions at the midpoints between the
+    nodes, and is stored in the error attribute as the maximum relative
+    error in u+, which is also the relative error in uTau. For the
+    default grid it is about 3e-6. Below reMin the viscous sublayer
+    relation u+ = sqrt(Re) is used, above reMax the last interval is
+    extrapolated linearly. With polish set to True, one Newton step on
+    the law itself is taken, which brings the error down to round-off
+    within the tabulated range.
+
+    Since the friction velocity is available explicitly, the wall models
+    use the table directly instead of their root finder.
+
+    Parameters
+    ----------
+    law : Spalding or Reichardt
+        The law to invert.
+    n : int
+        The amount of table nodes.
+    reMin : float
+        The smallest tabulated value of Re.
+    reMax : float
+        The largest tabulated value of Re.
+    polish : bool
+        Whether to refine the interpolated value with a Newton step.
+
+    """
+
+    _parameters = {"Spalding": ("kappa", "B"),
+                   "Reichardt": ("kappa", "B1", "B2", "C")}
+    # At most _maxTables are kept, the oldest is dropped first
+    _tables = {}
+    _maxTables = 32
+
+    def __init__(self, law, n=2000, reMin=1e-2, reMax=1e10, polish=False):
+        LawOfTheWall.__init__(self)
+
+        name = type(law).__name__
+        if name not in TabulatedInverse._parameters:
+            raise ValueError("Tabulation is not supported for " + name)
+
+        self.law = law
+        self.polish = polish
+        self.n = n
+        self.reMin = reMin
+        self.reMax = reMax
+        self.logReMin = np.log(reMin)
+        self.dx = (np.log(reMax) - self.logReMin)/(n - 1)
+        self._lookup()
+
+    @property
+    def table(self):
+        """The tabulated values of log(u+) for the current coefficients
+        of the law"""
+        return self._lookup()[0]
+
+    @property
+    def error(self):
+        """The estimate of the maximum relative interpolation error"""
+        return self._lookup()[1]
+
+    def _lookup(self):
+        """Return the table and its error for the current coefficients
+        of the law, building it if needed."""
+        name = type(self.law).__name__
+        key = ((name,) +
+               tuple(getattr(self.law, p)
+                     for p in TabulatedInverse._parameters[name])
+               + (self.n, self.reMin, self.reMax))
+        if key not in TabulatedInverse._tables:
+            if len(TabulatedInverse._tables) >= TabulatedInverse._maxTables:
+                del TabulatedInverse._tables[
+                    next(iter(TabulatedInverse._tables))]
+            TabulatedInverse._tables[key] = self._build(self.n)
+        return TabulatedInverse._tables[key]
+
+    def _solve_uplus(self, re):
+        """Solve the law for u+ at the given values of Re."""
+        newton = Newton(self.law.value, self.law.derivative, maxIter=200,
+                        eps=1e-12)
+        guess = np.where(re < 100, np.sqrt(re), 2.5*np.log(re))
+        uTau = newton.solve(re/guess, args=(re, 1., 1.))
+        return re/uTau
+
+    def _build(self, n):
+        """Compute the table and the estimate of its error."""
+        x = self.logReMin + self.dx*np.arange(2*n - 1)/2
+        logUPlus = np.log(self._solve_uplus(np.exp(x)))
+
+        table = logUPlus[::2]
+        midpoints = 0.5*(table[:-1] + table[1:])
+        error = np.max(np.abs(np.expm1(midpoints - logUPlus[1::2])))
+        return table, error
+
+    def uplus(self, re):
+        """Return the interpolated value of u+ for the given Re."""
+        re = np.asarray(re, dtype=float)
+        table = self.table
+        x = (np.log(np.maximum(re, np.exp(self.logReMin))) -
+             self.logReMin)/self.dx
+        i = np.minimum(x.astype(int), table.size - 2)
+        w = x - i
+        uPlus = np.exp((1 - w)*table[i] + w*table[i + 1])
+        return np.where(re < np.exp(self.logReMin), np.sqrt(re), uPlus)
+
+    def utau(self, u, y, nu):
+        """Return the friction velocity, all arguments can be arrays."""
+        uTau = u/self.uplus(u*y/nu)
+
+        if self.polish:
+            value, derivative = self.law.value_and_derivative(u, y, nu, uTau)
+            uTau = uTau - value/derivative
+        return uTau
+
+    def value(self, u, y, nu, uTau):
+        """Return the value of the implicit function defined by the
+         law."""
+        return self.law.value(u, y, nu, uTau)
+
+    def derivative(self, u, y, nu, uTau):
+        """Return the value of the derivative of the implicit function
+         defined by the law."""
+        return self.law.derivative(u, y, nu, uTau)
+
+    def value_and_derivative(self, u, y, nu, uTau):
+        """Return the value of the implicit function defined by the law
+         and of its derivative."""
+        return self.law.value_and_derivative(u, y, nu, uTau)
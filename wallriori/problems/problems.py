@@ -8,10 +8,93 @@ from __future__ import division
 from __future__ import print_function
 import numpy as np
 from scipy.interpolate import interp1d
-from scipy.sparse.linalg import spsolve
-from scipy.sparse import csr_matrix
+from scipy.linalg import solve_banded
+from scipy.sparse.linalg import splu
+from scipy.sparse import csr_matrix, diags
 
-__all__ = ["Problem", "SteadyDiffusion", "UnsteadyDiffusion"]
+__all__ = ["Problem", "SteadyDiffusion", "UnsteadyDiffusion",
+           "BatchSteadyDiffusion"]
+
+
+def _interpolate_to_faces(mesh, nu, nuLeft, nuRight):
+    """Linearly interpolate cell values to the faces of the mesh.
+
+    The values at the two boundary faces are given. Works along the last
+    axis of nu, so several fields on the same mesh can be interpolated
+    at once.
+
+    """
+    centres = mesh.centres
+    faces = mesh.faces
+    nu = np.asarray(nu)
+
+    weights = (faces[1:-1] - centres[:-1])/(centres[1:] - centres[:-1])
+    inner = (1 - weights)*nu[..., :-1] + weights*nu[..., 1:]
+    left = np.broadcast_to(nuLeft, nu.shape[:-1])[..., np.newaxis]
+    right = np.broadcast_to(nuRight, nu.shape[:-1])[..., np.newaxis]
+    return np.concatenate([left, inner, right], axis=-1)
+
+
+def _conductances(mesh, nuF):
+    """Diffusive conductances of the faces, A*nu/dx, where dx is the
+    distance between the centres on either side of the face."""
+    centres = mesh.centres
+    faces = mesh.faces
+    A = mesh.dim2*mesh.dim3
+
+    distances = np.concatenate([[centres[0] - faces[0]],
+                                np.diff(centres),
+                                [faces[-1] - centres[-1]]])
+    return A*nuF/distances
+
+
+def _diagonals(conductances):
+    """The lower, main and upper diagonals of the diffusion operator
+    given the conductances of the faces. The unused first entry of the
+    lower and last entry of the upper diagonal are zero."""
+    lower = -conductances[..., :-1].copy()
+    upper = -conductances[..., 1:].copy()
+    lower[..., 0] = 0
+    upper[..., -1] = 0
+    diag = conductances[..., :-1] + conductances[..., 1:]
+    return lower, diag, upper
+
+
+def _tridiagonal_dot(lower, diag, upper, x):
+    """Multiply a tridiagonal matrix, given by its diagonals, with x."""
+    product = diag*x
+    product[..., 1:] += lower[..., 1:]*x[..., :-1]
+    product[..., :-1] += upper[..., :-1]*x[..., 1:]
+    return product
+
+
+def _thomas(lower, diag, upper, rhs):
+    """Solve tridiagonal systems with the Thomas algorithm.
+
+    The systems are stored along the last axis, and all leading axes
+    are solved at once, so the Python loop only runs over the cells. No
+    pivoting is done, which is fine for the diagonally dominant
+    diffusion operators.
+
+    """
+    lower, diag, upper, rhs = [np.ascontiguousarray(np.moveaxis(i, -1, 0))
+                               for i in np.broadcast_arrays(lower, diag,
+                                                            upper, rhs)]
+    n = diag.shape[0]
+    c = np.empty_like(diag)
+    x = np.empty_like(diag)
+
+    c[0] = upper[0]/diag[0]
+    x[0] = rhs[0]/diag[0]
+    for i in range(1, n):
+        denominator = diag[i] - lower[i]*c[i-1]
+        c[i] = upper[i]/denominator
+        x[i] = (rhs[i] - lower[i]*x[i-1])/denominator
+
+    for i in range(n - 2, -1, -1):
+        x[i] -= c[i]*x[i+1]
+
+    return np.moveaxis(x, 0, -1)
 
 
 class Problem:
@@ -145,14 +228,234 @@ class SteadyDiffusion(Problem):
 
         return system, rhs
 
-    def solve(self):
-        system, rhs = self.assemble()
-        self.solution = np.linalg.solve(system, rhs)
+    def assemble_tridiagonal(self):
+        """
+        Assemble the linear system in tridiagonal form.
+
+        Returns
+        -------
+        tuple of ndarray
+            The lower, main and upper diagonals of the system matrix
+            and the right-hand side. The first entry of the lower and
+            the last entry of the upper diagonal are zero.
+
+        """
+        mesh = self.mesh
+        nuF = _interpolate_to_faces(mesh, self.nu, self.bcLeft[1],
+                                    self.bcRight[1])
+        conductances = _conductances(mesh, nuF)
+        lower, diag, upper = _diagonals(conductances)
+
+        rhs = self.source*mesh.volumes
+        rhs[0] = conductances[0]*self.bcLeft[0]
+        rhs[-1] = conductances[-1]*self.bcRight[0]
+
+        return lower, diag, upper, rhs
+
+    def solve(self, dense=False):
+        """
+        Solve the problem and store the result in solution.
+
+        Parameters
+        ----------
+        dense : bool, optional
+            Whether to assemble a dense matrix and solve it with a
+            general solver, which is slow and only useful for
+            verification. By default, the tridiagonal system is solved
+            with a banded solver.
+
+        """
+        if dense:
+            system, rhs = self.assemble()
+            self.solution = np.linalg.solve(system, rhs)
+            return
+
+        lower, diag, upper, rhs = self.assemble_tridiagonal()
+        banded = np.zeros((3, diag.size))
+        banded[0, 1:] = upper[:-1]
+        banded[1] = diag
+        banded[2, :-1] = lower[1:]
+        self.solution = solve_banded((1, 1), banded, rhs, overwrite_ab=True,
+                                     overwrite_b=True, check_finite=False)
+
+
+class BatchSteadyDiffusion(Problem):
+    """
+    Many independent steady 1D diffusion problems on the same mesh.
+
+    The unknowns, viscosities and sources are 2D arrays with one row per
+    problem, for instance per wall face, and all the tridiagonal systems
+    are assembled and solved at once.
+
+    Parameters
+    ----------
+    mesh : Mesh
+        The mesh, shared by all problems.
+    ic : ndarray
+        The initial solution, shape (nProblems, nCells).
+    nu : ndarray
+        The viscosity, shape (nProblems, nCells).
+    bcLeft, bcRight : sequence
+        The boundary values of the unknown and nu, each a float or an
+        array with one value per problem.
+    source : float or ndarray
+        The source term, broadcastable to the shape of nu.
+
+    """
 
-class  UnsteadyDiffusion(Problem):
+    def __init__(self, mesh, ic, nu, bcLeft, bcRight, source):
+        self.mesh = mesh
+        self.nu = nu
+        Problem.__init__(self, mesh, ic)
+        self.bcLeft = bcLeft
+        self.bcRight = bcRight
+        self.source = source
 
-    def __init__(self, mesh, ic, nu, dt, T, bcLeft, bcRight, source):
+    @property
+    def ic(self):
+        """Initial conditions"""
+        return self.__ic
+
+    @property
+    def solution(self):
+        """The solution"""
+        return self.__solution
+
+    @property
+    def nu(self):
+        return self.__nu
+
+    @property
+    def nProblems(self):
+        """The number of problems."""
+        return self.nu.shape[0]
+
+    @property
+    def bcLeft(self):
+        """The boundary conidtions on the left side, for unknown and nu."""
+        return self.__bcLeft
+
+    @property
+    def bcRight(self):
+        """The boundary conidtions on the right side, for unknown and nu."""
+        return self.__bcRight
+
+    @property
+    def source(self):
+        """The source term."""
+        return self.__source
+
+    @ic.setter
+    def ic(self, vals):
+        self.__ic = self._check_shape(vals)
+
+    @solution.setter
+    def solution(self, vals):
+        self.__solution = self._check_shape(vals)
+
+    @nu.setter
+    def nu(self, vals):
+        vals = np.asarray(vals)
+        if vals.ndim == 2 and vals.shape[1] == self.mesh.nCells:
+            self.__nu = vals
+        else:
+            raise ValueError("nu must have the shape (nProblems, nCells)")
+
+    @bcLeft.setter
+    def bcLeft(self, vals):
+        self.__bcLeft = vals
+
+    @bcRight.setter
+    def bcRight(self, vals):
+        self.__bcRight = vals
+
+    @source.setter
+    def source(self, val):
+        self.__source = np.broadcast_to(val, self.nu.shape)
+
+    def _check_shape(self, vals):
+        if np.shape(vals) == self.nu.shape:
+            return vals
+        else:
+            raise ValueError("The data must have the shape (nProblems, nCells)")
+
+    def assemble_tridiagonal(self, rows=None):
+        """
+        Assemble the linear systems in tridiagonal form.
+
+        Parameters
+        ----------
+        rows : ndarray, optional
+            The indices of the problems to assemble, by default all.
+
+        Returns
+        -------
+        tuple of ndarray
+            The lower, main and upper diagonals of the system matrices
+            and the right-hand sides, each of shape (nRows, nCells).
+
+        """
+        def select(value):
+            if rows is None or np.ndim(value) == 0:
+                return value
+            return value[rows]
+
+        mesh = self.mesh
+        nuF = _interpolate_to_faces(mesh, select(self.nu),
+                                    select(self.bcLeft[1]),
+                                    select(self.bcRight[1]))
+        conductances = _conductances(mesh, nuF)
+        lower, diag, upper = _diagonals(conductances)
+
+        rhs = select(self.source)*mesh.volumes
+        rhs[:, 0] = conductances[:, 0]*select(self.bcLeft[0])
+        rhs[:, -1] = conductances[:, -1]*select(self.bcRight[0])
+
+        return lower, diag, upper, rhs
+
+    def solve(self, rows=None):
+        """
+        Solve the problems and store the results in solution.
+
+        Parameters
+        ----------
+        rows : ndarray, optional
+            The indices of the problems to solve, by default all. The
+            rows of solution are then updated in place, the other rows
+            are left unchanged.
+
+        """
+        if rows is None:
+            self.solution = _thomas(*self.assemble_tridiagonal())
+        else:
+            self.solution[rows] = _thomas(*self.assemble_tridiagonal(rows))
+
+
+class UnsteadyDiffusion(Problem):
+    """
+    Unsteady 1D diffusion marched in time with the theta scheme.
+
+    The operator and its factorization are built on the first step and
+    reused until nu, dt, theta, the mesh or the boundary conditions are
+    assigned new values, so each step only costs the assembly of the
+    right-hand side and one back-substitution. Note that modifying nu or
+    the boundary conditions in place does not refresh the cache, assign
+    new values instead.
+
+    Parameters
+    ----------
+    theta : float, optional
+        The implicitness of the time scheme, 1 gives implicit Euler,
+        the default, and 0.5 gives Crank-Nicolson. The latter is second
+        order accurate in time, but damps stiff modes poorly, so it is
+        not suited for marching to a steady state with large steps.
+
+    """
+
+    def __init__(self, mesh, ic, nu, dt, T, bcLeft, bcRight, source,
+                 theta=1):
         Problem.__init__(self, mesh, ic)
+        self._operator = None
         self.nu = nu
         self.dt = dt
         self.T = T
@@ -160,6 +463,7 @@ class  UnsteadyDiffusion(Problem):
         self.bcLeft = bcLeft
         self.bcRight = bcRight
         self.source = source
+        self.theta = theta
 
     @property
     def nu(self):
@@ -195,16 +499,23 @@ class  UnsteadyDiffusion(Problem):
         """The source term."""
         return self.__source
 
+    @property
+    def theta(self):
+        """The implicitness of the time scheme."""
+        return self.__theta
+
     @nu.setter
     def nu(self, vals):
         if vals.size == self.mesh.centres.size:
             self.__nu = vals
+            self._operator = None
         else:
             raise ValueError("The size of the data and the mesh mush match")
 
     @dt.setter
     def dt(self, val):
         self.__dt = val
+        self._operator = None
 
     @T.setter
     def T(self, val):
@@ -217,60 +528,82 @@ class  UnsteadyDiffusion(Problem):
     @bcLeft.setter
     def bcLeft(self, vals):
         self.__bcLeft = vals
+        self._operator = None
 
     @bcRight.setter
     def bcRight(self, vals):
         self.__bcRight = vals
+        self._operator = None
 
     @source.setter
     def source(self, val):
         self.__source = val
 
-    def assemble(self):
-        nCells = self.mesh.nCells
-        centres = self.mesh.centres
-        volumes = self.mesh.volumes
-        faces = self.mesh.faces
-        nu = self.nu
-        A = self.mesh.dim2*self.mesh.dim3
+    @theta.setter
+    def theta(self, val):
+        if not 0 <= val <= 1:
+            raise ValueError("Theta must be between 0 and 1")
+        self.__theta = val
+        self._operator = None
+
+    def operator(self):
+        """
+        Return the cached spatial operator, building it if necessary.
+
+        Returns
+        -------
+        dict
+            The mass term, the face conductances, the three diagonals
+            of the diffusion operator and the factorization of the
+            system matrix.
+
+        """
+        if self._operator is None or self._operator["mesh"] is not self.mesh:
+            self._operator = self._build_operator()
+        return self._operator
+
+    def _build_operator(self):
+        mesh = self.mesh
+        A = mesh.dim2*mesh.dim3
+
+        nuF = _interpolate_to_faces(mesh, self.nu, self.bcLeft[1],
+                                    self.bcRight[1])
+        conductances = _conductances(mesh, nuF)
+        lower, diag, upper = _diagonals(conductances)
+        mass = mesh.volumes/A/self.dt
+
+        system = diags([self.theta*lower[1:], mass + self.theta*diag,
+                        self.theta*upper[:-1]], [-1, 0, 1], format="csc")
+
+        return {"mesh": mesh, "mass": mass, "conductances": conductances,
+                "lower": lower, "diag": diag, "upper": upper,
+                "system": system, "factor": splu(system)}
+
+    def _rhs(self, operator):
         sol = self.solution
-        dt = self.dt
-        bcLeft = self.bcLeft
-        bcRight = self.bcRight
+        conductances = operator["conductances"]
 
-        nuF = interp1d(centres, nu, kind='linear')(faces[1:-1])
-        nuF = np.insert(nuF, 0, self.bcLeft[1])
-        nuF = np.append(nuF, self.bcRight[1])
+        rhs = operator["mass"]*sol + self.source*self.mesh.volumes
+        rhs[0] = operator["mass"][0]*sol[0] + conductances[0]*self.bcLeft[0]
+        rhs[-1] = (operator["mass"][-1]*sol[-1] +
+                   conductances[-1]*self.bcRight[0])
 
+        if self.theta < 1:
+            rhs -= (1 - self.theta)*_tridiagonal_dot(operator["lower"],
+                                                     operator["diag"],
+                                                     operator["upper"], sol)
+        return rhs
 
-        system = np.zeros([nCells, nCells])
-
-        rhs = np.zeros(nCells)
-
-        for i in range(nCells):
-            dx = volumes[i]/A
-            if i == 0:
-                rhs[i] = dx/dt*sol[i] + A*nuF[i]/(centres[i] - faces[0])*bcLeft[0]
-                system[i, i+1] = -A*nuF[i+1]/(centres[i+1] - centres[i])
-                system[i, i] = -system[i, i+1]  +  A*nuF[i]/(centres[i] - faces[0]) + dx/dt
-            elif i == nCells - 1:
-                rhs[i] = dx/dt*sol[i] + A*nuF[i+1]/(faces[-1] - centres[i])*bcRight[0]
-                system[i, i-1] = -A*nuF[i]/(centres[i] - centres[i-1])
-                system[i, i] = -system[i, i-1]  +  A*nuF[i+1]/(faces[-1] - centres[i]) + dx/dt
-            else:
-                system[i, i-1] = -A*nuF[i]/(centres[i] - centres[i-1])
-                system[i, i+1] = -A*nuF[i+1]/(centres[i+1] - centres[i])
-                system[i, i] = -(system[i, i-1] + system[i, i+1]) + dx/dt
-                rhs[i] = dx/dt*sol[i] + self.source*volumes[i]
-
-        return csr_matrix(system), rhs
+    def assemble(self):
+        operator = self.operator()
+        return csr_matrix(operator["system"]), self._rhs(operator)
 
     def advance(self):
-        system, rhs = self.assemble()
-        self.solution = spsolve(system, rhs)
+        operator = self.operator()
+        self.solution = operator["factor"].solve(self._rhs(operator))
         self.time += self.dt
 
     def solve(self):
 
         while self.time < self.T:
-            self.advance()
\ No newline at end of file
+            self.advance()
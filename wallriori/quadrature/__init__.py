@@ -0,0 +1,9 @@
+# This file is part of wallriori
+# (c) Timofey Mukha
+# The code is released under the MIT Licence.
+# See LICENCE.txt and the Legal section in the README for more information
+
+from .quadrature import *
+
+__all__ = ["quadrature"]
+__all__.extend(quadrature.__all__)
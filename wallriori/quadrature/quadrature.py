@@ -0,0 +1,173 @@
+# This file is part of wallriori
+# (c) Timofey Mukha
+# The code is released under the MIT Licence.
+# See LICENCE.txt and the Legal section in the README for more information
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+import numpy as np
+
+__all__ = ["Quadrature"]
+
+
+class Quadrature:
+    """
+    Integration rule with precomputed nodes and weights.
+
+    An integral is computed as a dot product of the function values at
+    the nodes with the weights. The values can have leading dimensions,
+    for instance one row per face, and are then integrated at once.
+
+    The rules on a given set of points, like Simpson's, are built from
+    the points once, and the Gauss-Legendre and Clenshaw-Curtis rules
+    are cached on the reference interval, by the number of points.
+
+    Parameters
+    ----------
+    nodes : ndarray
+        The integration points.
+    weights : ndarray
+        The weights of the points.
+
+    """
+
+    _reference = {}
+
+    def __init__(self, nodes, weights):
+        self.nodes = nodes
+        self.weights = weights
+
+    @classmethod
+    def simpson(cls, x):
+        """
+        Composite Simpson's rule on the points x, which can be
+        non-uniform.
+
+        For an even number of points, the last interval is integrated
+        with Cartwright's correction, so the weights give the same
+        result as scipy.integrate.simpson since SciPy 1.11.
+
+        """
+        x = np.asarray(x, dtype=float)
+        if x.size < 3:
+            return cls.trapezoid(x)
+
+        weights = np.zeros(x.size)
+        nPairs = (x.size - 1)//2
+        h = np.diff(x)
+        h0 = h[0:2*nPairs:2]
+        h1 = h[1:2*nPairs:2]
+        scale = (h0 + h1)/6
+        np.add.at(weights, np.arange(0, 2*nPairs, 2), scale*(2 - h1/h0))
+        np.add.at(weights, np.arange(1, 2*nPairs, 2),
+                  scale*(h0 + h1)**2/(h0*h1))
+        np.add.at(weights, np.arange(2, 2*nPairs + 1, 2), scale*(2 - h0/h1))
+
+        if x.size % 2 == 0:
+            h0, h1 = h[-2], h[-1]
+            weights[-1] += (2*h1**2 + 3*h0*h1)/(6*(h0 + h1))
+            weights[-2] += (h1**2 + 3*h0*h1)/(6*h0)
+            weights[-3] -= h1**3/(6*h0*(h0 + h1))
+        return cls(x, weights)
+
+    @classmethod
+    def trapezoid(cls, x):
+        """The trapezoidal rule on the points x."""
+        x = np.asarray(x, dtype=float)
+        dx = np.diff(x)
+        weights = np.zeros(x.size)
+        weights[:-1] += 0.5*dx
+        weights[1:] += 0.5*dx
+        return cls(x, weights)
+
+    @classmethod
+    def gauss_legendre(cls, a, b, n):
+        """Gauss-Legendre rule with n points on [a, b], exact for
+        polynomials of degree 2n - 1. The end points are not nodes."""
+        nodes, weights = cls._reference_rule("gauss_legendre", n)
+        return cls._mapped(nodes, weights, a, b)
+
+    @classmethod
+    def clenshaw_curtis(cls, a, b, n):
+        """Clenshaw-Curtis rule with n points on [a, b], including the
+        end points. The points cluster towards the ends of the
+        interval."""
+        nodes, weights = cls._reference_rule("clenshaw_curtis", n)
+        return cls._mapped(nodes, weights, a, b)
+
+    @classmethod
+    def _mapped(cls, nodes, weights, a, b):
+        """Map a rule from [-1, 1] to [a, b]."""
+        return cls(0.5*(b - a)*(nodes + 1) + a, 0.5*(b - a)*weights)
+
+    @classmethod
+    def _reference_rule(cls, rule, n):
+        key = (rule, n)
+        if key not in cls._reference:
+            if rule == "gauss_legendre":
+                cls._reference[key] = np.polynomial.legendre.leggauss(n)
+            else:
+                cls._reference[key] = _clenshaw_curtis(n)
+        return cls._reference[key]
+
+    @property
+    def nodes(self):
+        """The integration points"""
+        return self.__nodes
+
+    @property
+    def weights(self):
+        """The weights"""
+        return self.__weights
+
+    @nodes.setter
+    def nodes(self, value):
+        self.__nodes = value
+
+    @weights.setter
+    def weights(self, value):
+        self.__weights = value
+
+    def integrate(self, values):
+        """
+        Integrate the function values at the nodes.
+
+        Parameters
+        ----------
+        values : ndarray
+            The values, the last dimension corresponds to the nodes.
+
+        Returns
+        -------
+        float or ndarray
+            The integrals, with the shape of the leading dimensions.
+
+        """
+        return np.dot(values, self.weights)
+
+
+def _clenshaw_curtis(n):
+    """Nodes and weights of the Clenshaw-Curtis rule on [-1, 1], in
+    ascending order."""
+    if n < 2:
+        raise ValueError("Clenshaw-Curtis needs at least two points")
+
+    N = n - 1
+    theta = np.pi*np.arange(n)/N
+    weights = np.zeros(n)
+    inner = np.ones(N - 1)
+    thetaInner = theta[1:-1]
+
+    if N % 2 == 0:
+        weights[0] = weights[-1] = 1/(N**2 - 1)
+        for k in range(1, N//2):
+            inner -= 2*np.cos(2*k*thetaInner)/(4*k**2 - 1)
+        inner -= np.cos(N*thetaInner)/(N**2 - 1)
+    else:
+        weights[0] = weights[-1] = 1/N**2
+        for k in range(1, (N - 1)//2 + 1):
+            inner -= 2*np.cos(2*k*thetaInner)/(4*k**2 - 1)
+
+    weights[1:-1] = 2*inner/N
+    return -np.cos(theta), weights
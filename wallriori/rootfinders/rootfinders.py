@@ -8,19 +8,109 @@ from __future__ import division
 from __future__ import print_function
 import numpy as np
 
-__all__ = ["RootFinder", "Newton"]
+__all__ = ["Diagnostics", "RootFinder", "Newton", "NewtonBisection",
+           "Halley", "FixedPoint"]
 
 def f(x):
     return x
 
+
+def _subset(args, index):
+    """Select the given elements from the array-valued arguments."""
+    return [a[index] if np.ndim(a) > 0 else a for a in args]
+
+class Diagnostics:
+    """
+    Convergence record of the last solve of an iterative method.
+
+    The per-element arrays are overwritten by each solve. If histogram
+    is set to True, the amount of elements that needed a given number
+    of iterations is also accumulated over all the solves, so that
+    histogram[n] is the count of elements solved in n iterations.
+
+    """
+
+    def __init__(self, histogram=False):
+        self.iterations = None
+        self.residual = None
+        self.converged = None
+        self.histogram = np.zeros(0, dtype=int) if histogram else None
+
+    @property
+    def iterations(self):
+        """The number of iterations performed for each element"""
+        return self.__iterations
+
+    @property
+    def residual(self):
+        """The final relative change of each element"""
+        return self.__residual
+
+    @property
+    def converged(self):
+        """
+        The mask of converged elements, None for loops with a fixed
+        amount of iterations
+        """
+        return self.__converged
+
+    @property
+    def notConverged(self):
+        """The mask of elements that did not converge"""
+        if self.converged is None:
+            return None
+        return np.logical_not(self.converged)
+
+    @property
+    def histogram(self):
+        """Accumulated counts of the iteration numbers, or None"""
+        return self.__histogram
+
+    @iterations.setter
+    def iterations(self, value):
+        self.__iterations = value
+
+    @residual.setter
+    def residual(self, value):
+        self.__residual = value
+
+    @converged.setter
+    def converged(self, value):
+        self.__converged = value
+
+    @histogram.setter
+    def histogram(self, value):
+        self.__histogram = value
+
+    def record(self, iterations, residual, converged):
+        """Store the result of a solve."""
+        self.iterations = iterations
+        self.residual = residual
+        self.converged = converged
+
+        if self.histogram is not None:
+            counts = np.bincount(np.ravel(iterations))
+            if counts.size > self.histogram.size:
+                self.histogram = np.append(
+                    self.histogram,
+                    np.zeros(counts.size - self.histogram.size, dtype=int))
+            self.histogram[:counts.size] += counts
+
+
 class RootFinder:
 
-    def __init__(self, function=f, derivative=f, maxIter=50, eps=0.001, debug=False):
+    def __init__(self, function=f, derivative=f, maxIter=50, eps=0.001, debug=False,
+                 valueAndDerivative=None, secondDerivative=None,
+                 valueAndDerivatives=None):
         self.f = function
         self.d = derivative
+        self.d2 = secondDerivative
+        self.fd = valueAndDerivative
+        self.fdd = valueAndDerivatives
         self.maxIter = maxIter
         self.eps = eps
         self.debug = debug
+        self.diagnostics = Diagnostics() if debug else None
 
 
     @property
@@ -36,6 +126,32 @@ class RootFinder:
         """
         return self.__d
 
+    @property
+    def d2(self):
+        """
+        Optional second derivative of the function, used by the
+        higher-order methods
+        """
+        return self.__d2
+
+    @property
+    def fd(self):
+        """
+        Optional function returning both the value of the function and
+        of its derivative, used instead of f and d when set. Assigning
+        f or d resets it.
+        """
+        return self.__fd
+
+    @property
+    def fdd(self):
+        """
+        Optional function returning the value of the function and of
+        its first and second derivatives, used instead of f, d and d2
+        when set. Assigning f, d or d2 resets it.
+        """
+        return self.__fdd
+
     @property
     def maxIter(self):
         """Maximum amount of iterations"""
@@ -48,16 +164,41 @@ class RootFinder:
 
     @property
     def debug(self):
-        """Whether to provide additional output"""
+        """Whether to record diagnostics by default"""
         return self.__debug
 
+    @property
+    def diagnostics(self):
+        """
+        Optional Diagnostics object, updated by each solve. Not recorded
+        when set to None.
+        """
+        return self.__diagnostics
+
     @f.setter
     def f(self, function):
         self.__f = function
+        self.__fd = None
+        self.__fdd = None
 
     @d.setter
     def d(self, function):
         self.__d = function
+        self.__fd = None
+        self.__fdd = None
+
+    @d2.setter
+    def d2(self, function):
+        self.__d2 = function
+        self.__fdd = None
+
+    @fd.setter
+    def fd(self, function):
+        self.__fd = function
+
+    @fdd.setter
+    def fdd(self, function):
+        self.__fdd = function
 
     @maxIter.setter
     def maxIter(self, n):
@@ -71,35 +212,485 @@ class RootFinder:
     def debug(self, debug):
         self.__debug = debug
 
+    @diagnostics.setter
+    def diagnostics(self, value):
+        self.__diagnostics = value
+
+    def _record(self, iterations, residual, converged):
+        if self.diagnostics is not None:
+            self.diagnostics.record(iterations, residual, converged)
+
+    def value_and_derivative(self, *args):
+        """Evaluate the function and its derivative."""
+        if self.fd is not None:
+            return self.fd(*args)
+        return self.f(*args), self.d(*args)
+
+    def value_and_derivatives(self, *args):
+        """Evaluate the function and its first and second derivatives."""
+        if self.fdd is not None:
+            return self.fdd(*args)
+        return self.value_and_derivative(*args) + (self.d2(*args),)
+
 
 class Newton(RootFinder):
 
-    def __init__(self,function=f, derivative=f, maxIter=100, eps=0.001, debug=False):
+    def __init__(self,function=f, derivative=f, maxIter=100, eps=0.001, debug=False,
+                 valueAndDerivative=None):
         RootFinder.__init__(self, function, derivative, maxIter, eps,
-                            debug=debug)
+                            debug=debug, valueAndDerivative=valueAndDerivative)
 
-    def solve(self, guess):
+    def _step(self, args, x):
+        """Return the next iterate."""
+        f, d = self.value_and_derivative(*args, x)
+        return x - f/d
 
-        for i in range(self.maxIter):
-            f = self.f(guess)
-            d = self.d(guess)
+    def solve(self, guess, args=()):
+        """
+        Solve the equation.
+
+        The function and the derivative are called as f(*args, x), or
+        fd(*args, x) is used if it is set. If args are given and the
+        guess or any of them is an array, each element is treated as a
+        separate equation, see solve_active. An array guess without args
+        is iterated as a whole until all elements converge, so that
+        functions bound to per-element arrays, for instance with
+        functools.partial, keep working.
 
-            newGuess = guess - f/d
+        Parameters
+        ----------
+        guess : float or ndarray
+            Initial guess for the root.
+        args : sequence, optional
+            Additional arguments passed to the function and derivative.
+
+        Returns
+        -------
+        float or ndarray
+            The root.
+
+        """
+        if len(args) > 0 and np.broadcast(guess, *args).shape != ():
+            return self.solve_active(guess, args)[0]
+
+        for i in range(self.maxIter):
+            newGuess = self._step(args, guess)
 
             error = np.abs(newGuess - guess)/np.abs(guess)
 
-            if np.ndim(guess) == 0:
-                if error <= self.eps:
-                    return newGuess
-            elif np.all(error <= self.eps):
+            if np.all(error <= self.eps):
+                self._record_whole(i + 1, error)
                 return newGuess
 
             guess = newGuess
 
-        if (self.debug):
-            print("Newton: not converged", "error", error)
+        self._record_whole(self.maxIter, error)
         return guess
 
+    def _record_whole(self, iterations, error):
+        """Record a solve in which all elements are iterated together."""
+        if np.ndim(error) > 0:
+            iterations = np.full(np.shape(error), iterations)
+        self._record(iterations, error, error <= self.eps)
+
+    def solve_active(self, guess, args=()):
+        """
+        Solve a set of independent equations, one per array element.
+
+        Elements are removed from the working set as soon as they
+        converge, so that the function and the derivative are only
+        evaluated on the active subset of the arguments.
+
+        Parameters
+        ----------
+        guess : float or ndarray
+            Initial guess for the roots.
+        args : sequence, optional
+            Additional arguments passed to the function and derivative,
+            either scalars or arrays broadcastable against the guess.
+
+        Returns
+        -------
+        (ndarray, ndarray, ndarray)
+            The roots, the mask of converged elements and the number
+            of iterations performed for each element.
+
+        """
+        shape = np.broadcast(guess, *args).shape
+        x = np.array(np.broadcast_to(guess, shape), dtype=float).ravel()
+        args = [np.ravel(np.broadcast_to(a, shape)) if np.ndim(a) > 0 else a
+                for a in args]
+
+        converged = np.zeros(x.size, dtype=bool)
+        iterations = np.zeros(x.size, dtype=int)
+        residual = None if self.diagnostics is None else np.zeros(x.size)
+        active = np.arange(x.size)
+
+        for i in range(self.maxIter):
+            activeX = x[active]
+            activeArgs = _subset(args, active)
+
+            newX = self._step(activeArgs, activeX)
+            error = np.abs(newX - activeX)/np.abs(activeX)
+
+            x[active] = newX
+            iterations[active] += 1
+            if residual is not None:
+                residual[active] = error
+
+            done = error <= self.eps
+            converged[active[done]] = True
+            active = active[~done]
+
+            if active.size == 0:
+                break
+
+        converged = converged.reshape(shape)
+        iterations = iterations.reshape(shape)
+        if residual is not None:
+            self._record(iterations, residual.reshape(shape), converged)
+
+        return x.reshape(shape), converged, iterations
+
+
+class NewtonBisection(RootFinder):
+    """
+    Newton's method safeguarded by bisection.
+
+    For each element, a bracket with a sign change of the function is
+    kept. By default the bracket is [guess/expansion, guess*expansion],
+    which is widened by the same factor until it contains a sign change,
+    so that it stays positive for positive guesses. Newton steps that
+    would leave the bracket or that do not reduce the step size fast
+    enough are replaced by bisection, so every element converges in a
+    bounded number of iterations, at most about log2 of the bracket
+    width over the tolerance.
+
+    """
+
+    def __init__(self, function=f, derivative=f, maxIter=100, eps=0.001,
+                 debug=False, valueAndDerivative=None, lower=None,
+                 upper=None, expansion=10):
+        RootFinder.__init__(self, function, derivative, maxIter, eps,
+                            debug=debug, valueAndDerivative=valueAndDerivative)
+        self.lower = lower
+        self.upper = upper
+        self.expansion = expansion
+
+    @property
+    def lower(self):
+        """Lower end of the initial bracket, None to use the guess"""
+        return self.__lower
+
+    @property
+    def upper(self):
+        """Upper end of the initial bracket, None to use the guess"""
+        return self.__upper
+
+    @property
+    def expansion(self):
+        """Factor by which the bracket is widened"""
+        return self.__expansion
+
+    @lower.setter
+    def lower(self, value):
+        self.__lower = value
+
+    @upper.setter
+    def upper(self, value):
+        self.__upper = value
+
+    @expansion.setter
+    def expansion(self, value):
+        self.__expansion = value
+
+    def _value(self, *args):
+        return self.value_and_derivative(*args)[0]
+
+    def _bracket(self, lower, upper, args):
+        """
+        Widen the brackets until they contain a sign change.
+
+        Returns the indices of the bracketed elements and the value of
+        the function at the lower ends.
+        """
+        fLower = self._value(*args, lower)
+        fUpper = self._value(*args, upper)
+
+        for i in range(self.maxIter):
+            unbracketed = np.flatnonzero(np.sign(fLower) == np.sign(fUpper))
+            if unbracketed.size == 0:
+                break
+
+            lower[unbracketed] /= self.expansion
+            upper[unbracketed] *= self.expansion
+            unbracketedArgs = _subset(args, unbracketed)
+            fLower[unbracketed] = self._value(*unbracketedArgs,
+                                              lower[unbracketed])
+            fUpper[unbracketed] = self._value(*unbracketedArgs,
+                                              upper[unbracketed])
+
+        bracketed = np.sign(fLower) != np.sign(fUpper)
+        return np.flatnonzero(bracketed), fLower
+
+    def solve(self, guess, args=()):
+        """
+        Solve the equation, see solve_active.
+
+        Returns
+        -------
+        float or ndarray
+            The root.
+
+        """
+        root = self.solve_active(guess, args)[0]
+        return root[()] if root.ndim == 0 else root
+
+    def solve_active(self, guess, args=()):
+        """
+        Solve a set of independent equations, one per array element.
+
+        Elements are removed from the working set as soon as they
+        converge. Elements for which no sign change is found are
+        returned unchanged and marked as not converged.
+
+        Parameters
+        ----------
+        guess : float or ndarray
+            Initial guess for the roots.
+        args : sequence, optional
+            Additional arguments passed to the function and derivative,
+            either scalars or arrays broadcastable against the guess.
+
+        Returns
+        -------
+        (ndarray, ndarray, ndarray)
+            The roots, the mask of converged elements and the number
+            of iterations performed for each element.
+
+        """
+        shape = np.broadcast(guess, *args).shape
+        x = np.array(np.broadcast_to(guess, shape), dtype=float).ravel()
+        args = [np.ravel(np.broadcast_to(a, shape)) if np.ndim(a) > 0 else a
+                for a in args]
+
+        lower = x/self.expansion
+        upper = x*self.expansion
+        if self.lower is not None:
+            lower[:] = np.ravel(np.broadcast_to(self.lower, shape))
+        if self.upper is not None:
+            upper[:] = np.ravel(np.broadcast_to(self.upper, shape))
+
+        converged = np.zeros(x.size, dtype=bool)
+        iterations = np.zeros(x.size, dtype=int)
+        residual = None
+        if self.diagnostics is not None:
+            residual = np.full(x.size, np.inf)
+        active, fLower = self._bracket(lower, upper, args)
+
+        outside = (x <= lower) | (x >= upper)
+        x[outside] = 0.5*(lower[outside] + upper[outside])
+        step = upper - lower
+        stepOld = step.copy()
+
+        for i in range(self.maxIter):
+            if active.size == 0:
+                break
+
+            activeX = x[active]
+            activeArgs = _subset(args, active)
+            f, d = self.value_and_derivative(*activeArgs, activeX)
+
+            same = np.sign(f) == np.sign(fLower[active])
+            lo = np.where(same, activeX, lower[active])
+            hi = np.where(same, upper[active], activeX)
+
+            newtonStep = f/d
+            newton = activeX - newtonStep
+            bisect = (~((newton > lo) & (newton < hi)) |
+                      (np.abs(2*newtonStep) > np.abs(stepOld[active])))
+
+            stepOld[active] = step[active]
+            step[active] = np.where(bisect, 0.5*(hi - lo), newtonStep)
+            newX = np.where(bisect, 0.5*(lo + hi), newton)
+            newX = np.where(f == 0, activeX, newX)
+
+            error = np.abs(newX - activeX)/np.abs(activeX)
+
+            x[active] = newX
+            lower[active] = lo
+            upper[active] = hi
+            iterations[active] += 1
+            if residual is not None:
+                residual[active] = error
+
+            done = (error <= self.eps) | (f == 0)
+            converged[active[done]] = True
+            active = active[~done]
+
+        converged = converged.reshape(shape)
+        iterations = iterations.reshape(shape)
+        if residual is not None:
+            self._record(iterations, residual.reshape(shape), converged)
+
+        return x.reshape(shape), converged, iterations
+
+
+class Halley(Newton):
+    """
+    Halley's method, a third-order method using the second derivative.
+
+    The iterate is updated as x - 2*f*d/(2*d**2 - f*d2). If no second
+    derivative is set, Newton steps are taken instead. The solve and
+    solve_active methods are the same as for Newton. Like Newton's
+    method, it needs a reasonable guess, and for the exponential laws a
+    step to small values of uTau can take many iterations to recover.
+
+    """
+
+    def __init__(self, function=f, derivative=f, secondDerivative=None,
+                 maxIter=100, eps=0.001, debug=False, valueAndDerivatives=None):
+        RootFinder.__init__(self, function, derivative, maxIter, eps,
+                            debug=debug, secondDerivative=secondDerivative,
+                            valueAndDerivatives=valueAndDerivatives)
+
+    def _step(self, args, x):
+        """Return the next iterate."""
+        if self.d2 is None and self.fdd is None:
+            return Newton._step(self, args, x)
+
+        f, d, d2 = self.value_and_derivatives(*args, x)
+        denominator = 2*d**2 - f*d2
+        return np.where(denominator != 0, x - 2*f*d/denominator, x - f/d)[()]
+
+
+class FixedPoint(RootFinder):
+    """
+    Fixed-point iteration x = f(*args, x) with Aitken acceleration.
+
+    The iterate is updated as x + omega*r, where r = f(*args, x) - x is
+    the residual. With aitken set to True, the relaxation factor omega
+    of each element is updated every iteration with Aitken's delta-
+    squared rule, omega = -omegaOld*rOld/(r - rOld), starting from the
+    given relaxation. For a linear map this gives the fixed point after
+    two iterations, and in general it removes the need to tune the
+    relaxation per case. With aitken set to False, the iteration is
+    under-relaxed with a constant factor.
+
+    The derivative is not used. Like for Newton, a scalar loop is not
+    needed, arrays are solved element-wise with solve_active.
+
+    """
+
+    def __init__(self, function=f, maxIter=100, eps=0.001, debug=False,
+                 relaxation=1, aitken=True):
+        RootFinder.__init__(self, function, f, maxIter, eps, debug=debug)
+        self.relaxation = relaxation
+        self.aitken = aitken
+
+    @property
+    def relaxation(self):
+        """The initial, or constant, relaxation factor"""
+        return self.__relaxation
+
+    @property
+    def aitken(self):
+        """Whether the relaxation factor is updated with Aitken's rule"""
+        return self.__aitken
+
+    @relaxation.setter
+    def relaxation(self, value):
+        self.__relaxation = value
+
+    @aitken.setter
+    def aitken(self, value):
+        self.__aitken = value
+
+    def solve(self, guess, args=()):
+        """
+        Find the fixed point.
+
+        Parameters
+        ----------
+        guess : float or ndarray
+            Initial guess for the fixed point.
+        args : sequence, optional
+            Additional arguments passed to the function, called as
+            f(*args, x).
+
+        Returns
+        -------
+        float or ndarray
+            The fixed point.
+
+        """
+        return self.solve_active(guess, args)[0][()]
+
+    def solve_active(self, guess, args=()):
+        """
+        Find the fixed points of a set of independent maps, one per
+        array element.
+
+        Elements are removed from the working set as soon as the
+        relative change of the iterate is below eps.
+
+        Parameters
+        ----------
+        guess : float or ndarray
+            Initial guess for the fixed points.
+        args : sequence, optional
+            Additional arguments passed to the function, either scalars
+            or arrays broadcastable against the guess.
+
+        Returns
+        -------
+        (ndarray, ndarray, ndarray)
+            The fixed points, the mask of converged elements and the
+            number of iterations performed for each element.
+
+        """
+        shape = np.broadcast(guess, *args).shape
+        x = np.array(np.broadcast_to(guess, shape), dtype=float).ravel()
+        args = [np.ravel(np.broadcast_to(a, shape)) if np.ndim(a) > 0 else a
+                for a in args]
+
+        omega = np.full(x.size, self.relaxation, dtype=float)
+        rOld = np.zeros(x.size)
+        converged = np.zeros(x.size, dtype=bool)
+        iterations = np.zeros(x.size, dtype=int)
+        residual = np.zeros(x.size)
+        active = np.arange(x.size)
+
+        for i in range(self.maxIter):
+            activeX = x[active]
+            r = self.f(*_subset(args, active), activeX) - activeX
+
+            if self.aitken and i > 0:
+                activeOmega = omega[active]
+                activeROld = rOld[active]
+                change = r - activeROld
+                safe = change != 0
+                omega[active] = np.where(
+                    safe, -activeOmega*activeROld/np.where(safe, change, 1),
+                    activeOmega)
+            rOld[active] = r
+
+            newX = activeX + omega[active]*r
+            error = np.abs(newX - activeX)/np.abs(activeX)
+
+            x[active] = newX
+            iterations[active] += 1
+            residual[active] = error
+
+            done = error <= self.eps
+            converged[active[done]] = True
+            active = active[~done]
 
+            if active.size == 0:
+                break
 
+        converged = converged.reshape(shape)
+        iterations = iterations.reshape(shape)
+        self._record(iterations, residual.reshape(shape), converged)
 
+        return x.reshape(shape), converged, iterations
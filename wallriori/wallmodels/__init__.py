@@ -6,8 +6,13 @@
 from .wallmodels import *
 from .odewallmodels import *
 from .ablwallmodels import *
+from .warmstart import *
+from .surrogatewallmodels import *
 
-__all__ = ["wallmodels", "odewallmodels", "ablwallmodels"]
+__all__ = ["wallmodels", "odewallmodels", "ablwallmodels", "warmstart",
+           "surrogatewallmodels"]
 __all__.extend(wallmodels.__all__)
 __all__.extend(odewallmodels.__all__)
 __all__.extend(ablwallmodels.__all__)
+__all__.extend(warmstart.__all__)
+__all__.extend(surrogatewallmodels.__all__)
@@ -11,6 +11,14 @@ __all__ = ["MOSTWallModel"]
 
 
 class MOSTWallModel(WallModel):
+
+    # Tables of the Richardson number relation, shared by all models,
+    # at most _maxTables are kept. Lookups needing more than
+    # _maxCombinations tables use the Newton iterations instead.
+    _tables = {}
+    _maxTables = 32
+    _maxCombinations = 8
+
     def __init__(self, h: float, nu: float, z0u: float, z0t: float,
                  theta0: float, kappa=0.4, l_obukhov=None, g=9.81):
         WallModel.__init__(self, h, nu)
@@ -42,7 +50,6 @@ class MOSTWallModel(WallModel):
         h = self.h
 
         for i in range(20):
-            print(self.l_obukhov)
             l_upper = self.l_obukhov + 1e-3*self.l_obukhov
             l_lower = self.l_obukhov - 1e-3*self.l_obukhov
 
@@ -70,39 +77,298 @@ class MOSTWallModel(WallModel):
                 dfdl += (self.h/l_lower/self.similarity_law(l_lower, self.z0u, self.correction_u)**3)
 
             dfdl /= (l_upper - l_lower)
+            lOld = self.l_obukhov
             self.l_obukhov -= f/dfdl
 
+        self._record(20, np.abs(self.l_obukhov - lOld)/np.abs(lOld), None)
+
     def length_scale(self, u: float, theta: float, q=None, theta_s=None):
         if self.l_obukhov is None:
             utau = self.kappa*u/(np.log(self.h/self.z0u))
             if q is None:
                 q = utau * self.kappa * (theta_s - theta) / np.log(self.h / self.z0t)
 
-            print(utau, q)
             return -(utau**3 * self.theta0) / (self.kappa * self.g * q)
         else:
             return self.l_obukhov
 
-    def correction_u(self, zeta: float):
-        if zeta < 0:
-            xi = (1 - 16*zeta)**0.25
-            return 2*np.log(0.5*(1 + xi)) + np.log(0.5*(1 + xi**2)) - 2*np.arctan(xi) + np.pi/2
+    def correction_u(self, zeta):
+        """The stability correction of the velocity profile, for a
+        float or an array of zeta."""
+        zeta = np.asarray(zeta, dtype=float)
+
+        # Businger-Dyer for the unstable, Beljaars-Holtslag for the
+        # stable range
+        xi = (1 - 16*np.minimum(zeta, 0))**0.25
+        unstable = (2*np.log(0.5*(1 + xi)) + np.log(0.5*(1 + xi**2)) -
+                    2*np.arctan(xi) + np.pi/2)
+
+        a = 1.0
+        b = 0.66666666666
+        c = 5.0
+        d = 0.35
+        c_d_d = c/d
+        bc_d_d = b*c/d
+        stableZeta = np.maximum(zeta, 0)
+        stable = (- b*(stableZeta - c_d_d)*np.exp(-d*stableZeta) -
+                  a*stableZeta - bc_d_d)
+
+        return np.where(zeta < 0, unstable, stable)[()]
+
+    def correction_t(self, zeta):
+        """The stability correction of the temperature profile, for a
+        float or an array of zeta."""
+        zeta = np.asarray(zeta, dtype=float)
+        xi = (1 - 16*np.minimum(zeta, 0))**0.25
+        return np.where(zeta < 0, 2*np.log(0.5*(1 + xi**2)), -7.8*zeta)[()]
+
+    def _correction_u_derivative(self, zeta):
+        """The derivative of correction_u with respect to zeta."""
+        zeta = np.asarray(zeta, dtype=float)
+        xi = (1 - 16*np.minimum(zeta, 0))**0.25
+        unstable = -4/xi**3*(2/(1 + xi) + 2*(xi - 1)/(1 + xi**2))
+
+        a = 1.0
+        b = 0.66666666666
+        c = 5.0
+        d = 0.35
+        stableZeta = np.maximum(zeta, 0)
+        stable = -b*np.exp(-d*stableZeta)*(1 + c - d*stableZeta) - a
+
+        return np.where(zeta < 0, unstable, stable)
+
+    def _correction_t_derivative(self, zeta):
+        """The derivative of correction_t with respect to zeta."""
+        zeta = np.asarray(zeta, dtype=float)
+        xi = (1 - 16*np.minimum(zeta, 0))**0.25
+        return np.where(zeta < 0, -16/(xi**2*(1 + xi**2)), -7.8)
+
+    def _rib_of_zeta(self, zeta, logU, logT=None):
+        """The bulk Richardson number given by zeta, for a prescribed
+        surface temperature, or for a prescribed flux if logT is None."""
+        momentum = logU - self.correction_u(zeta)
+        if logT is None:
+            return zeta/momentum**3
+        return zeta*(logT - self.correction_t(zeta))/momentum**2
+
+    def stability_table(self, logU, logT=None, n=4001, zetaMin=-100.,
+                        zetaMax=100.):
+        """
+        Return the table of zeta as a function of the bulk Richardson
+        number for the given roughness ratios.
+
+        The relation is evaluated on a grid uniform in asinh(zeta),
+        which is fine around neutral conditions, and is cut to the
+        increasing branch that contains zeta = 0, so that it can be
+        inverted. For a prescribed flux, this keeps the root closer to
+        neutral. The tables are built once per combination of the
+        arguments and kept in memory, the oldest table is dropped when
+        there are more than _maxTables.
+
+        Parameters
+        ----------
+        logU : float
+            log(h/z0u).
+        logT : float, optional
+            log(h/z0t), None for a prescribed heat flux.
+        n : int, optional
+            The number of points in the table.
+        zetaMin, zetaMax : float, optional
+            The range of zeta covered by the table.
+
+        Returns
+        -------
+        (ndarray, ndarray)
+            The increasing Richardson numbers and the values of zeta.
+
+        """
+        key = (type(self), float(logU), None if logT is None else float(logT),
+               n, zetaMin, zetaMax)
+        if key not in MOSTWallModel._tables:
+            if len(MOSTWallModel._tables) >= MOSTWallModel._maxTables:
+                del MOSTWallModel._tables[next(iter(MOSTWallModel._tables))]
+
+            zeta = np.sinh(np.linspace(np.arcsinh(zetaMin),
+                                       np.arcsinh(zetaMax), n))
+            rib = self._rib_of_zeta(zeta, logU, logT)
+            # The increasing branch that contains neutral conditions
+            neutral = np.argmin(np.abs(zeta))
+            decreasing = np.flatnonzero(np.diff(rib) <= 0)
+            before = decreasing[decreasing < neutral]
+            after = decreasing[decreasing >= neutral]
+            start = 0 if before.size == 0 else before[-1] + 1
+            end = n if after.size == 0 else after[0] + 1
+            MOSTWallModel._tables[key] = (rib[start:end], zeta[start:end])
+        return MOSTWallModel._tables[key]
+
+    def _tabulated_stability_parameter(self, rib, logU, logT=None):
+        """Interpolate zeta from the tables, with one table per unique
+        combination of the roughness ratios. Values outside a table are
+        clipped to its range. Returns zeta and the mask of the faces
+        within the tables, or None if more than _maxCombinations tables
+        would be needed."""
+        uniform = np.all(logU == logU[0]) and (logT is None or
+                                               np.all(logT == logT[0]))
+        if uniform:
+            combinations = logU[:1] if logT is None else [(logU[0], logT[0])]
+            inverse = np.zeros(rib.size, dtype=int)
+        elif logT is None:
+            combinations, inverse = np.unique(logU, return_inverse=True)
         else:
-            print("zeta", zeta)
-            a = 1.0
-            b = 0.66666666666
-            c = 5.0
-            d = 0.35
-            c_d_d = c/d
-            bc_d_d = b*c/d
-            return - b*(zeta - c_d_d)*np.exp(-d*zeta) - a*zeta - bc_d_d
-
-    def correction_t(self, zeta: float):
-        if zeta <0:
-            xi = (1 - 16*zeta)**0.25
-            return 2*np.log(0.5*(1 + xi**2))
+            combinations, inverse = np.unique(np.stack([logU, logT], axis=1),
+                                              axis=0, return_inverse=True)
+        if len(combinations) > MOSTWallModel._maxCombinations:
+            return None
+        inverse = np.ravel(inverse)
+
+        zeta = np.zeros(rib.size)
+        inRange = np.zeros(rib.size, dtype=bool)
+        for i, combination in enumerate(combinations):
+            faces = slice(None) if uniform else inverse == i
+            if logT is None:
+                tableRib, tableZeta = self.stability_table(combination)
+            else:
+                tableRib, tableZeta = self.stability_table(*combination)
+            zeta[faces] = np.interp(rib[faces], tableRib, tableZeta)
+            inRange[faces] = ((rib[faces] >= tableRib[0]) &
+                              (rib[faces] <= tableRib[-1]))
+        return zeta, inRange
+
+    def stability_parameter(self, u, theta, q=None, theta_s=None, z0u=None,
+                            z0t=None, maxIter=50, tol=1e-10, table=False):
+        """
+        Compute zeta = h/L for many faces at once.
+
+        The bulk Richardson number relation, including the stability
+        corrections, is solved with Newton's method for all faces
+        together, and faces are dropped as soon as they converge. The
+        sign of zeta is that of the Richardson number, steps that would
+        change it are halved instead. When q is given, the relation can
+        have two roots in stable conditions, starting from the neutral
+        estimate gives the one closer to neutral.
+
+        Parameters
+        ----------
+        u : float or ndarray
+            Sampled velocity magnitude.
+        theta : float or ndarray
+            Sampled potential temperature.
+        q : float or ndarray, optional
+            The surface heat flux, if given theta_s is not used.
+        theta_s : float or ndarray, optional
+            The surface temperature.
+        z0u, z0t : float or ndarray, optional
+            Roughness lengths, by default those of the model.
+        maxIter : int, optional
+            Maximum amount of Newton iterations.
+        tol : float, optional
+            Tolerance on the change of zeta.
+        table : bool, optional
+            Whether to interpolate zeta from the tables built by
+            stability_table instead of iterating. Faces with a Richardson
+            number outside the tables get the zeta at the end of the
+            table and are marked as not converged in the diagnostics.
+            If the faces have more than _maxCombinations different
+            roughness combinations, the Newton iterations are used.
+
+        Returns
+        -------
+        float or ndarray
+            The values of zeta.
+
+        """
+        z0u = self.z0u if z0u is None else z0u
+        z0t = self.z0t if z0t is None else z0t
+
+        rib = self.rib(u, theta, q, theta_s)
+        shape = np.broadcast(rib, z0u, z0t).shape
+        rib = np.broadcast_to(rib, shape).ravel()
+        logU = np.broadcast_to(np.log(self.h/z0u), shape).ravel()
+        logT = np.broadcast_to(np.log(self.h/z0t), shape).ravel()
+
+        if table:
+            tabulated = self._tabulated_stability_parameter(
+                rib, logU, None if q is not None else logT)
+            if tabulated is not None:
+                zeta, inRange = tabulated
+                self._record(np.zeros(shape, dtype=int), np.zeros(shape),
+                             inRange.reshape(shape))
+                return zeta.reshape(shape)[()]
+
+        # Neutral estimate
+        if q is None:
+            zeta = rib*logU**2/logT
         else:
-            return -7.8*zeta
+            zeta = rib*logU**3
+
+        converged = np.zeros(zeta.size, dtype=bool)
+        iterations = np.zeros(zeta.size, dtype=int)
+        error = np.zeros(zeta.size)
+        active = np.flatnonzero(rib != 0)
+        converged[rib == 0] = True
+
+        for i in range(maxIter):
+            if active.size == 0:
+                break
+
+            z = zeta[active]
+            momentum = logU[active] - self.correction_u(z)
+            dMomentum = -self._correction_u_derivative(z)
+
+            if q is None:
+                heat = logT[active] - self.correction_t(z)
+                dHeat = -self._correction_t_derivative(z)
+                f = z*heat/momentum**2 - rib[active]
+                dfdz = ((heat + z*dHeat)/momentum**2 -
+                        2*z*heat*dMomentum/momentum**3)
+            else:
+                f = z/momentum**3 - rib[active]
+                dfdz = 1/momentum**3 - 3*z*dMomentum/momentum**4
+
+            new = z - f/dfdz
+            new = np.where(new*rib[active] > 0, new, 0.5*z)
+
+            error[active] = np.abs(new - z)/np.abs(z)
+            zeta[active] = new
+            iterations[active] += 1
+
+            done = error[active] < tol
+            converged[active[done]] = True
+            active = active[~done]
+
+        self._record(iterations.reshape(shape), error.reshape(shape),
+                     converged.reshape(shape))
+        return zeta.reshape(shape)[()]
+
+    def utau_and_q(self, u, theta, q=None, theta_s=None, z0u=None,
+                   z0t=None, maxIter=50, tol=1e-10, table=False):
+        """
+        Compute the friction velocity, the surface heat flux and the
+        Obukhov length for many faces at once.
+
+        Parameters are as for stability_parameter. If q is given, it is
+        returned as is.
+
+        Returns
+        -------
+        (ndarray, ndarray, ndarray)
+            The friction velocity, the heat flux and the Obukhov length,
+            which is infinite for neutral conditions.
+
+        """
+        z0u = self.z0u if z0u is None else z0u
+        z0t = self.z0t if z0t is None else z0t
+
+        zeta = self.stability_parameter(u, theta, q, theta_s, z0u, z0t,
+                                        maxIter, tol, table)
+        utau = self.kappa*u/(np.log(self.h/z0u) - self.correction_u(zeta))
+        if q is None:
+            q = utau*self.kappa*(theta_s - theta)/(np.log(self.h/z0t) -
+                                                   self.correction_t(zeta))
+
+        with np.errstate(divide="ignore"):
+            lObukhov = self.h/np.asarray(zeta, dtype=float)
+        return utau, q, lObukhov[()]
 
     def utau(self, sampled_u):
         psi_m = self.correction_u(self.h/self.l_obukhov)
@@ -116,38 +382,27 @@ class MOSTWallModel(WallModel):
         return self.q_val
 
     def u_explicit(self, y, utau, l_obukhov, stable=False):
-        print("hi")
-        if l_obukhov != 0:
-            xi = (1 - 16*y/l_obukhov)**0.25
-            if stable:
-                a = 1.0
-                b = 0.66666666666
-                c = 5.0
-                d = 0.35
-                c_d_d = c / d
-                bc_d_d = b * c / d
-                zeta = y/l_obukhov
-                psi_m = - b * (zeta - c_d_d) * np.exp(-d * zeta) - a * zeta - bc_d_d
-                zeta = self.z0u/l_obukhov
-                psi_m -= - b * (zeta - c_d_d) * np.exp(-d * zeta) - a * zeta - bc_d_d
-
-                psi_m = -4.8*y/l_obukhov + 4.8*self.z0u/l_obukhov
-                print("h2")
-            else:
-                psi_m = 2*np.log(0.5*(1 + xi)) + np.log(0.5*(1 + xi**2))\
-                        - 2*np.arctan(xi) + np.pi/2
-        else:
-            psi_m = 0
-        print(psi_m)
-        return utau/self.kappa * (np.log(y / self.z0u) - psi_m)
+        """The velocity profile, the arguments can be arrays."""
+        l_obukhov = np.asarray(l_obukhov, dtype=float)
+        neutral = l_obukhov == 0
+        safeL = np.where(neutral, 1, l_obukhov)
+
+        xi = (1 - 16*np.minimum(y/safeL, 0))**0.25
+        psi_m = np.where(
+            stable, -4.8*y/safeL + 4.8*self.z0u/safeL,
+            2*np.log(0.5*(1 + xi)) + np.log(0.5*(1 + xi**2)) -
+            2*np.arctan(xi) + np.pi/2)
+        psi_m = np.where(neutral, 0, psi_m)
+        return (utau/self.kappa * (np.log(y / self.z0u) - psi_m))[()]
 
     def t_explicit(self, y, utau, q, l_obukhov, stable=False):
-        if l_obukhov != 0:
-            xi = (1 - 16*y/l_obukhov)**0.25
-            if stable:
-                psi_h = -7.8*y/l_obukhov + 7.8*0.1/l_obukhov
-            else:
-                psi_h = 2*np.log(0.5*(1 + xi**2))
-        else:
-            psi_h = 0
-        return -q/(utau*self.kappa) * (np.log(y / self.z0t) - psi_h)
+        """The temperature profile, the arguments can be arrays."""
+        l_obukhov = np.asarray(l_obukhov, dtype=float)
+        neutral = l_obukhov == 0
+        safeL = np.where(neutral, 1, l_obukhov)
+
+        xi = (1 - 16*np.minimum(y/safeL, 0))**0.25
+        psi_h = np.where(stable, -7.8*y/safeL + 7.8*0.1/safeL,
+                         2*np.log(0.5*(1 + xi**2)))
+        psi_h = np.where(neutral, 0, psi_h)
+        return (-q/(utau*self.kappa) * (np.log(y / self.z0t) - psi_h))[()]
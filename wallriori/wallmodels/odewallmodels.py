@@ -8,48 +8,198 @@ from __future__ import division
 from __future__ import print_function
 from .wallmodels import WallModel
 import numpy as np
+from functools import partial
 from ..mesh import Mesh
-from ..problems import SteadyDiffusion
+from ..quadrature import Quadrature
+from ..problems import BatchSteadyDiffusion
+from scipy.linalg import solve_banded
 
 __all__ = ["IntegratedODEWallModel", "ODEWallModel", "GriffinFuWallModel"]
 
+
+def _per_face_columns(kwargs, nFaces):
+    """Turn 1D keyword arguments, holding one value per face, into
+    columns that broadcast against (nFaces, nPoints) arrays."""
+    return {key: np.broadcast_to(value, (nFaces,))[:, np.newaxis]
+            if np.ndim(value) == 1 else value
+            for key, value in kwargs.items()}
+
+
+def _subset_columns(kwargs, index):
+    """Select the given faces from the per-face keyword arguments."""
+    return {key: value[index] if np.ndim(value) == 2 else value
+            for key, value in kwargs.items()}
+
 class IntegratedODEWallModel(WallModel):
-    def __init__(self, h, nu, eddyViscosity, n, maxiter, tol):
+    """
+    Wall model integrating the boundary layer equation with an algebraic
+    eddy viscosity.
+
+    The integrals are computed with Simpson's rule on n uniformly
+    distributed points, unless a Quadrature on [0, h] is given, in which
+    case its nodes are used as the mesh. For instance, a Gauss-Legendre
+    or Clenshaw-Curtis rule reaches the same accuracy with far fewer
+    points.
+
+    """
+
+    def __init__(self, h, nu, eddyViscosity, n, maxiter, tol,
+                 quadrature=None):
         WallModel.__init__(self, h, nu)
 
         self.eddyViscosity = eddyViscosity
-        self.mesh = np.linspace(0, h, n)
+        if quadrature is None:
+            quadrature = Quadrature.simpson(np.linspace(0, h, n))
+        self.quadrature = quadrature
+        self.mesh = quadrature.nodes
         self.maxiter = maxiter
         self.tol = tol
 
-    def utau(self, guess, sampledU, sourceField, **kwargs):
-        from scipy.integrate import simps
+    def utau_iteration(self, uTau, sampledU, sourceField, **kwargs):
+        """Return the friction velocity given by the integrated equation
+        with the eddy viscosity evaluated at uTau."""
         y = self.mesh
 
-        tau = guess**2
-        for _ in range(self.maxiter):
-            nut = self.eddyViscosity.value(y, self.nu, np.sqrt(tau), **kwargs)
+        nut = self.eddyViscosity.value(y, self.nu, uTau, **kwargs)
+
+        inverse = 1/(self.nu + nut)
+        integral, integral2 = self.quadrature.integrate(
+            np.array([inverse, y*inverse]))
 
-            integral = simps(1/(self.nu + nut), x=y)
-            integral2 = simps(y/(self.nu + nut), x=y)
+        magU = np.linalg.norm(sampledU)
+        tau = (magU**2 + (np.linalg.norm(sourceField) * integral2)**2 -
+               2 * np.dot(sampledU, sourceField) * integral2)
 
-            magU = np.linalg.norm(sampledU)
-            newTau = (magU**2 + (np.linalg.norm(sourceField) * integral2)**2 -
-                      2 * np.dot(sampledU, sourceField) * integral2)
+        return np.sqrt(np.sqrt(tau) / integral)
 
-            newTau = np.sqrt(newTau) / integral
+    def utau(self, guess, sampledU, sourceField, faces=None, **kwargs):
+        guess = self._warm_start_guess(guess, faces)
+
+        if self.fixedPoint is not None:
+            self.fixedPoint.f = partial(self.utau_iteration,
+                                        sampledU=sampledU,
+                                        sourceField=sourceField, **kwargs)
+            uTau = self.fixedPoint.solve(guess)
+            self._warm_start_update(faces, uTau)
+            return uTau
+
+        tau = guess**2
+        iterations = 0
+        error = np.inf
+        for i in range(self.maxiter):
+            newTau = self.utau_iteration(np.sqrt(tau), sampledU, sourceField,
+                                         **kwargs)**2
 
             error = np.abs(tau - newTau) / tau
             tau = newTau
+            iterations = i + 1
 
             if error < self.tol:
                 break
-        print(error)
+
+        self._record(iterations, error, error < self.tol)
+        self._warm_start_update(faces, np.sqrt(tau))
         return np.sqrt(tau)
 
+    def utau_faces(self, guess, sampledU, sourceField, faces=None,
+                   **kwargs):
+        """
+        Compute the friction velocity and the wall shear stress for many
+        faces at once.
+
+        Integrating the equation once gives (nu + nut) du/dy = tau + S y,
+        for the wall shear stress vector tau and the source vector S, and
+        once more gives U = tau I1 + S I2, where I1 and I2 are the
+        integrals of 1/(nu + nut) and y/(nu + nut). The iterations are
+        the same as in utau, but done for all faces together, and faces
+        are dropped as soon as they converge.
+
+        Parameters
+        ----------
+        guess : float or ndarray
+            Initial guess for the friction velocity.
+        sampledU : ndarray
+            The sampled velocity vectors, shape (nFaces, 3).
+        sourceField : ndarray
+            The source vectors, for instance the pressure gradient,
+            broadcastable to the shape of sampledU.
+        faces : ndarray, optional
+            Face indices, used with warm starts.
+        **kwargs
+            Passed to the eddy viscosity, 1D arrays are taken to hold
+            one value per face, for instance magPGrad.
+
+        Returns
+        -------
+        (ndarray, ndarray)
+            The friction velocities and the wall shear stress vectors.
+
+        """
+        sampledU = np.atleast_2d(sampledU).astype(float)
+        nFaces = sampledU.shape[0]
+        sourceField = np.broadcast_to(sourceField, sampledU.shape)
+        y = self.mesh
+        nu = self.nu
+
+        uTau = np.array(np.broadcast_to(self._warm_start_guess(guess, faces),
+                                        (nFaces,)), dtype=float)
+        kwargs = _per_face_columns(kwargs, nFaces)
+
+        tau = uTau**2
+        wallShearStress = np.zeros(sampledU.shape)
+        error = np.full(nFaces, np.inf)
+        iterations = np.zeros(nFaces, dtype=int)
+        converged = np.zeros(nFaces, dtype=bool)
+        active = np.arange(nFaces)
+
+        for i in range(self.maxiter):
+            nut = self.eddyViscosity.value(y, nu,
+                                           np.sqrt(tau[active, np.newaxis]),
+                                           **_subset_columns(kwargs, active))
+
+            inverse = 1/(nu + nut)
+            integral, integral2 = self.quadrature.integrate(
+                np.stack([inverse, y*inverse]))
+
+            stress = (sampledU[active] -
+                      sourceField[active]*integral2[:, np.newaxis]) / \
+                integral[:, np.newaxis]
+            wallShearStress[active] = stress
+            newTau = np.linalg.norm(stress, axis=1)
+
+            error[active] = np.abs(tau[active] - newTau)/tau[active]
+            tau[active] = newTau
+            iterations[active] = i + 1
+
+            done = error[active] < self.tol
+            converged[active[done]] = True
+            active = active[~done]
+            if active.size == 0:
+                break
+
+        uTau = np.sqrt(tau)
+        self._record(iterations, error, converged)
+        self._warm_start_update(faces, uTau)
+        return uTau, wallShearStress
+
 
 class ODEWallModel(WallModel):
-    def __init__(self, nu, eddyViscosity, mesh, maxiter, tol):
+    """
+    Wall model solving the boundary layer equation with an algebraic
+    eddy viscosity on a wall-normal mesh.
+
+    With method="picard", the default, the eddy viscosity is frozen at
+    the current friction velocity, the profile is solved for, and the
+    friction velocity is updated from the wall gradient. With
+    method="newton", the friction velocity is found with Newton's method
+    on the wall-gradient condition, with the sensitivity of the profile
+    to the friction velocity obtained from the derivative method of the
+    eddy viscosity. This converges quadratically.
+
+    """
+
+    def __init__(self, nu, eddyViscosity, mesh, maxiter, tol,
+                 method="picard"):
         WallModel.__init__(self, mesh.faces[-1], nu)
 
         self.h = mesh.faces[-1]
@@ -61,39 +211,339 @@ class ODEWallModel(WallModel):
         self.eddyViscosity = eddyViscosity
         self.maxiter = maxiter
         self.tol = tol
+        self.method = method
 
     @classmethod
-    def from_cell_number(cls, h, nu, eddyViscosity, n, maxiter, tol):
+    def from_cell_number(cls, h, nu, eddyViscosity, n, maxiter, tol,
+                         method="picard"):
         faces = np.linspace(0, h, n+1)
         mesh = Mesh.from_faces(faces)
-        return ODEWallModel(nu, eddyViscosity, mesh, maxiter, tol)
-
-    def utau(self, guess, sampledU, sourceField, **kwargs):
-        ic = np.zeros(self.y.size)
-
-        uTau = guess
-
+        return ODEWallModel(nu, eddyViscosity, mesh, maxiter, tol, method)
+
+    @property
+    def method(self):
+        """The iteration method for the friction velocity, picard or
+        newton."""
+        return self.__method
+
+    @method.setter
+    def method(self, value):
+        if value not in ["picard", "newton"]:
+            raise ValueError("Unknown method " + str(value))
+        self.__method = value
+
+    def workspace(self):
+        """
+        Return the work arrays of the model, allocating them if the
+        mesh has changed.
+
+        The arrays are reused in place by all iterations of all calls to
+        utau, so the entries are only valid until the next call.
+
+        Returns
+        -------
+        dict
+            The geometric factors of the mesh and the buffers for the
+            viscosity at the centres and faces, the conductances, the
+            banded system matrix and the right-hand side.
+
+        """
+        workspace = getattr(self, "_workspace", None)
+        if workspace is None or workspace["mesh"] is not self.mesh:
+            workspace = self._allocate_workspace()
+            self._workspace = workspace
+        return workspace
+
+    def _allocate_workspace(self):
+        mesh = self.mesh
+        centres = mesh.centres
+        faces = mesh.faces
+        nCells = mesh.nCells
+
+        distances = np.concatenate([[centres[0] - faces[0]],
+                                    np.diff(centres),
+                                    [faces[-1] - centres[-1]]])
+        weights = (faces[1:-1] - centres[:-1])/(centres[1:] - centres[:-1])
+
+        return {"mesh": mesh,
+                "y": np.append(centres, faces[-1]),
+                "weights": weights,
+                "areaOverDistance": mesh.dim2*mesh.dim3/distances,
+                "nuCells": np.zeros(nCells),
+                "nuFaces": np.zeros(nCells + 1),
+                "conductances": np.zeros(nCells + 1),
+                "banded": np.zeros((3, nCells)),
+                "rhs": np.zeros(nCells),
+                "buffer": np.zeros(nCells - 1),
+                "dConductances": np.zeros(nCells + 1),
+                "jumps": np.zeros(nCells + 1)}
+
+    def _interpolate_to_faces(self, cells, faces):
+        """Linearly interpolate cell values to the internal faces, in
+        place."""
+        ws = self.workspace()
+        buffer = ws["buffer"]
+        np.subtract(cells[1:], cells[:-1], out=buffer)
+        np.multiply(ws["weights"], buffer, out=buffer)
+        np.add(cells[:-1], buffer, out=faces[1:-1])
+
+    def _assemble_profile(self, uTau, sampledU, sourceField, **kwargs):
+        """Assemble the system for the velocity profile with nut frozen
+        at uTau in the work arrays. The same system as SteadyDiffusion
+        is assembled."""
+        ws = self.workspace()
+        nu = self.nu
+
+        nut = self.eddyViscosity.value(ws["y"], nu, uTau, **kwargs)
+        nuCells = ws["nuCells"]
+        np.add(nu, nut[:-1], out=nuCells)
+
+        # Linear interpolation to the internal faces
+        nuFaces = ws["nuFaces"]
+        self._interpolate_to_faces(nuCells, nuFaces)
+        nuFaces[0] = nu
+        nuFaces[-1] = nu + nut[-1]
+
+        conductances = ws["conductances"]
+        np.multiply(nuFaces, ws["areaOverDistance"], out=conductances)
+
+        banded = ws["banded"]
+        np.negative(conductances[1:-1], out=banded[0, 1:])
+        np.add(conductances[:-1], conductances[1:], out=banded[1])
+        np.negative(conductances[1:-1], out=banded[2, :-1])
+
+        rhs = ws["rhs"]
+        np.multiply(sourceField, self.mesh.volumes, out=rhs)
+        rhs[0] = 0
+        rhs[-1] = conductances[-1]*sampledU
+
+    def _solve_profile(self, uTau, sampledU, sourceField, **kwargs):
+        """Solve for the velocity profile with nut frozen at uTau."""
+        self._assemble_profile(uTau, sampledU, sourceField, **kwargs)
+        ws = self.workspace()
+        return solve_banded((1, 1), ws["banded"], ws["rhs"],
+                            overwrite_ab=True, overwrite_b=True,
+                            check_finite=False)
+
+    def _newton_step(self, uTau, sampledU, sourceField, **kwargs):
+        """
+        Solve for the profile at uTau and return it together with the
+        Newton update of uTau.
+
+        The residual is r = uTau^2 y_0 - nu u_0. Differentiating the
+        discrete system K(uTau) u = b(uTau) gives K du/duTau = -c, where
+        c is the residual of the system with the conductances replaced
+        by their derivatives, so one more solve with the same matrix
+        gives the exact derivative of r.
+
+        """
+        ws = self.workspace()
+        nu = self.nu
+        y0 = self.y[0]
+
+        self._assemble_profile(uTau, sampledU, sourceField, **kwargs)
+        sol = solve_banded((1, 1), ws["banded"], ws["rhs"], overwrite_b=True,
+                           check_finite=False)
+
+        dNut = self.eddyViscosity.derivative(ws["y"], nu, uTau, **kwargs)
+        dConductances = ws["dConductances"]
+        self._interpolate_to_faces(dNut[:-1], dConductances)
+        dConductances[0] = 0
+        dConductances[-1] = dNut[-1]
+        np.multiply(dConductances, ws["areaOverDistance"], out=dConductances)
+
+        jumps = ws["jumps"]
+        jumps[0] = sol[0]
+        np.subtract(sol[1:], sol[:-1], out=jumps[1:-1])
+        jumps[-1] = sampledU - sol[-1]
+        np.multiply(dConductances, jumps, out=jumps)
+
+        sensitivity = solve_banded((1, 1), ws["banded"],
+                                   jumps[:-1] - jumps[1:],
+                                   overwrite_ab=True, overwrite_b=True,
+                                   check_finite=False)
+
+        residual = uTau**2*y0 - nu*sol[0]
+        derivative = 2*uTau*y0 + nu*sensitivity[0]
+        return sol, uTau - residual/derivative
+
+    def utau_iteration(self, uTau, sampledU, sourceField, **kwargs):
+        """Return the friction velocity given by the wall gradient of the
+        profile solved with the eddy viscosity evaluated at uTau."""
+        sol = self._solve_profile(uTau, sampledU, sourceField, **kwargs)
+        return np.sqrt(self.nu*sol[0]/self.y[0])
+
+    def utau(self, guess, sampledU, sourceField, faces=None, **kwargs):
+        """
+        Compute the friction velocity.
+
+        If the fixedPoint attribute is set, it replaces the Picard
+        iterations, it is not used with the Newton method.
+
+        With a warm start store and face indices, the stored friction
+        velocity is used as the guess, and the converged profile is
+        stored as output.
+
+        """
+        uTau = self._warm_start_guess(guess, faces)
+
+        if self.fixedPoint is not None and self.method == "picard":
+            self.fixedPoint.f = partial(self.utau_iteration,
+                                        sampledU=sampledU,
+                                        sourceField=sourceField, **kwargs)
+            uTau = self.fixedPoint.solve(uTau)
+            sol = self._solve_profile(uTau, sampledU, sourceField, **kwargs)
+
+            self.yPlus = self.y*uTau/self.nu
+            self.u = sol.copy()
+            self._warm_start_update(faces, uTau, self.u)
+            return uTau
+
+        iterations = 0
+        error = np.inf
         for i in range(self.maxiter):
-            nut = self.eddyViscosity.value(np.append(self.y, self.mesh.faces[-1]), self.nu, uTau)
-            bcLeft = [0, self.nu]
-            bcRight = [sampledU, self.nu + nut[-1]]
-            ode = SteadyDiffusion(self.mesh, ic, self.nu + nut[:-1], bcLeft, bcRight, sourceField)
-            ode.solve()
-            sol = ode.solution
             uTauOld = uTau
-            uTau = np.sqrt(self.nu*sol[0]/self.y[0])
+            iterations = i + 1
+            if self.method == "newton":
+                sol, uTau = self._newton_step(uTau, sampledU, sourceField,
+                                              **kwargs)
+                # Do not let the update leave the physical range
+                if not uTau > 0:
+                    uTau = 0.5*uTauOld
+            else:
+                sol = self._solve_profile(uTau, sampledU, sourceField,
+                                          **kwargs)
+                uTau = np.sqrt(self.nu*sol[0]/self.y[0])
 
-            if np.abs(uTau - uTauOld)/uTauOld < self.tol:
+            error = np.abs(uTau - uTauOld)/uTauOld
+            if error < self.tol:
                 break
 
+        if iterations == 0:
+            sol = self._solve_profile(uTau, sampledU, sourceField, **kwargs)
+        self._record(iterations, error, error < self.tol)
+
         self.yPlus = self.y*uTau/self.nu
-        self.u = sol
+        self.u = sol.copy()
+        self._warm_start_update(faces, uTau, self.u)
 
         return uTau
 
+    def utau_faces(self, guess, sampledU, sourceField, h=None, faces=None,
+                   profiles=False, **kwargs):
+        """
+        Compute the friction velocity for many faces at once.
+
+        All faces share the wall-normal mesh of the model. If the
+        sampling heights differ from the mesh height, the mesh is scaled
+        per face, which amounts to scaling the source by the square of
+        the scaling factor. Faces are dropped from the iterations as
+        soon as they converge.
+
+        Parameters
+        ----------
+        guess : float or ndarray
+            Initial guess for the friction velocity.
+        sampledU : ndarray
+            The sampled velocity magnitude at each face.
+        sourceField : float or ndarray
+            The source term of each face.
+        h : float or ndarray, optional
+            The sampling heights, by default the height of the mesh.
+        faces : ndarray, optional
+            Face indices, used with warm starts. The stored friction
+            velocities are used as guesses and the converged profiles
+            are stored as output.
+        profiles : bool, optional
+            Whether to also return the velocity profiles.
+        **kwargs
+            Passed to the eddy viscosity, 1D arrays are taken to hold
+            one value per face.
+
+        Returns
+        -------
+        ndarray or tuple of ndarray
+            The friction velocities and, if profiles is True, the
+            velocity at the cell centres of the scaled meshes, one row
+            per face.
+
+        """
+        perFace = [sampledU, sourceField, guess] + list(kwargs.values())
+        if h is not None:
+            perFace.append(h)
+        if faces is not None:
+            perFace.append(faces)
+        nFaces = np.broadcast(*[np.ravel(i) for i in perFace]).size
+        sampledU = np.broadcast_to(sampledU, (nFaces,)).astype(float)
+        nu = self.nu
+
+        uTau = np.array(np.broadcast_to(self._warm_start_guess(guess, faces),
+                                        (nFaces,)), dtype=float)
+        if h is None:
+            scale = np.ones(nFaces)
+        else:
+            scale = np.broadcast_to(h, (nFaces,))/self.h
+        source = np.broadcast_to(sourceField, (nFaces,))*scale**2
+
+        # Eddy viscosity at the cell centres and the top face
+        y = scale[:, np.newaxis]*np.append(self.y, self.h)
+        kwargs = _per_face_columns(kwargs, nFaces)
+
+        # The problem is built once, the viscosities of the active faces
+        # are updated in place and only their rows are solved
+        nuCells = np.full((nFaces, self.y.size), float(nu))
+        nuTop = np.full(nFaces, float(nu))
+        ode = BatchSteadyDiffusion(self.mesh, np.zeros((nFaces, self.y.size)),
+                                   nuCells, [0, nu], [sampledU, nuTop],
+                                   source[:, np.newaxis])
+        sol = ode.solution
+
+        error = np.full(nFaces, np.inf)
+        iterations = np.zeros(nFaces, dtype=int)
+        converged = np.zeros(nFaces, dtype=bool)
+        active = np.arange(nFaces)
+
+        for i in range(self.maxiter):
+            nut = self.eddyViscosity.value(y[active], nu,
+                                           uTau[active, np.newaxis],
+                                           **_subset_columns(kwargs, active))
+            nuCells[active] = nu + nut[:, :-1]
+            nuTop[active] = nu + nut[:, -1]
+            ode.solve(active)
+
+            uTauOld = uTau[active]
+            uTau[active] = np.sqrt(nu*sol[active, 0]/(scale[active]*self.y[0]))
+
+            error[active] = np.abs(uTau[active] - uTauOld)/uTauOld
+            iterations[active] = i + 1
+            done = error[active] < self.tol
+            converged[active[done]] = True
+            active = active[~done]
+            if active.size == 0:
+                break
+
+        self._record(iterations, error, converged)
+        self._warm_start_update(faces, uTau, sol)
+
+        if profiles:
+            return uTau, sol
+        return uTau
+
 
 class GriffinFuWallModel(WallModel):
-    def __init__(self, h, nu, mesh, maxiter, tol):
+    """
+    Wall model integrating the inverse of the total viscosity given by
+    a mixing length.
+
+    The integral is computed with Simpson's rule on the cell centres of
+    the mesh, unless a Quadrature is given, in which case the mixing
+    length is evaluated at its nodes. For instance, a Gauss-Legendre
+    rule on the same interval reaches the same accuracy with far fewer
+    points.
+
+    """
+
+    def __init__(self, h, nu, mesh, maxiter, tol, quadrature=None):
         WallModel.__init__(self, mesh.faces[-1], nu)
 
         self.h = h
@@ -101,40 +551,131 @@ class GriffinFuWallModel(WallModel):
         self.mesh = mesh
         self.maxiter = maxiter
         self.tol = tol
+        # Integration in y+ is the integration in y scaled by uTau/nu
+        if quadrature is None:
+            quadrature = Quadrature.simpson(mesh.centres)
+        self.quadrature = quadrature
 
     def a_plus(self, H, reTau):
         return 45.2 - 11.8*H - 0.993*np.log(reTau)
 
     def l_plus(self, kappa, uTau, aPlus):
-        y = self.mesh.centres
+        y = self.quadrature.nodes
         yPlus = y*uTau/self.nu
         return kappa*yPlus*(1 - np.exp(-(yPlus/aPlus)**2))
 
-    def utau(self, guess, sampledU, H, reTau=None, kappa=0.38):
-        from scipy.integrate import simps
-
-        for _ in range(self.maxiter):
-            if reTau is None:
-                # CHANNEL WITH DELTA=1 ONLY
-                aPlus = self.a_plus(H, guess/self.nu)
-            else:
-                aPlus = self.a_plus(H, reTau)
-            lPlus = self.l_plus(kappa, guess, aPlus)
-            yPlus = self.mesh.centres*guess/self.nu
-
-            rhs = simps(1/(1 + lPlus), x=yPlus)
-
-            new = sampledU/rhs
-            if (guess - new)/guess < self.tol:
+    def utau_iteration(self, uTau, sampledU, H, reTau=None, kappa=0.38):
+        """Return the friction velocity given by integrating the mixing
+        length profile evaluated at uTau."""
+        if reTau is None:
+            # CHANNEL WITH DELTA=1 ONLY
+            aPlus = self.a_plus(H, uTau/self.nu)
+        else:
+            aPlus = self.a_plus(H, reTau)
+        lPlus = self.l_plus(kappa, uTau, aPlus)
+
+        rhs = uTau/self.nu*self.quadrature.integrate(1/(1 + lPlus))
+        return sampledU/rhs
+
+    def utau(self, guess, sampledU, H, reTau=None, kappa=0.38, faces=None):
+        guess = self._warm_start_guess(guess, faces)
+
+        if self.fixedPoint is not None:
+            self.fixedPoint.f = partial(self.utau_iteration, sampledU=sampledU,
+                                        H=H, reTau=reTau, kappa=kappa)
+            uTau = self.fixedPoint.solve(guess)
+            self._warm_start_update(faces, uTau)
+            return uTau
+
+        error = np.inf
+        for i in range(self.maxiter):
+            new = self.utau_iteration(guess, sampledU, H, reTau, kappa)
+            error = np.abs(guess - new)/guess
+            if error < self.tol:
+                self._record(i + 1, error, True)
+                self._warm_start_update(faces, new)
                 return new
             else:
                 guess = new
 
+        self._record(self.maxiter, error, False)
+        self._warm_start_update(faces, guess)
         return guess
 
+    def utau_faces(self, guess, sampledU, H, reTau=None, kappa=0.38,
+                   faces=None):
+        """
+        Compute the friction velocity for many faces at once.
+
+        The mixing length is evaluated on the shared mesh for all the
+        active faces together, and faces are dropped from the iterations
+        as soon as they converge.
+
+        Parameters
+        ----------
+        guess : float or ndarray
+            Initial guess for the friction velocity.
+        sampledU : ndarray
+            The sampled velocity magnitude at each face.
+        H : float or ndarray
+            The shape factor of each face.
+        reTau : float or ndarray, optional
+            The friction Reynolds number of each face. By default it is
+            computed from uTau, which is only valid for a channel with
+            unit half-height.
+        kappa : float, optional
+            The von Karman constant.
+        faces : ndarray, optional
+            Face indices, used with warm starts.
+
+        Returns
+        -------
+        ndarray
+            The friction velocities.
+
+        """
+        perFace = [sampledU, H, guess]
+        if reTau is not None:
+            perFace.append(reTau)
+        if faces is not None:
+            perFace.append(faces)
+        nFaces = np.broadcast(*[np.ravel(i) for i in perFace]).size
+
+        sampledU = np.broadcast_to(sampledU, (nFaces,))
+        H = np.broadcast_to(H, (nFaces,))
+        if reTau is not None:
+            aPlus = self.a_plus(H, np.broadcast_to(reTau, (nFaces,)))
+
+        uTau = np.array(np.broadcast_to(self._warm_start_guess(guess, faces),
+                                        (nFaces,)), dtype=float)
+        error = np.full(nFaces, np.inf)
+        iterations = np.zeros(nFaces, dtype=int)
+        converged = np.zeros(nFaces, dtype=bool)
+        active = np.arange(nFaces)
 
+        for i in range(self.maxiter):
+            activeUTau = uTau[active]
+            if reTau is None:
+                # CHANNEL WITH DELTA=1 ONLY
+                activeAPlus = self.a_plus(H[active], activeUTau/self.nu)
+            else:
+                activeAPlus = aPlus[active]
 
+            lPlus = self.l_plus(kappa, activeUTau[:, np.newaxis],
+                                activeAPlus[:, np.newaxis])
+            rhs = activeUTau/self.nu*self.quadrature.integrate(1/(1 + lPlus))
+            new = sampledU[active]/rhs
 
+            error[active] = np.abs(activeUTau - new)/activeUTau
+            uTau[active] = new
+            iterations[active] = i + 1
 
+            done = error[active] < self.tol
+            converged[active[done]] = True
+            active = active[~done]
+            if active.size == 0:
+                break
 
-
+        self._record(iterations, error, converged)
+        self._warm_start_update(faces, uTau)
+        return uTau
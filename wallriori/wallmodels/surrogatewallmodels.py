@@ -0,0 +1,219 @@
+# This file is part of wallriori
+# (c) Timofey Mukha
+# The code is released under the MIT Licence.
+# See LICENCE.txt and the Legal section in the README for more information
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from .wallmodels import WallModel
+import numpy as np
+import warnings
+from ..lawsofthewall import Spalding, TabulatedInverse
+from ..rootfinders import Diagnostics
+
+__all__ = ["SurrogateWallModel"]
+
+
+class SurrogateWallModel(WallModel):
+    """
+    Tabulated surrogate of an ODE or integral wall model.
+
+    Without a pressure gradient, ODEWallModel with VanDriestEddyViscosity
+    and GriffinFuWallModel with fixed H and reTau give u+ as a function
+    of the sampled Reynolds number Re = u*h/nu only. The model is solved
+    once, with its batched utau_faces method, on a grid uniform in
+    log(Re), and the friction velocity is then obtained by linear
+    interpolation of log(u+), as in TabulatedInverse. One argument of
+    utau_faces, for instance the sourceField of ODEWallModel or H of
+    GriffinFuWallModel, can be tabulated as a second dimension, in which
+    case the interpolation is bilinear. The sourceField is tabulated
+    through the nondimensional source beta = sourceField*h/u^2, the ratio
+    of the source to the inertia at the sampling point, which is known at
+    runtime. With the raw source, u+ changes by orders of magnitude
+    between the columns of the table once the source dominates, and the
+    interpolation fails. The values of the table are then those of beta,
+    for instance zero and logarithmically spaced positive values, while
+    utau takes the raw source.
+
+    The table is built for the height and viscosity of the model. The
+    interpolation error is measured at construction by comparing the
+    table against solutions at the midpoints between the nodes, and is
+    stored in the error attribute as the maximum relative error in u+,
+    a RuntimeWarning is issued if it exceeds the tolerance. The mask of
+    the nodes at which the model converged is stored in the converged
+    attribute. Outside the table, log(u+) is extrapolated linearly in
+    log(Re) and the parameter is clipped to its range. With polish set to
+    True, the interpolated friction velocity is used as the guess for one
+    iteration of the model.
+
+    Parameters
+    ----------
+    model : ODEWallModel or GriffinFuWallModel
+        The model to tabulate.
+    n : int
+        The amount of table nodes in Re.
+    reMin : float
+        The smallest tabulated value of Re.
+    reMax : float
+        The largest tabulated value of Re.
+    parameter : str, optional
+        The name of the argument of utau_faces that is tabulated as the
+        second dimension.
+    values : ndarray, optional
+        The increasing values of the parameter at the table nodes.
+    polish : bool
+        Whether to refine the interpolated value with an iteration of
+        the model.
+    tolerance : float
+        The largest acceptable interpolation error.
+    **kwargs
+        The fixed arguments of utau_faces, for instance sourceField=0,
+        or H and reTau.
+
+    """
+
+    def __init__(self, model, n=200, reMin=1., reMax=1e7, parameter=None,
+                 values=None, polish=False, tolerance=1e-2, **kwargs):
+        WallModel.__init__(self, model.h, model.nu)
+
+        if (parameter is None) != (values is None):
+            raise ValueError("Both parameter and values should be given")
+
+        self.model = model
+        self.polish = polish
+        self.parameter = parameter
+        self.values = None if values is None else np.asarray(values,
+                                                             dtype=float)
+        self.arguments = kwargs
+        self.logReMin = np.log(reMin)
+        self.dx = (np.log(reMax) - self.logReMin)/(n - 1)
+
+        self.table, self.converged, self.error = self._build(n)
+        if not self.error <= tolerance:
+            warnings.warn("The interpolation error of the surrogate, " +
+                          str(self.error) + ", exceeds the tolerance " +
+                          str(tolerance) + ", refine the table",
+                          RuntimeWarning, stacklevel=2)
+
+    def _parameter_value(self, sampledU, value):
+        """Convert the runtime value of the parameter to the tabulated
+        one, the nondimensional source for sourceField."""
+        if self.parameter == "sourceField":
+            return value*self.h/sampledU**2
+        return value
+
+    def _solve_log_uplus(self, re, value=None):
+        """Solve the model for log(u+) at the given values of Re and of
+        the tabulated parameter, and return it together with the mask of
+        converged solutions."""
+        u = re*self.nu/self.h
+        arguments = dict(self.arguments)
+        if self.parameter == "sourceField":
+            arguments[self.parameter] = value*u**2/self.h
+        elif self.parameter is not None:
+            arguments[self.parameter] = value
+
+        guess = TabulatedInverse(Spalding()).utau(u, self.h, self.nu)
+        diagnostics = self.model.diagnostics
+        self.model.diagnostics = Diagnostics()
+        try:
+            uTau = self.model.utau_faces(guess, u, **arguments)
+            converged = self.model.diagnostics.converged
+        finally:
+            self.model.diagnostics = diagnostics
+        return np.log(u/uTau), converged
+
+    def _build(self, n):
+        """Compute the table, the mask of converged nodes and the
+        estimate of the error."""
+        logRe = self.logReMin + self.dx*np.arange(2*n - 1)/2
+
+        if self.parameter is None:
+            logUPlus, converged = self._solve_log_uplus(np.exp(logRe))
+            table = logUPlus[::2]
+            error = self._error(self._log_uplus(table, logRe), logUPlus,
+                                converged)
+            return table, converged[::2], error
+
+        values = np.empty(2*self.values.size - 1)
+        values[::2] = self.values
+        values[1::2] = 0.5*(self.values[:-1] + self.values[1:])
+
+        logRe, values = np.meshgrid(logRe, values, indexing="ij")
+        logUPlus, converged = self._solve_log_uplus(np.exp(logRe.ravel()),
+                                                    values.ravel())
+        logUPlus = logUPlus.reshape(logRe.shape)
+        converged = converged.reshape(logRe.shape)
+        table = logUPlus[::2, ::2]
+        error = self._error(self._log_uplus(table, logRe, values), logUPlus,
+                            converged)
+        return table, converged[::2, ::2], error
+
+    def _error(self, interpolated, logUPlus, converged):
+        """The maximum relative error in u+ over the converged
+        solutions."""
+        error = np.abs(np.expm1(interpolated - logUPlus))[converged]
+        return np.max(error) if error.size else np.nan
+
+    def _log_uplus(self, table, logRe, value=None):
+        """Interpolate log(u+) from the table, value is the tabulated
+        parameter."""
+        x = (logRe - self.logReMin)/self.dx
+        i = np.clip(np.floor(x).astype(int), 0, table.shape[0] - 2)
+        w = x - i
+        if self.parameter is None:
+            return (1 - w)*table[i] + w*table[i + 1]
+
+        value = np.clip(value, self.values[0], self.values[-1])
+        j = np.clip(np.searchsorted(self.values, value, side="right") - 1,
+                    0, self.values.size - 2)
+        v = (value - self.values[j])/(self.values[j + 1] - self.values[j])
+        return ((1 - v)*((1 - w)*table[i, j] + w*table[i + 1, j]) +
+                v*((1 - w)*table[i, j + 1] + w*table[i + 1, j + 1]))
+
+    def uplus(self, re, value=None):
+        """Return the interpolated value of u+ for the given Re and, if
+        a parameter is tabulated, its values, which are those of beta
+        for the sourceField."""
+        return np.exp(self._log_uplus(self.table, np.log(re), value))
+
+    def utau(self, sampledU, value=None):
+        """
+        Compute the friction velocity.
+
+        Parameters
+        ----------
+        sampledU : float or ndarray
+            The sampled velocity magnitude, positive.
+        value : float or ndarray, optional
+            The value of the tabulated parameter, required if there is
+            one. For the sourceField, the raw source.
+
+        Returns
+        -------
+        float or ndarray
+            The friction velocities.
+
+        """
+        if self.parameter is not None and value is None:
+            raise ValueError("A value of " + self.parameter +
+                             " is required")
+
+        sampledU = np.asarray(sampledU, dtype=float)
+        uTau = sampledU/self.uplus(sampledU*self.h/self.nu,
+                                   self._parameter_value(sampledU, value))
+
+        if self.polish:
+            arguments = dict(self.arguments)
+            if self.parameter is not None:
+                arguments[self.parameter] = value
+
+            maxiter = self.model.maxiter
+            self.model.maxiter = 1
+            try:
+                uTau = self.model.utau_faces(
+                    uTau, sampledU, **arguments).reshape(np.shape(uTau))
+            finally:
+                self.model.maxiter = maxiter
+        return uTau[()]
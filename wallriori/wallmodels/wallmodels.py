@@ -14,11 +14,24 @@ __all__ = ["WallModel", "LinearWallModel","LOTWWallModel",
            "IntegratedLOTWWallModel", "LSQRWallModel"]
 
 
+def _bind_law(rootFinder, law):
+    """Point the root finder to the implicit function of the law."""
+    rootFinder.f = law.value
+    rootFinder.d = law.derivative
+    rootFinder.d2 = getattr(law, "second_derivative", None)
+    rootFinder.fd = law.value_and_derivative
+    if rootFinder.d2 is not None:
+        rootFinder.fdd = law.value_and_derivatives
+
+
 class WallModel:
 
     def __init__(self, h, nu):
         self.h = h
         self.nu = nu
+        self.warmStart = None
+        self.diagnostics = None
+        self.fixedPoint = None
 
     @property
     def h(self):
@@ -28,6 +41,32 @@ class WallModel:
     def nu(self):
         return self.__nu
 
+    @property
+    def warmStart(self):
+        """
+        Optional WarmStart store, used to seed the solution for the
+        faces passed to utau.
+        """
+        return self.__warmStart
+
+    @property
+    def diagnostics(self):
+        """
+        Optional Diagnostics object, updated by the models that iterate
+        on their own. The models using a root finder record in the
+        diagnostics of the root finder.
+        """
+        return self.__diagnostics
+
+    @property
+    def fixedPoint(self):
+        """
+        Optional FixedPoint solver, used instead of the built-in outer
+        iterations by the models that iterate on the friction velocity.
+        It then records the convergence in its own diagnostics.
+        """
+        return self.__fixedPoint
+
     @h.setter
     def h(self, val):
         self.__h = val
@@ -36,6 +75,33 @@ class WallModel:
     def nu(self, val):
         self.__nu = val
 
+    @warmStart.setter
+    def warmStart(self, val):
+        self.__warmStart = val
+
+    @diagnostics.setter
+    def diagnostics(self, val):
+        self.__diagnostics = val
+
+    @fixedPoint.setter
+    def fixedPoint(self, val):
+        self.__fixedPoint = val
+
+    def _record(self, iterations, residual, converged):
+        if self.diagnostics is not None:
+            self.diagnostics.record(iterations, residual, converged)
+
+    def _warm_start_guess(self, guess, faces):
+        """Replace the guess with the stored values, if available."""
+        if self.warmStart is None or faces is None:
+            return guess
+        return self.warmStart.guess(faces, guess)
+
+    def _warm_start_update(self, faces, uTau, profiles=None):
+        """Store the converged values, if warm starts are used."""
+        if self.warmStart is not None and faces is not None:
+            self.warmStart.update(faces, uTau, profiles)
+
 
 class LinearWallModel(WallModel):
 
@@ -70,18 +136,85 @@ class LOTWWallModel(WallModel):
     def rootFinder(self, value):
         self.__rootFinder = value
 
-    def nut(self, guess, sampledU, wallGradU):
-        magGradU = np.abs(wallGradU)
-        uTau = self.utau(guess, sampledU)
-        return np.max([0.0, uTau**2/magGradU - self.nu])
+    def nut(self, guess, sampledU, wallGradU, h=None, nu=None, faces=None):
+        """Compute the nut needed to enforce the correct shear stress.
+
+        See utau_and_nut.
+
+        """
+        return self.utau_and_nut(guess, sampledU, wallGradU, h, nu, faces)[1]
+
+    def utau(self, guess, sampledU, h=None, nu=None, faces=None):
+        """
+        Compute the friction velocity.
+
+        All arguments can be arrays with one value per wall face, in
+        which case all the faces are solved for at once and an array
+        is returned. If the law provides an explicit utau method, it is
+        used directly and the root finder and the guess are not used.
 
-    def utau(self, guess, sampledU):
-        f = partial(self.law.value,  sampledU, self.h, self.nu)
-        d = partial(self.law.derivative, sampledU, self.h, self.nu)
+        Parameters
+        ----------
+        guess : float or ndarray
+            Initial guess for the friction velocity.
+        sampledU : float or ndarray
+            Sampled velocity values.
+        h : float or ndarray, optional
+            The distances to the sampling points, defaults to self.h.
+        nu : float or ndarray, optional
+            Kinematic viscosity, defaults to self.nu.
+        faces : int or ndarray, optional
+            Face indices, used to look up and store warm starts.
+
+        Returns
+        -------
+        float or ndarray
+            The friction velocity.
+
+        """
+        h = self.h if h is None else h
+        nu = self.nu if nu is None else nu
 
-        self.rootFinder.f = f
-        self.rootFinder.d = d
-        return self.rootFinder.solve(guess)
+        if hasattr(self.law, "utau"):
+            uTau = self.law.utau(sampledU, h, nu)
+        else:
+            _bind_law(self.rootFinder, self.law)
+            uTau = self.rootFinder.solve(self._warm_start_guess(guess, faces),
+                                         args=(sampledU, h, nu))
+
+        self._warm_start_update(faces, uTau)
+        return uTau
+
+    def utau_and_nut(self, guess, sampledU, wallGradU, h=None, nu=None,
+                     faces=None):
+        """
+        Compute the friction velocity and the nut needed to enforce the
+        correct shear stress.
+
+        Parameters
+        ----------
+        guess : float or ndarray
+            Initial guess for the friction velocity.
+        sampledU : float or ndarray
+            Sampled velocity values.
+        wallGradU : float or ndarray
+            The wall-normal velocity gradient.
+        h : float or ndarray, optional
+            The distances to the sampling points, defaults to self.h.
+        nu : float or ndarray, optional
+            Kinematic viscosity, defaults to self.nu.
+        faces : int or ndarray, optional
+            Face indices, used to look up and store warm starts.
+
+        Returns
+        -------
+        (float or ndarray, float or ndarray)
+            The friction velocity and the turbulent viscosity.
+
+        """
+        nu = self.nu if nu is None else nu
+        uTau = self.utau(guess, sampledU, h, nu, faces)
+        return uTau, np.maximum(0.0, uTau**2/np.abs(wallGradU) - nu)
 
 
 class IntegratedLOTWWallModel(WallModel):
@@ -126,19 +259,93 @@ class IntegratedLOTWWallModel(WallModel):
     def rootFinder(self, value):
         self.__rootFinder = value
 
-    def nut(self, guess, sampledU, wallGradU):
+    def nut(self, guess, sampledU, wallGradU, h1=None, h2=None, nu=None,
+            faces=None):
+        """Compute the nut needed to enforce the correct shear stress.
 
-        magGradU = np.abs(wallGradU)
-        uTau = self.utau(guess, sampledU)
-        return np.max([0.0, uTau**2/magGradU - self.nu])
+        See utau_and_nut.
 
-    def utau(self, guess, sampledU):
-        f = partial(self.law.value,  sampledU, self.h1, self.h2, self.nu)
-        d = partial(self.law.derivative, sampledU, self.h1, self.h2, self.nu)
+        """
+        return self.utau_and_nut(guess, sampledU, wallGradU, h1, h2, nu,
+                                 faces)[1]
 
-        self.rootFinder.f = f
-        self.rootFinder.d = d
-        return np.max([0, self.rootFinder.solve(guess)])
+    def utau(self, guess, sampledU, h1=None, h2=None, nu=None, faces=None):
+        """
+        Compute the friction velocity.
+
+        All arguments can be arrays with one value per wall face, in
+        which case all the faces are solved for at once and an array
+        is returned. If the law provides an explicit utau method, it is
+        used directly and the root finder and the guess are not used.
+
+        Parameters
+        ----------
+        guess : float or ndarray
+            Initial guess for the friction velocity.
+        sampledU : float or ndarray
+            Velocity values integrated across the h1-h2 interval.
+        h1 : float or ndarray, optional
+            The lower bound of the sampling interval, defaults to self.h1.
+        h2 : float or ndarray, optional
+            The upper bound of the sampling interval, defaults to self.h2.
+        nu : float or ndarray, optional
+            Kinematic viscosity, defaults to self.nu.
+        faces : int or ndarray, optional
+            Face indices, used to look up and store warm starts.
+
+        Returns
+        -------
+        float or ndarray
+            The friction velocity.
+
+        """
+        h1 = self.h1 if h1 is None else h1
+        h2 = self.h2 if h2 is None else h2
+        nu = self.nu if nu is None else nu
+
+        if hasattr(self.law, "utau"):
+            uTau = self.law.utau(sampledU, h1, h2, nu)
+        else:
+            _bind_law(self.rootFinder, self.law)
+            uTau = self.rootFinder.solve(self._warm_start_guess(guess, faces),
+                                         args=(sampledU, h1, h2, nu))
+
+        uTau = np.maximum(0, uTau)
+        self._warm_start_update(faces, uTau)
+        return uTau
+
+    def utau_and_nut(self, guess, sampledU, wallGradU, h1=None, h2=None,
+                     nu=None, faces=None):
+        """
+        Compute the friction velocity and the nut needed to enforce the
+        correct shear stress.
+
+        Parameters
+        ----------
+        guess : float or ndarray
+            Initial guess for the friction velocity.
+        sampledU : float or ndarray
+            Velocity values integrated across the h1-h2 interval.
+        wallGradU : float or ndarray
+            The wall-normal velocity gradient.
+        h1 : float or ndarray, optional
+            The lower bound of the sampling interval, defaults to self.h1.
+        h2 : float or ndarray, optional
+            The upper bound of the sampling interval, defaults to self.h2.
+        nu : float or ndarray, optional
+            Kinematic viscosity, defaults to self.nu.
+        faces : int or ndarray, optional
+            Face indices, used to look up and store warm starts.
+
+        Returns
+        -------
+        (float or ndarray, float or ndarray)
+            The friction velocity and the turbulent viscosity.
+
+        """
+        nu = self.nu if nu is None else nu
+        uTau = self.utau(guess, sampledU, h1, h2, nu, faces)
+        return uTau, np.maximum(0.0, uTau**2/np.abs(wallGradU) - nu)
 
 
 class LSQRWallModel(WallModel):
@@ -159,15 +366,158 @@ class LSQRWallModel(WallModel):
         WallModel.__init__(self, h, nu)
 
         self.rootFinder = rootFinder
+        self.runningSums = None
+        # Buffer for the sums of each new sample of the running sums
+        self.__sampleSums = None
+        # Reused for all fits, the coefficients are set before each use
+        self.__law = Spalding()
+
+    @property
+    def h(self):
+        return WallModel.h.fget(self)
 
     @property
     def rootFinder(self):
         return self.__rootFinder
 
+    @property
+    def runningSums(self):
+        """
+        Exponentially weighted sums of the sampled velocity and of its
+        product with log(h), see update_running_sums.
+        """
+        return self.__runningSums
+
+    @h.setter
+    def h(self, val):
+        WallModel.h.fset(self, val)
+        self.__heightSums = self._compute_height_sums(val)
+
     @rootFinder.setter
     def rootFinder(self, value):
         self.__rootFinder = value
 
+    @runningSums.setter
+    def runningSums(self, value):
+        self.__runningSums = value
+
+    def _compute_height_sums(self, h):
+        """
+        The sums of the regression that only depend on the heights.
+
+        Since log(y+) = log(h) + log(uTau/nu), changing uTau only shifts
+        the regressor, so the variance of log(y+) does not depend on
+        uTau and the sums over log(h) can be computed once.
+
+        """
+        logH = np.log(h)
+        n = logH.shape[-1]
+        sumLogH = np.sum(logH, axis=-1)
+        return {"logH": logH, "n": n, "sumLogH": sumLogH,
+                "kappaNom": n*np.einsum("...i,...i", logH, logH) -
+                sumLogH**2}
+
+    def velocity_sums(self, sampledU):
+        """
+        Return the sums of the regression that depend on the velocity.
+
+        Parameters
+        ----------
+        sampledU : ndarray
+            The sampled values of velocity, shape (nHeights,) or
+            (nFaces, nHeights).
+
+        Returns
+        -------
+        ndarray
+            The sum of the velocity and the sum of its product with
+            log(h), stacked along the first axis.
+
+        """
+        return np.array([np.sum(sampledU, axis=-1),
+                         np.dot(sampledU, self.__heightSums["logH"])])
+
+    def update_running_sums(self, sampledU, weight):
+        """
+        Add a velocity sample to the running sums with exponential
+        forgetting, runningSums = (1 - weight)*runningSums +
+        weight*velocity_sums(sampledU). The first sample initializes
+        the sums.
+
+        Since the sums are linear in the velocity, fitting to them is
+        the same as fitting to the exponentially averaged velocity.
+        The sums of the sample are computed into a buffer kept between
+        the calls and accumulated in place.
+
+        """
+        shape = (2,) + np.shape(sampledU)[:-1]
+        if self.runningSums is None or self.runningSums.shape != shape:
+            self.runningSums = self.velocity_sums(sampledU)
+            self.__sampleSums = np.empty(shape)
+            return self.runningSums
+
+        sums = self.__sampleSums
+        np.sum(sampledU, axis=-1, out=sums[0, ...])
+        np.einsum("...i,...i->...", sampledU, self.__heightSums["logH"],
+                  out=sums[1, ...])
+        sums *= weight
+        self.runningSums *= 1 - weight
+        self.runningSums += sums
+        return self.runningSums
+
+    def kappa_and_b_from_sums(self, uTau, sums):
+        """
+        Compute kappa and B from the velocity sums and the precomputed
+        height sums.
+
+        Parameters
+        ----------
+        uTau : float or ndarray
+            A guess for the friction velocity, one per face.
+        sums : ndarray
+            The velocity sums, see velocity_sums.
+
+        Returns
+        -------
+        (scalar, scalar) or (ndarray, ndarray)
+            The values of kappa and b
+
+        """
+        heightSums = self.__heightSums
+        n = heightSums["n"]
+        sumLogH = heightSums["sumLogH"]
+
+        kappaDenom = (n*sums[1] - sums[0]*sumLogH)/uTau
+        kappa = heightSums["kappaNom"]/(kappaDenom + 1e-12)
+        b = (sums[0]/uTau - (sumLogH + n*np.log(uTau/self.nu))/kappa)/n
+
+        return kappa, b
+
+    def _fit_value(self, kappa, b, u, y, nu, uTau):
+        """Spalding's law with the given coefficients, with the argument
+        order of the root finders, so that the coefficients are
+        subset together with the other per-face arguments."""
+        self.__law.kappa = kappa
+        self.__law.B = b
+        return self.__law.value(u, y, nu, uTau)
+
+    def _fit_derivative(self, kappa, b, u, y, nu, uTau):
+        self.__law.kappa = kappa
+        self.__law.B = b
+        return self.__law.derivative(u, y, nu, uTau)
+
+    def _fit_value_and_derivative(self, kappa, b, u, y, nu, uTau):
+        self.__law.kappa = kappa
+        self.__law.B = b
+        return self.__law.value_and_derivative(u, y, nu, uTau)
+
+    def _bind_fit(self):
+        """Point the root finder to Spalding's law with the fitted
+        coefficients passed as arguments."""
+        self.rootFinder.f = self._fit_value
+        self.rootFinder.d = self._fit_derivative
+        self.rootFinder.fd = self._fit_value_and_derivative
+
     def nut(self, guess, sampledU, wallGradU):
         """
         Compute the nut needed to enforce the correct shear stress.
@@ -188,39 +538,52 @@ class LSQRWallModel(WallModel):
         """
         magGradU = np.abs(wallGradU)
         uTau = self.utau(guess, sampledU)
-        return np.max([0.0, uTau**2/magGradU - self.nu])
+        return np.maximum(0.0, uTau**2/magGradU - self.nu)
 
-    def kappa_and_b(self, uTau, sampledU):
+    def kappa_and_b(self, uTau, sampledU, h=None):
         """
         Compute kappa and B using the formula in the paper.
 
+        The sums run over the last axis, so many faces can be fitted at
+        once by passing arrays with one row per face.
+
         Parameters
         ----------
-        uTau : float
-            A guess for the friction velocity
-        sampledU : 1d array
-            The sampled values of velocity
+        uTau : float or ndarray
+            A guess for the friction velocity, one per face.
+        sampledU : ndarray
+            The sampled values of velocity, shape (nHeights,) or
+            (nFaces, nHeights).
+        h : ndarray, optional
+            The sampling heights, broadcastable to sampledU, by default
+            the heights of the model, for which precomputed sums are
+            used.
 
         Returns
         -------
-        (scalar, scalar)
+        (scalar, scalar) or (ndarray, ndarray)
             The values of kappa and b
 
         """
-
-        from numpy import sum, log
+        if h is None:
+            return self.kappa_and_b_from_sums(uTau,
+                                              self.velocity_sums(sampledU))
+        uTau = np.asarray(uTau)[..., np.newaxis]
 
         # u* and y* in the paper
         u = sampledU/uTau
-        y = self.h*uTau/self.nu
+        logY = np.log(h*uTau/self.nu)
+        u, logY = np.broadcast_arrays(u, logY)
 
-        n = self.h.size
+        n = u.shape[-1]
+        sumLogY = np.sum(logY, axis=-1)
+        sumU = np.sum(u, axis=-1)
 
-        kappaNom = n*sum(log(y)**2) - sum(log(y))**2
-        kappaDenom = n*sum(u*log(y)) - sum(u)*sum(log(y))
+        kappaNom = n*np.einsum("...i,...i", logY, logY) - sumLogY**2
+        kappaDenom = n*np.einsum("...i,...i", u, logY) - sumU*sumLogY
 
         kappa = kappaNom/(kappaDenom + 1e-12)
-        b = 1/n*np.sum(u - 1/kappa*np.log(y))
+        b = (sumU - sumLogY/kappa)/n
 
         return kappa, b
 
@@ -269,16 +632,12 @@ class LSQRWallModel(WallModel):
 
         """
         kappa, b = self.kappa_and_b(uTau, sampledU)
-        law = Spalding(kappa, b)
-
-        f = partial(law.value,  sampledU[index], self.h[index], self.nu)
-        d = partial(law.derivative, sampledU[index], self.h[index], self.nu)
 
-        self.rootFinder.f = f
-        self.rootFinder.d = d
-        return np.max([0, self.rootFinder.solve(uTau)])
+        self._bind_fit()
+        return np.maximum(0, self.rootFinder.solve(
+            uTau, args=(kappa, b, sampledU[index], self.h[index], self.nu)))
 
-    def utau(self, guess, sampledU, index, nIter, eps=1, verbose=True):
+    def utau(self, guess, sampledU, index, nIter, eps=1, verbose=False):
         """
         Compute the friction velocity.
 
@@ -295,21 +654,124 @@ class LSQRWallModel(WallModel):
         eps : float
             Under-relaxation factor, defaults 1, i.e. no under-relaxation.
         verbose : bool
-            Wether to print results from each iteration, defaults to True
+            Wether to print results from each iteration, defaults to False
 
         Returns
         -------
         float
             The friction velocity.
+
+        Notes
+        -----
+        If the fixedPoint attribute is set, it is used to iterate to
+        convergence instead, and nIter and eps are ignored. Otherwise,
+        the last relative change is recorded in the diagnostics, and
+        compared to the tolerance of the root finder.
+
         """
+        if self.fixedPoint is not None:
+            self.fixedPoint.f = partial(self.utau_iteration, sampledU=sampledU,
+                                        index=index)
+            return self.fixedPoint.solve(guess)
 
         uTau = guess
+        error = np.inf
         for i in range(nIter):
             uTauNew = self.utau_iteration(uTau, sampledU, index)
 
+            error = np.abs(uTauNew - uTau)/np.abs(uTau)
             uTau = eps*uTauNew + (1- eps)*uTau
 
             if verbose:
                 print("Iteration", i, "uTau", uTau)
 
-        return np.max([0, self.rootFinder.solve(guess)])
+        # The last change is compared to the tolerance of the root finder
+        self._record(nIter, error, error < self.rootFinder.eps)
+
+        return uTau
+
+    def utau_faces(self, guess, sampledU, index, nIter, eps=1, h=None,
+                   faces=None, running=False):
+        """
+        Compute the friction velocity for many faces at once.
+
+        The regressions for kappa and B and the solution of Spalding's
+        law with the fitted coefficients are done for all faces together
+        in each iteration.
+
+        Parameters
+        ----------
+        guess : float or ndarray
+            Initial guess for the friction velocity.
+        sampledU : ndarray
+            The sampled velocity values, shape (nFaces, nHeights).
+        index : int
+            The index of the velocity and y value to use in Spalding's
+            law.
+        nIter : int
+            The amount of iterations to compute the friction velocity.
+        eps : float
+            Under-relaxation factor, defaults 1, i.e. no
+            under-relaxation.
+        h : ndarray, optional
+            The sampling heights, broadcastable to sampledU, by default
+            the heights of the model.
+        faces : ndarray, optional
+            Face indices, used with warm starts.
+        running : bool, optional
+            Whether to fit kappa and B to the running sums instead of
+            sampledU, which is then only used in Spalding's law. The
+            running sums use the heights of the model, so h cannot be
+            given.
+
+        Returns
+        -------
+        ndarray
+            The friction velocities.
+
+        Notes
+        -----
+        All faces are iterated nIter times. The last relative change of
+        each face is recorded in the diagnostics, and compared to the
+        tolerance of the root finder.
+
+        """
+        if running and h is not None:
+            raise ValueError("The running sums use the heights of the "
+                             "model, h cannot be given with running=True")
+        if running and self.runningSums is None:
+            raise ValueError("No running sums, call update_running_sums "
+                             "before utau_faces with running=True")
+
+        sampledU = np.atleast_2d(sampledU)
+        if h is None:
+            # The velocity sums do not change during the iterations
+            sums = (self.runningSums if running else
+                    self.velocity_sums(sampledU))
+            heights = np.broadcast_to(self.h, sampledU.shape)
+        else:
+            heights = np.broadcast_to(h, sampledU.shape)
+        nFaces = sampledU.shape[0]
+
+        uTau = np.array(np.broadcast_to(self._warm_start_guess(guess, faces),
+                                        (nFaces,)), dtype=float)
+        error = np.full(nFaces, np.inf)
+        self._bind_fit()
+
+        for i in range(nIter):
+            if h is None:
+                kappa, b = self.kappa_and_b_from_sums(uTau, sums)
+            else:
+                kappa, b = self.kappa_and_b(uTau, sampledU, h)
+            uTauNew = np.maximum(0, self.rootFinder.solve(
+                uTau, args=(kappa, b, sampledU[:, index], heights[:, index],
+                            self.nu)))
+
+            error = np.abs(uTauNew - uTau)/np.abs(uTau)
+            uTau = eps*uTauNew + (1 - eps)*uTau
+
+        # The last change is compared to the tolerance of the root finder
+        self._record(np.full(nFaces, nIter), error,
+                     error < self.rootFinder.eps)
+        self._warm_start_update(faces, uTau)
+        return uTau
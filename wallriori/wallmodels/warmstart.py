@@ -0,0 +1,175 @@
+# This file is part of wallriori
+# (c) Timofey Mukha
+# The code is released under the MIT Licence.
+# See LICENCE.txt and the Legal section in the README for more information
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+import numpy as np
+
+__all__ = ["WarmStart"]
+
+
+class WarmStart:
+    """
+    Store of the last converged friction velocity of each wall face.
+
+    The values are keyed by face index, so the order in which the faces
+    are passed can change between calls. Faces that are not in the
+    store are added on update, and retain and renumber handle faces
+    that are removed or get new indices.
+
+    The ODE wall models also store the converged velocity profile of
+    each face. The profiles are output only, they are not used to seed
+    the solves: for a given friction velocity the profile is obtained
+    with a direct solve, so only the friction velocity carries over
+    between calls. They give access to the last profile of each face,
+    for instance for sampling or postprocessing.
+
+    Assign an instance to the warmStart attribute of a wall model and
+    pass the face indices to its utau method to seed each solve with
+    the value from the previous call.
+
+    """
+
+    def __init__(self):
+        self.faces = np.zeros(0, dtype=int)
+        self.uTau = np.zeros(0)
+        self.profiles = None
+
+    @property
+    def faces(self):
+        """The sorted indices of the stored faces"""
+        return self.__faces
+
+    @property
+    def uTau(self):
+        """The stored friction velocities"""
+        return self.__uTau
+
+    @property
+    def profiles(self):
+        """The stored velocity profiles, one row per face, or None.
+        Output only, they are not used as initial guesses."""
+        return self.__profiles
+
+    @faces.setter
+    def faces(self, value):
+        self.__faces = value
+
+    @uTau.setter
+    def uTau(self, value):
+        self.__uTau = value
+
+    @profiles.setter
+    def profiles(self, value):
+        self.__profiles = value
+
+    def _locate(self, faces):
+        """Return the positions of the faces in the store and a mask
+        of the faces that are found."""
+        faces = np.ravel(faces)
+        if self.faces.size == 0:
+            return (np.zeros(faces.size, dtype=int),
+                    np.zeros(faces.size, dtype=bool))
+
+        positions = np.minimum(np.searchsorted(self.faces, faces),
+                               self.faces.size - 1)
+        return positions, self.faces[positions] == faces
+
+    def guess(self, faces, default):
+        """
+        Return the stored friction velocity for the given faces.
+
+        Parameters
+        ----------
+        faces : int or ndarray
+            Indices of the faces.
+        default : float or ndarray
+            Value used for the faces that are not in the store.
+
+        Returns
+        -------
+        float or ndarray
+            The friction velocities, with the shape of faces.
+
+        """
+        positions, found = self._locate(faces)
+        guess = np.array(np.broadcast_to(default, np.shape(faces)),
+                         dtype=float).ravel()
+        guess[found] = self.uTau[positions[found]]
+        return guess.reshape(np.shape(faces))[()]
+
+    def profile(self, faces):
+        """Return the stored profiles for the given faces, with rows of
+        NaN for unknown faces."""
+        positions, found = self._locate(faces)
+        profiles = np.full((found.size, self.profiles.shape[1]), np.nan)
+        profiles[found] = self.profiles[positions[found]]
+        return profiles.reshape(np.shape(faces) + (-1,))
+
+    def update(self, faces, uTau, profiles=None):
+        """
+        Store the friction velocities, and optionally the profiles, of
+        the given faces.
+
+        Parameters
+        ----------
+        faces : int or ndarray
+            Indices of the faces, without duplicates.
+        uTau : float or ndarray
+            The friction velocities.
+        profiles : ndarray, optional
+            The velocity profiles, the last dimension is the wall-normal
+            one.
+
+        """
+        faces = np.ravel(faces)
+        uTau = np.ravel(np.broadcast_to(uTau, faces.shape))
+        if profiles is not None:
+            profiles = np.reshape(profiles, (faces.size, -1))
+            if self.profiles is None:
+                self.profiles = np.full((self.faces.size, profiles.shape[1]),
+                                        np.nan)
+
+        positions, found = self._locate(faces)
+        self.uTau[positions[found]] = uTau[found]
+        if profiles is not None:
+            self.profiles[positions[found]] = profiles[found]
+
+        new = ~found
+        if np.any(new):
+            allFaces = np.concatenate([self.faces, faces[new]])
+            order = np.argsort(allFaces, kind="stable")
+            self.faces = allFaces[order]
+            self.uTau = np.concatenate([self.uTau, uTau[new]])[order]
+            if self.profiles is not None:
+                if profiles is None:
+                    newProfiles = np.full((np.count_nonzero(new),
+                                           self.profiles.shape[1]), np.nan)
+                else:
+                    newProfiles = profiles[new]
+                self.profiles = np.concatenate([self.profiles,
+                                                newProfiles])[order]
+
+    def retain(self, faces):
+        """Remove all faces except the given ones from the store."""
+        keep = np.isin(self.faces, faces)
+        self.faces = self.faces[keep]
+        self.uTau = self.uTau[keep]
+        if self.profiles is not None:
+            self.profiles = self.profiles[keep]
+
+    def renumber(self, oldFaces, newFaces):
+        """Change the indices of the given faces, for instance after the
+        faces have been reordered."""
+        positions, found = self._locate(oldFaces)
+        faces = self.faces.copy()
+        faces[positions[found]] = np.ravel(newFaces)[found]
+
+        order = np.argsort(faces, kind="stable")
+        self.faces = faces[order]
+        self.uTau = self.uTau[order]
+        if self.profiles is not None:
+            self.profiles = self.profiles[order]